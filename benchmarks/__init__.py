@@ -0,0 +1,7 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""性能基准测试。
+
+在仓库根目录执行，如``py -m benchmarks.bench_detail_sheet_reader``。
+"""
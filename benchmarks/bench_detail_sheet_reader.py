@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""“成员观看明细”读取基准：openpyxl只读模式与直接解析xlsx对比。"""
+
+import argparse
+import os
+import tempfile
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from openpyxl import Workbook, load_workbook
+
+from meeting_attendance_workbook import (
+    DETAIL_OF_MEMBER_ATTENDANCE, convert_detail_sheet, read_detail_sheet,
+)
+
+
+def write_attendance_export(filepath: str, rows: int):
+    """生成指定行数的考勤数据。"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(DETAIL_OF_MEMBER_ATTENDANCE)
+    for _ in range(9):
+        sheet.append(['表头'])
+    start_time = datetime(2024, 1, 1, 19, 0, 0)
+    for idx in range(rows):
+        enter_time = start_time + timedelta(seconds=idx % 3600)
+        exit_time = enter_time + timedelta(minutes=30)
+        sheet.append([
+            None, f'人员{idx}(中乾{idx % 100}人员{idx})', '', '', '', '',
+            enter_time.strftime('%Y-%m-%d %H:%M:%S'),
+            exit_time.strftime('%Y-%m-%d %H:%M:%S'),
+            '0:30:00',
+        ])
+    workbook.save(filepath)
+
+
+def read_by_openpyxl(filepath: str) -> tuple:
+    """通过openpyxl只读模式读取。"""
+    workbook = load_workbook(filepath, read_only=True)
+    try:
+        return tuple(convert_detail_sheet(workbook[DETAIL_OF_MEMBER_ATTENDANCE]))
+    finally:
+        workbook.close()
+
+
+def read_directly(filepath: str) -> tuple:
+    """直接解析xlsx读取。"""
+    return tuple(read_detail_sheet(filepath))
+
+
+def timeit(func, *args):
+    """计时。"""
+    start = perf_counter()
+    result = func(*args)
+    return perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = os.path.join(tmpdir, 'attendance.xlsx')
+        write_attendance_export(filepath, args.rows)
+        openpyxl_seconds, openpyxl_rows = timeit(read_by_openpyxl, filepath)
+        direct_seconds, direct_rows = timeit(read_directly, filepath)
+
+    assert openpyxl_rows == direct_rows
+    print(f'行数：{args.rows}')
+    print(f'openpyxl只读模式：{openpyxl_seconds:.2f}秒')
+    print(f'直接解析：{direct_seconds:.2f}秒')
+    print(f'加速比：{openpyxl_seconds / direct_seconds:.2f}')
+
+
+if __name__ == '__main__':
+    main()
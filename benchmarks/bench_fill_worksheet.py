@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""区域工作表填充基准：逐条填充与按行批量填充对比。"""
+
+import argparse
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from openpyxl import Workbook
+
+from meeting_attendance_workbook import AttendanceInfo, create_attendance_table
+from meeting_summary_workbook import (
+    PersoneelAttendanceInfo,
+    create_personeel_info, do_fill_worksheet_commands, fill_worksheet_command,
+    generate_attendance_infos_fill_commands,
+)
+
+
+def create_zone_attendance_infos(zones: int, teams: int, people: int) -> dict:
+    """生成区域参会信息，每组约三成缺勤、一成时长不足。"""
+    attendance_infos = create_attendance_table((
+        AttendanceInfo(
+            '中乾1张三', '张三', '张三(中乾1张三)',
+            datetime(2024, 1, 1, 19, 0, 0), datetime(2024, 1, 1, 20, 0, 0),
+        ),
+    ))
+    absent_infos = attendance_infos[:0]
+    zone_attendance_infos = {}
+    for zone in range(zones):
+        team_attendance_infos = {}
+        for team in range(teams):
+            team_name = f'区{zone}组{team}'
+            personeel_attendance_infos = []
+            for number in range(people):
+                is_absent = number % 10 < 3
+                personeel_attendance_infos.append(PersoneelAttendanceInfo(
+                    create_personeel_info(f'人员{number}', team_name, number),
+                    absent_infos if is_absent else attendance_infos,
+                    timedelta() if is_absent else timedelta(minutes=50 + number),
+                    not is_absent and number % 10 != 3,
+                ))
+            team_attendance_infos[team_name] = tuple(personeel_attendance_infos)
+        zone_attendance_infos[f'区域{zone}'] = team_attendance_infos
+    return zone_attendance_infos
+
+
+def fill_by_command(worksheet, commands):
+    """逐条执行填充指令。"""
+    for command in commands:
+        fill_worksheet_command(worksheet, command)
+
+
+def fill_workbook(fill, zone_commands: dict) -> tuple:
+    """填充所有区域工作表，返回(耗时, 工作簿)。"""
+    workbook = Workbook()
+    for zone in zone_commands:
+        workbook.create_sheet(zone)
+    start = perf_counter()
+    for zone, commands in zone_commands.items():
+        fill(workbook[zone], commands)
+    return perf_counter() - start, workbook
+
+
+def dump_workbook(workbook: Workbook) -> list:
+    """导出单元格的值与样式，用于校验两种填充结果一致。"""
+    return [
+        (
+            worksheet.title, cell.coordinate, cell.value,
+            cell.font.color.rgb, cell.alignment.horizontal, cell.border.left.style,
+        )
+        for worksheet in workbook.worksheets
+        for row in worksheet.iter_rows()
+        for cell in row
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--zones', type=int, default=50)
+    parser.add_argument('--teams', type=int, default=8)
+    parser.add_argument('--people', type=int, default=10)
+    args = parser.parse_args()
+
+    zone_commands = {
+        zone: tuple(generate_attendance_infos_fill_commands(team_attendance_infos))
+        for zone, team_attendance_infos in create_zone_attendance_infos(
+            args.zones, args.teams, args.people
+        ).items()
+    }
+    command_seconds, command_workbook = fill_workbook(fill_by_command, zone_commands)
+    bulk_seconds, bulk_workbook = fill_workbook(do_fill_worksheet_commands, zone_commands)
+
+    assert dump_workbook(command_workbook) == dump_workbook(bulk_workbook)
+    print(f'区域数：{args.zones}，填充指令数：{sum(map(len, zone_commands.values()))}')
+    print(f'逐条填充：{command_seconds:.2f}秒')
+    print(f'按行批量填充：{bulk_seconds:.2f}秒')
+    print(f'加速比：{command_seconds / bulk_seconds:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""分组基准：排序后groupby与单次遍历的哈希分组对比。
+
+groupby只合并相邻的相同键，排序后分组才正确，因此以排序后分组作为对比的原实现。
+"""
+
+import argparse
+import random
+from datetime import timedelta
+from itertools import groupby, islice
+from operator import attrgetter, itemgetter
+from timeit import timeit
+
+from benchmarks.meeting_generator import (
+    DETAIL_HEADER_ROWS, MeetingConfig, create_people, iter_detail_rows, iter_detail_sheet_rows,
+)
+from meeting_attendance_workbook import (
+    merge_attendance_infos, parse_attendance_info, partition_attendance_infos,
+    transform_row_data,
+)
+from meeting_comm import dict_groupby, expand_groupby, pipe
+from meeting_summary_workbook import (
+    PersoneelAttendanceInfo, classify_team_attendance_infos, classify_zone_attendance_infos,
+    create_personeel_info,
+)
+
+
+def sorted_groupby(iterable, key, expand=expand_groupby) -> dict:
+    """排序后groupby。"""
+    return dict(expand(groupby(sorted(iterable, key=key), key=key)))
+
+
+def create_attendance_infos(rows: int, seed: int) -> tuple:
+    """生成rows条参会信息，保持考勤数据中的顺序。"""
+    config = MeetingConfig(people=rows, seed=seed)
+    rnd = random.Random(seed)
+    people = create_people(config, rnd)
+    sheet_rows = iter_detail_sheet_rows(iter_detail_rows(people, config, rnd))
+    return tuple(
+        parse_attendance_info(transform_row_data(tuple(row[1:])))
+        for row in islice(sheet_rows, DETAIL_HEADER_ROWS, DETAIL_HEADER_ROWS + rows)
+    )
+
+
+def create_people_attendance_infos(people: int, seed: int) -> tuple:
+    """生成people人的参会信息，按人员总表顺序，同组人员不相邻。"""
+    config = MeetingConfig(people=people, seed=seed)
+    return tuple(
+        PersoneelAttendanceInfo(
+            create_personeel_info(person.name, person.team, person.number),
+            (), timedelta(), False,
+        )
+        for person in create_people(config, random.Random(seed))
+    )
+
+
+def bench(name: str, number: int, origin, hashed):
+    """对比耗时，并校验两种分组结果一致。"""
+    assert origin() == hashed()
+    origin_seconds = timeit(origin, number=number)
+    hashed_seconds = timeit(hashed, number=number)
+    print(
+        f'{name}：排序后分组{origin_seconds:.3f}秒，哈希分组{hashed_seconds:.3f}秒，'
+        f'加速比{origin_seconds / hashed_seconds:.2f}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--number', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    attendance_infos = create_attendance_infos(args.rows, args.seed)
+    people_attendance_infos = create_people_attendance_infos(args.rows, args.seed)
+    team_attendance_infos = classify_team_attendance_infos(people_attendance_infos)
+    teams = list(team_attendance_infos)
+    team_mapping = {team: f'区域{idx % 100}' for idx, team in enumerate(teams)}
+    print(
+        f'参会信息：{len(attendance_infos)}条，人员：{len(people_attendance_infos)}，'
+        f'小组：{len(teams)}'
+    )
+
+    bench(
+        'partition_attendance_infos', args.number,
+        lambda: sorted_groupby(attendance_infos, attrgetter('meeting_name')),
+        lambda: partition_attendance_infos(attendance_infos),
+    )
+    bench(
+        'merge_attendance_infos', args.number,
+        lambda: sorted_groupby(attendance_infos, attrgetter('origin_name')),
+        lambda: merge_attendance_infos(attendance_infos),
+    )
+    bench(
+        'classify_team_attendance_infos', args.number,
+        lambda: sorted_groupby(people_attendance_infos, pipe(itemgetter(0), attrgetter('team'))),
+        lambda: classify_team_attendance_infos(people_attendance_infos),
+    )
+    bench(
+        'classify_zone_attendance_infos', args.number,
+        lambda: sorted_groupby(
+            team_attendance_infos.items(), pipe(itemgetter(0), team_mapping.get), dict_groupby,
+        ),
+        lambda: classify_zone_attendance_infos(team_attendance_infos, team_mapping),
+    )
+
+
+if __name__ == '__main__':
+    main()
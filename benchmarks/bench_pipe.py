@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""函数管道基准：嵌套管道与编译后管道对比。"""
+
+import argparse
+from timeit import timeit
+from types import SimpleNamespace
+
+from openpyxl import Workbook
+
+from meeting_attendance_workbook import normalize_name
+from meeting_summary_workbook import FillCommand, fill_worksheet_command
+
+
+class NullWorksheet:
+    """只记录属性的工作表，用于排除openpyxl样式处理的耗时。"""
+
+    def __init__(self):
+        self.workcell = SimpleNamespace()
+
+    def cell(self, row: int, column: int) -> SimpleNamespace:
+        return self.workcell
+
+
+def bench(name: str, compiled, number: int, *args):
+    """对比编译前后的耗时。"""
+    origin = compiled.__wrapped__
+    assert origin(*args) == compiled(*args)
+    origin_seconds = timeit(lambda: origin(*args), number=number)
+    compiled_seconds = timeit(lambda: compiled(*args), number=number)
+    print(
+        f'{name}：原管道{origin_seconds:.3f}秒，编译后{compiled_seconds:.3f}秒，'
+        f'加速比{origin_seconds / compiled_seconds:.2f}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=100000)
+    args = parser.parse_args()
+
+    command = FillCommand(3, 4, '01:20:00', True, True)
+    bench(
+        'fill_worksheet_command（openpyxl）', fill_worksheet_command, args.number,
+        Workbook().active, command,
+    )
+    bench(
+        'fill_worksheet_command（仅组合子）', fill_worksheet_command, args.number,
+        NullWorksheet(), command,
+    )
+    bench('normalize_name', normalize_name, args.number, '中乾 ０1-张三')
+
+
+if __name__ == '__main__':
+    main()
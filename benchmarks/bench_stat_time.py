@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""统计参会时长分阶段基准：按不同人员规模生成节气目录，记录各阶段耗时。
+
+每次运行的结果按规模逐行追加到结果文件，可用--compare与之前带标签的运行对比。
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from argparse import Namespace
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+from typing import Dict, List
+
+from benchmarks.meeting_generator import (
+    MeetingConfig, add_config_arguments, generate_meeting, parse_config,
+)
+from meeting_comm import (
+    MEETING_PROFILE_FILENAME, StageRecord, dump_stage_records, format_stage_records, justify,
+)
+from meeting_summary_workbook import STAT_TIME_OPTIONS, stat_time
+
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+DEFAULT_RESULTS_FILENAME = os.path.join(os.path.dirname(__file__), 'stat_time基准.jsonl')
+
+
+def load_profile_records(meeting: str) -> List[StageRecord]:
+    """读取节气目录统计文件中最后一次运行的阶段统计。"""
+    with open(os.path.join(meeting, MEETING_PROFILE_FILENAME), encoding='utf-8') as file:
+        line = file.readlines()[-1]
+    return [StageRecord(**stage) for stage in json.loads(line)['stages']]
+
+
+def bench_stat_time(config: MeetingConfig) -> List[StageRecord]:
+    """生成节气目录并统计参会时长，返回各阶段统计。"""
+    with tempfile.TemporaryDirectory() as meeting:
+        generate_meeting(meeting, config)
+        with redirect_stdout(StringIO()):
+            stat_time(Namespace(
+                meeting=meeting,
+                **{**STAT_TIME_OPTIONS, 'no_cache': True, 'profile': True, 'no_store': True},
+            ))
+        return load_profile_records(meeting)
+
+
+def load_results(filepath: str, label: str) -> Dict[int, Dict[str, float]]:
+    """读取结果文件中指定标签的各规模阶段耗时。同一规模取最后一次。"""
+    results = {}
+    with open(filepath, encoding='utf-8') as file:
+        for line in file:
+            result = json.loads(line)
+            if result['label'] == label:
+                results[result['people']] = {
+                    stage['stage']: stage['seconds'] for stage in result['stages']
+                }
+    return results
+
+
+def format_comparison(records: List[StageRecord], baseline: Dict[str, float]) -> str:
+    """格式化与基线的耗时对比。加速比大于1表示比基线快。"""
+    lines = [
+        justify('阶段', 18, left=True) + justify('耗时(秒)', 10)
+        + justify('基线(秒)', 10) + justify('加速比', 8)
+    ]
+    for record in records:
+        base_seconds = baseline.get(record.stage)
+        if base_seconds is None:
+            base_text, speedup_text = '-', '-'
+        else:
+            base_text = f'{base_seconds:.3f}'
+            speedup_text = f'{base_seconds / max(record.seconds, 1e-9):.2f}'
+        lines.append(
+            justify(record.stage, 18, left=True) + justify(f'{record.seconds:.3f}', 10)
+            + justify(base_text, 10) + justify(speedup_text, 8)
+        )
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--output', default=DEFAULT_RESULTS_FILENAME)
+    parser.add_argument('--label', default=datetime.now().isoformat(timespec='seconds'))
+    parser.add_argument('--compare', help='对比结果文件中该标签的运行')
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    baselines = load_results(args.output, args.compare) if args.compare else {}
+    for size in args.sizes:
+        config = parse_config(args, people=size)
+        records = bench_stat_time(config)
+        dump_stage_records(records, args.output, label=args.label, **config._asdict())
+        print(f'人员数：{size}')
+        if size in baselines:
+            print(format_comparison(records, baselines[size]))
+        else:
+            print(format_stage_records(records))
+    print(f"结果已追加到'{args.output}'文件。")
+
+
+if __name__ == '__main__':
+    main()
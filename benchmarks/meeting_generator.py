@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""节气目录生成器：按随机种子生成成对的生活修行考勤表和考勤数据。
+
+在仓库根目录执行，如``py -m benchmarks.meeting_generator 目录 --people 1000``。
+"""
+
+import argparse
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, List, NamedTuple, Tuple
+
+from openpyxl import Workbook
+
+from meeting_attendance_workbook import CITY_MAPPING, DETAIL_OF_MEMBER_ATTENDANCE
+from meeting_comm import (
+    MEETING_ATTENDANCE_CSV_FILENAME, MEETING_ATTENDANCE_FILENAME, MEETING_SUMMARY_FILENAME,
+)
+from meeting_summary_workbook import (
+    MEETING_INFO_SHEET_NAME, MISMATCHED_SHEET_NAME, PEOPLE_SHEET_NAME,
+    TEAM_MAPPING_SHEET_NAME, TOTAL_ABSENT_SHEET_NAME,
+)
+
+
+SURNAMES = '张王李赵刘陈杨黄周吴徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘'
+GIVEN_NAMES = '一二三四五六七八九十明华军芳丽强磊静敏伟涛洋勇艳杰娟秀英慧巧美娜'
+
+# 小组名首字，含城市简称和“鄂”，用于生成城市前缀和“卾”形近字噪声
+TEAM_FIRST_CHARS = '厦杭福京鄂中东西南北金木水火土日月星云山'
+# 小组名次字，取自常用汉字区间，排除“组”
+TEAM_SECOND_CHARS = ''.join(
+    char for char in map(chr, range(0x4E50, 0x4E50 + 97 * 300, 97)) if char != '组'
+)
+
+# 城市简称到昵称中可能出现的写法
+CITY_PREFIXES = {
+    **{short: city for city, short in CITY_MAPPING.items()},
+    '鄂': '卾',
+}
+
+FULLWIDTH_DIGITS = str.maketrans('0123456789', '０１２３４５６７８９')
+
+DEVICE_NAMES = ('iPhone', 'iPad', 'HUAWEI', '小米')
+
+MEETING_NAME = '冬至'
+MEETING_START_TIME = datetime(2024, 1, 1, 19, 0, 0)
+MEETING_END_TIME = datetime(2024, 1, 1, 21, 0, 0)
+
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 考勤数据中“成员观看明细”的表头行数
+DETAIL_HEADER_ROWS = 9
+
+
+class MeetingConfig(NamedTuple):
+    """生成配置。比例均为0到1之间的小数。"""
+    people: int = 1000  # 人员总数
+    teams: int = 0  # 小组数，0表示每组约20人
+    zones: int = 0  # 区域数，0表示每区约8个小组
+    absent: float = 0.1  # 缺勤人员占比
+    noise: float = 0.3  # 昵称带噪声（全角数字、分隔符、城市前缀、“卾”）的占比
+    rejoin: float = 0.3  # 每次退出后重新入会的概率
+    unmatched: float = 0.05  # 无法匹配人员的参会者占总人数的比例
+    csv: bool = False  # 考勤数据导出为CSV
+    seed: int = 0  # 随机种子
+
+    def team_count(self) -> int:
+        return self.teams or max(1, -(-self.people // 20))
+
+    def zone_count(self) -> int:
+        return self.zones or max(1, -(-self.team_count() // 8))
+
+
+class Person(NamedTuple):
+    """人员总表中的一行。"""
+    name: str
+    team: str
+    number: int
+
+
+def create_team_names(count: int) -> Tuple[str, ...]:
+    """生成不重复的两字小组名。"""
+    capacity = len(TEAM_FIRST_CHARS) * len(TEAM_SECOND_CHARS)
+    if count > capacity:
+        raise ValueError(f'小组数不能超过{capacity}')
+    return tuple(
+        TEAM_FIRST_CHARS[idx % len(TEAM_FIRST_CHARS)]
+        + TEAM_SECOND_CHARS[idx // len(TEAM_FIRST_CHARS)]
+        for idx in range(count)
+    )
+
+
+def create_name(rnd: random.Random) -> str:
+    """生成两字或三字姓名。"""
+    return rnd.choice(SURNAMES) + ''.join(rnd.choices(GIVEN_NAMES, k=rnd.choice((1, 2, 2))))
+
+
+def create_people(config: MeetingConfig, rnd: random.Random) -> List[Person]:
+    """生成人员，按小组轮流分配，小组内从1开始编号。"""
+    team_names = create_team_names(config.team_count())
+    return [
+        Person(create_name(rnd), team_names[idx % len(team_names)], idx // len(team_names) + 1)
+        for idx in range(config.people)
+    ]
+
+
+def create_clean_nickname(person: Person, rnd: random.Random) -> str:
+    """生成规范的昵称：正式名称、正式昵称或姓名。"""
+    team_number = f'{person.team}{person.number}'
+    kind = rnd.random()
+    if kind < 0.6:
+        return f'{team_number}{person.name}'
+    if kind < 0.85 and len(person.name) >= 3:
+        return f'{team_number}{person.name[1:]}'
+    if kind < 0.95:
+        return team_number
+    return person.name
+
+
+def create_noisy_nickname(person: Person, rnd: random.Random) -> str:
+    """生成带噪声的昵称。"""
+    kind = rnd.random()
+    if kind < 0.4 and person.team[0] in CITY_PREFIXES:
+        return f'{CITY_PREFIXES[person.team[0]]}{person.team[1:]}{person.number}{person.name}'
+    if kind < 0.7:
+        return f'{person.team}{person.number}{person.name}'.translate(FULLWIDTH_DIGITS)
+    return f'{person.team} {person.number}-{person.name}'
+
+
+def create_unmatched_fullname(rnd: random.Random) -> str:
+    """生成无法匹配人员的用户名。"""
+    if rnd.random() < 0.5:
+        return f'{rnd.choice(DEVICE_NAMES)}(user{rnd.randrange(100000)})'
+    name = create_name(rnd) + rnd.choice(GIVEN_NAMES)
+    return f'{name}({name})'
+
+
+def create_fullname(person: Person, config: MeetingConfig, rnd: random.Random) -> str:
+    """生成人员的用户名，格式为“会议名称(会议昵称)”。"""
+    if rnd.random() < config.noise:
+        nickname = create_noisy_nickname(person, rnd)
+    else:
+        nickname = create_clean_nickname(person, rnd)
+    meeting_name = rnd.choice(('', person.name, nickname, rnd.choice(DEVICE_NAMES)))
+    return f'{meeting_name}({nickname})'
+
+
+def iter_sessions(config: MeetingConfig, rnd: random.Random) -> Iterator[Tuple[datetime, datetime]]:
+    """生成一位参会者的进出时间，按rejoin概率重新入会。"""
+    enter_time = MEETING_START_TIME + timedelta(seconds=rnd.randint(-1800, 3600))
+    while True:
+        exit_time = enter_time + timedelta(seconds=rnd.randint(60, 9000))
+        yield enter_time, exit_time
+        if exit_time >= MEETING_END_TIME or rnd.random() >= config.rejoin:
+            return
+        enter_time = exit_time + timedelta(seconds=rnd.randint(0, 600))
+
+
+def iter_detail_rows(people: List[Person],
+                     config: MeetingConfig,
+                     rnd: random.Random) -> Iterator[Tuple[str, str, str]]:
+    """生成成员观看明细的行：(用户名, 进入时间, 退出时间)。"""
+    fullnames = [
+        create_fullname(person, config, rnd)
+        for person in people if rnd.random() >= config.absent
+    ]
+    fullnames.extend(
+        create_unmatched_fullname(rnd) for _ in range(round(config.people * config.unmatched))
+    )
+    rnd.shuffle(fullnames)
+    for fullname in fullnames:
+        for enter_time, exit_time in iter_sessions(config, rnd):
+            yield (
+                fullname,
+                enter_time.strftime(DATETIME_FORMAT),
+                exit_time.strftime(DATETIME_FORMAT),
+            )
+
+
+def iter_detail_sheet_rows(detail_rows: Iterator[Tuple[str, str, str]]) -> Iterator[list]:
+    """按考勤数据导出的布局生成整行：用户名在B列，进入、退出时间在G、H列。"""
+    for _ in range(DETAIL_HEADER_ROWS):
+        yield ['表头']
+    for fullname, enter_time, exit_time in detail_rows:
+        yield [None, fullname, None, None, None, None, enter_time, exit_time, None]
+
+
+def write_summary_workbook(filepath: str, people: List[Person], config: MeetingConfig):
+    """生成生活修行考勤表。"""
+    team_names = create_team_names(config.team_count())
+    zone_names = [f'区域{idx + 1}' for idx in range(config.zone_count())]
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(PEOPLE_SHEET_NAME)
+    sheet.append(['序号', '姓名', '大组', '小组', '编号'])
+    for idx, person in enumerate(people, 1):
+        sheet.append([idx, person.name, '大组', person.team, person.number])
+    sheet = workbook.create_sheet(MEETING_INFO_SHEET_NAME)
+    sheet.append(['节气名', MEETING_NAME])
+    sheet.append(['会议开始时间', MEETING_START_TIME])
+    sheet.append(['会议结束时间', MEETING_END_TIME])
+    workbook.create_sheet(MISMATCHED_SHEET_NAME)
+    workbook.create_sheet(TOTAL_ABSENT_SHEET_NAME)
+    sheet = workbook.create_sheet(TEAM_MAPPING_SHEET_NAME)
+    for idx, team in enumerate(team_names):
+        sheet.append([team, zone_names[idx % len(zone_names)]])
+    for zone in zone_names:
+        workbook.create_sheet(zone)
+    workbook.save(filepath)
+
+
+def write_attendance_workbook(filepath: str, detail_rows: Iterator[Tuple[str, str, str]]):
+    """生成考勤数据。"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(DETAIL_OF_MEMBER_ATTENDANCE)
+    for row in iter_detail_sheet_rows(detail_rows):
+        sheet.append(row)
+    workbook.save(filepath)
+
+
+def write_attendance_csv(filepath: str, detail_rows: Iterator[Tuple[str, str, str]]):
+    """生成CSV格式的考勤数据。"""
+    with open(filepath, 'w', encoding='utf-8-sig', newline='') as file:
+        csv.writer(file).writerows(iter_detail_sheet_rows(detail_rows))
+
+
+def generate_meeting(meeting: str, config: MeetingConfig) -> int:
+    """在节气目录中生成输入文件，返回明细行数。"""
+    rnd = random.Random(config.seed)
+    os.makedirs(meeting, exist_ok=True)
+    people = create_people(config, rnd)
+    write_summary_workbook(os.path.join(meeting, MEETING_SUMMARY_FILENAME), people, config)
+    detail_rows = list(iter_detail_rows(people, config, rnd))
+    if config.csv:
+        write_attendance_csv(os.path.join(meeting, MEETING_ATTENDANCE_CSV_FILENAME), detail_rows)
+    else:
+        write_attendance_workbook(os.path.join(meeting, MEETING_ATTENDANCE_FILENAME), detail_rows)
+    return len(detail_rows)
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """添加生成配置的命令行参数。"""
+    defaults = MeetingConfig()
+    for field in MeetingConfig._fields:
+        default = getattr(defaults, field)
+        if isinstance(default, bool):
+            parser.add_argument(f'--{field}', action='store_true')
+        else:
+            parser.add_argument(f'--{field}', type=type(default), default=default)
+
+
+def parse_config(args: argparse.Namespace, **overrides) -> MeetingConfig:
+    """从命令行参数创建生成配置。"""
+    fields = {field: getattr(args, field) for field in MeetingConfig._fields}
+    return MeetingConfig(**{**fields, **overrides})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('meeting')
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    config = parse_config(args)
+    rows = generate_meeting(args.meeting, config)
+    print(
+        f"已生成'{args.meeting}'：人员{config.people}，小组{config.team_count()}，"
+        f'区域{config.zone_count()}，明细{rows}行。'
+    )
+
+
+if __name__ == '__main__':
+    main()
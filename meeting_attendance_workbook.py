@@ -3,16 +3,32 @@
 
 """考勤数据工作簿。"""
 
+import codecs
+import csv
+import posixpath
 import re
+from array import array
 from datetime import datetime, timedelta
-from functools import partial, reduce
-from itertools import groupby
+from functools import lru_cache, partial, reduce
+from itertools import islice
 from operator import add, attrgetter, methodcaller
-from typing import NamedTuple, Tuple
+from typing import (
+    Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple,
+)
+from xml.etree.ElementTree import fromstring, iterparse
+from zipfile import ZipFile
+
+import numpy as np
+from openpyxl.styles.numbers import (
+    BUILTIN_FORMATS, is_date_format, is_timedelta_format,
+)
+from openpyxl.utils.datetime import (
+    MAC_EPOCH, WINDOWS_EPOCH, from_excel, from_ISO8601,
+)
 
 from meeting_comm import (
     InvalidAttendanceInfo,
-    pipe, swap_args, tuple_args, expand_groupby,
+    compile_pipe, if_, pipe, swap_args, tuple_args, expand_hash_groupby,
 )
 
 
@@ -66,13 +82,19 @@ def parse_fullname(fullname: str) -> Tuple[str, str]:
     return meeting_name, matchobj.group(2)
 
 
+# 全角字符（！到～）转半角的映射表
+FULLWIDTH_TO_HALFWIDTH = str.maketrans({
+    code: code - 0xFEE0 for code in range(ord('！'), ord('～') + 1)
+})
+
 # 标准化用户昵称
 # str -> str
-normalize_name = pipe(
+normalize_name = compile_pipe(pipe(
     partial(re.sub, r' |_|-|，|~|', ''),
     partial(re.sub, r'\d+', pipe(methodcaller('group', 0), int, str)),
-    partial(re.sub, r'[Ａ-Ｚａ-ｚ０-９！-～]', lambda x: chr(ord(x.group(0)) - 65248)), # 全角字符转半角
-)
+    methodcaller('translate', FULLWIDTH_TO_HALFWIDTH),
+    name='normalize_name',
+))
 
 # 城市映射
 CITY_MAPPING = {
@@ -103,11 +125,28 @@ def normalize_nickname(nickname: str) -> str:
     return first + second.upper() + thrid
 
 
-# 解析时间
-# str -> datetime
-parse_datetime = pipe(
-    partial(swap_args(datetime.strptime), '%Y-%m-%d %H:%M:%S'),
-)
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+@lru_cache(maxsize=65536)
+def parse_datetime_text(text: str) -> datetime:
+    """解析DATETIME_FORMAT格式的时间。按定长切片解析，其它格式交给strptime。"""
+    if (len(text) == 19 and text.isascii()
+            and text[4] == '-' and text[7] == '-' and text[10] == ' '
+            and text[13] == ':' and text[16] == ':'):
+        fields = (
+            text[0:4], text[5:7], text[8:10], text[11:13], text[14:16], text[17:19]
+        )
+        if all(map(str.isdigit, fields)):
+            return datetime(*map(int, fields))
+    return datetime.strptime(text, DATETIME_FORMAT)
+
+
+def parse_datetime(value) -> datetime:
+    """解析时间。openpyxl已转换为datetime的单元格直接返回。"""
+    if isinstance(value, datetime):
+        return value
+    return parse_datetime_text(value)
 
 # 解析时间
 # str -> time
@@ -116,11 +155,10 @@ parse_time = pipe(
     methodcaller('time'),
 )
 
-# 转换“成员参会明细”表为内部数据结构
-# Worksheet -> Tuple[Tuple[str, ...], ...]
+# 转换“成员参会明细”表为内部数据结构。逐行产出，不物化全部行。
+# Worksheet -> Iterator[Tuple[str, ...]]
 convert_detail_sheet = pipe(
     methodcaller('iter_rows', min_row=10, min_col=2, max_col=9, values_only=True),
-    tuple,
 )
 
 
@@ -131,13 +169,23 @@ def transform_row_data(row: Tuple[str, ...]) -> Tuple[str, ...]:
     return '(None)', *row[1:]
 
 
+@lru_cache(maxsize=65536)
+def parse_normalized_fullname(fullname: str) -> Tuple[str, str]:
+    """解析用户名，返回会议名称和标准化后的会议昵称。
+
+    按用户名缓存，重新入会产生的重复行只需查一次字典。
+    """
+    meeting_name, nickname = parse_fullname(fullname)
+    return meeting_name, normalize_nickname(normalize_name(nickname))
+
+
 def parse_attendance_info(row: Tuple[str, ...]):
     """解析参会信息。"""
     fullname = row[0]
-    meeting_name, nickname = parse_fullname(fullname)
+    meeting_name, nickname = parse_normalized_fullname(fullname)
 
     return AttendanceInfo(
-        normalize_nickname(normalize_name(nickname)),
+        nickname,
         meeting_name,
         fullname,
         parse_datetime(row[5]),
@@ -145,9 +193,9 @@ def parse_attendance_info(row: Tuple[str, ...]):
     )
 
 
-# 解析成员参会明细条目
-# Tuple[str, ...] -> Tuple[AttendanceInfo, ...]
-parse_attendance_detail_info = pipe(
+# 逐条解析成员参会明细条目
+# Iterable[Tuple[str, ...]] -> Iterator[AttendanceInfo]
+iter_attendance_detail_info = pipe(
     tuple_args,
     partial(
         map,
@@ -157,33 +205,298 @@ parse_attendance_detail_info = pipe(
         map,
         parse_attendance_info,
     ),
+    name='iter_attendance_detail_info',
+)
+
+# 解析成员参会明细条目
+# Tuple[str, ...] -> Tuple[AttendanceInfo, ...]
+parse_attendance_detail_info = pipe(
+    iter_attendance_detail_info,
     tuple,
+    name='parse_attendance_detail_info',
 )
 
 
 def merge_attendance_infos(attendance_infos: AttendanceInfos) -> dict[str, AttendanceInfos]:
-    """合并同名的参会信息。"""
+    """合并同名的参会信息。同名的参会信息不必相邻，按名称首次出现的顺序排列。"""
     return dict(
-        expand_groupby(groupby(attendance_infos, key=attrgetter('origin_name')))
+        expand_hash_groupby(attendance_infos, attrgetter('origin_name'))
     )
 
 
 def partition_attendance_infos(attendance_infos: AttendanceInfos) -> dict[str, AttendanceInfos]:
-    """划分参会信息。"""
+    """按会议名称划分参会信息，按会议名称首次出现的顺序排列。"""
     return dict(
-        expand_groupby(
-            groupby(
-                sorted(attendance_infos, key=attrgetter('meeting_name')),
-                key=attrgetter('meeting_name')
-            )
-        )
+        expand_hash_groupby(attendance_infos, attrgetter('meeting_name'))
     )
 
 
-# 解析“成员参会明细”
-# Worksheet -> Tuple[AttendanceInfo, ...]
+# 解析“成员参会明细”。配合只读模式的工作簿使用时内存占用与行数无关。
+# Worksheet -> Iterator[AttendanceInfo]
 parse_attendance_detail_sheet = pipe(
-    convert_detail_sheet, parse_attendance_detail_info
+    convert_detail_sheet, iter_attendance_detail_info
+)
+
+
+XLSX_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+XLSX_RELATIONSHIP_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+XLSX_PACKAGE_RELATIONSHIP_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+XLSX_ROW_TAG = f'{XLSX_MAIN_NS}row'
+XLSX_CELL_TAG = f'{XLSX_MAIN_NS}c'
+XLSX_VALUE_TAG = f'{XLSX_MAIN_NS}v'
+XLSX_TEXT_TAG = f'{XLSX_MAIN_NS}t'
+XLSX_RICH_TEXT_TAG = f'{XLSX_MAIN_NS}r'
+XLSX_INLINE_STRING_TAG = f'{XLSX_MAIN_NS}is'
+XLSX_SHEET_DATA_TAG = f'{XLSX_MAIN_NS}sheetData'
+
+
+class XlsxWorkbookParts(NamedTuple):
+    """xlsx工作簿中直接读取工作表所需的部件。"""
+    sheet_paths: Dict[str, str]  # 工作表名 -> 压缩包内路径
+    shared_strings: Tuple[str, ...]
+    date_styles: Set[int]  # 日期格式的样式序号
+    timedelta_styles: Set[int]  # 时长格式的样式序号
+    epoch: datetime
+
+
+def _resolve_xlsx_target(target: str) -> str:
+    """解析工作簿关系中的目标路径。"""
+    if target.startswith('/'):
+        return target[1:]
+    return posixpath.normpath(posixpath.join('xl', target))
+
+
+def _read_xlsx_text(element) -> str:
+    """读取字符串条目的文本，忽略拼音注释。"""
+    snippets = []
+    for child in element:
+        if child.tag == XLSX_TEXT_TAG:
+            snippets.append(child.text or '')
+        elif child.tag == XLSX_RICH_TEXT_TAG:
+            snippets.append(child.findtext(XLSX_TEXT_TAG) or '')
+    return ''.join(snippets)
+
+
+def _read_xlsx_shared_strings(archive: ZipFile, path: Optional[str]) -> Tuple[str, ...]:
+    """增量读取共享字符串表。"""
+    if path is None or path not in archive.namelist():
+        return tuple()
+    shared_strings = []
+    with archive.open(path) as stream:
+        for _, element in iterparse(stream):
+            if element.tag == f'{XLSX_MAIN_NS}si':
+                shared_strings.append(_read_xlsx_text(element))
+                element.clear()
+    return tuple(shared_strings)
+
+
+def _read_xlsx_styles(archive: ZipFile, path: Optional[str]) -> Tuple[Set[int], Set[int]]:
+    """读取日期及时长格式的样式序号，判定规则与openpyxl一致。"""
+    date_styles, timedelta_styles = set(), set()
+    if path is None or path not in archive.namelist():
+        return date_styles, timedelta_styles
+    stylesheet = fromstring(archive.read(path))
+    custom_formats = {
+        int(element.get('numFmtId')): element.get('formatCode')
+        for element in stylesheet.iter(f'{XLSX_MAIN_NS}numFmt')
+    }
+    cell_xfs = stylesheet.find(f'{XLSX_MAIN_NS}cellXfs')
+    if cell_xfs is None:
+        return date_styles, timedelta_styles
+    for idx, element in enumerate(cell_xfs.iter(f'{XLSX_MAIN_NS}xf')):
+        num_fmt_id = int(element.get('numFmtId', 0))
+        fmt = custom_formats.get(num_fmt_id, BUILTIN_FORMATS.get(num_fmt_id))
+        if is_date_format(fmt):
+            date_styles.add(idx)
+        if is_timedelta_format(fmt):
+            timedelta_styles.add(idx)
+    return date_styles, timedelta_styles
+
+
+def read_xlsx_workbook_parts(archive: ZipFile) -> XlsxWorkbookParts:
+    """读取工作簿结构、共享字符串与样式。"""
+    with archive.open('xl/_rels/workbook.xml.rels') as stream:
+        relationships = {
+            element.get('Id'): (element.get('Type'), element.get('Target'))
+            for _, element in iterparse(stream)
+            if element.tag == f'{XLSX_PACKAGE_RELATIONSHIP_NS}Relationship'
+        }
+    targets_by_type = {
+        rel_type.rsplit('/', 1)[-1]: _resolve_xlsx_target(target)
+        for rel_type, target in relationships.values()
+    }
+
+    sheet_paths = {}
+    epoch = WINDOWS_EPOCH
+    with archive.open('xl/workbook.xml') as stream:
+        for _, element in iterparse(stream):
+            if element.tag == f'{XLSX_MAIN_NS}sheet':
+                _, target = relationships[element.get(f'{XLSX_RELATIONSHIP_NS}id')]
+                sheet_paths[element.get('name')] = _resolve_xlsx_target(target)
+            elif element.tag == f'{XLSX_MAIN_NS}workbookPr':
+                if element.get('date1904') in ('1', 'true'):
+                    epoch = MAC_EPOCH
+
+    date_styles, timedelta_styles = _read_xlsx_styles(
+        archive, targets_by_type.get('styles')
+    )
+    return XlsxWorkbookParts(
+        sheet_paths,
+        _read_xlsx_shared_strings(archive, targets_by_type.get('sharedStrings')),
+        date_styles,
+        timedelta_styles,
+        epoch,
+    )
+
+
+@lru_cache(maxsize=None)
+def column_letters_to_index(letters: str) -> int:
+    """列字母转换为列号，从1开始。"""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - 64
+    return index
+
+
+def _read_xlsx_cell_value(element, parts: XlsxWorkbookParts) -> Any:
+    """读取单元格的值，类型转换与openpyxl的values_only一致。"""
+    data_type = element.get('t', 'n')
+    if data_type == 'inlineStr':
+        child = element.find(XLSX_INLINE_STRING_TAG)
+        return None if child is None else _read_xlsx_text(child)
+
+    value = element.findtext(XLSX_VALUE_TAG) or None
+    if value is None:
+        return None
+    if data_type == 's':
+        return parts.shared_strings[int(value)]
+    if data_type == 'n':
+        if '.' in value or 'E' in value or 'e' in value:
+            value = float(value)
+        else:
+            value = int(value)
+        style_id = int(element.get('s', 0))
+        if style_id in parts.date_styles:
+            return from_excel(
+                value, parts.epoch, timedelta=style_id in parts.timedelta_styles
+            )
+        return value
+    if data_type == 'b':
+        return bool(int(value))
+    if data_type == 'd':
+        return from_ISO8601(value)
+    return value
+
+
+def iter_xlsx_sheet_rows(filepath: str,
+                         sheet_name: str,
+                         min_row: int = 1,
+                         min_col: int = 1,
+                         max_col: int = 1) -> Iterator[Tuple[Any, ...]]:
+    """直接从xlsx压缩包增量解析工作表，逐行产出指定列的值。
+
+    不创建openpyxl对象，内存占用与行数无关。缺失的行以None填充，
+    与openpyxl只读模式的iter_rows(values_only=True)一致；公式单元格取缓存值。
+    """
+    width = max_col - min_col + 1
+    empty_row = (None,) * width
+    with ZipFile(filepath) as archive:
+        parts = read_xlsx_workbook_parts(archive)
+        with archive.open(parts.sheet_paths[sheet_name]) as stream:
+            sheet_data = None
+            row_counter = 0
+            next_row = min_row
+            for event, element in iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    if element.tag == XLSX_SHEET_DATA_TAG:
+                        sheet_data = element
+                    continue
+                if element.tag != XLSX_ROW_TAG:
+                    continue
+
+                row_ref = element.get('r')
+                row_counter = int(row_ref) if row_ref else row_counter + 1
+                if row_counter >= min_row:
+                    for _ in range(next_row, row_counter):
+                        yield empty_row
+                    values = [None] * width
+                    col_counter = 0
+                    for cell in element.iter(XLSX_CELL_TAG):
+                        cell_ref = cell.get('r')
+                        if cell_ref:
+                            col_counter = column_letters_to_index(
+                                cell_ref.rstrip('0123456789')
+                            )
+                        else:
+                            col_counter += 1
+                        if min_col <= col_counter <= max_col:
+                            values[col_counter - min_col] = _read_xlsx_cell_value(cell, parts)
+                    next_row = row_counter + 1
+                    yield tuple(values)
+                if sheet_data is not None:
+                    sheet_data.clear()
+
+
+# 直接读取xlsx文件中的“成员观看明细”，产出与convert_detail_sheet相同的行
+# str -> Iterator[Tuple[str, ...]]
+read_detail_sheet = partial(
+    iter_xlsx_sheet_rows,
+    sheet_name=DETAIL_OF_MEMBER_ATTENDANCE, min_row=10, min_col=2, max_col=9,
+)
+
+# csv导出文件可能使用的编码，依次尝试
+CSV_ENCODINGS = ('utf-8-sig', 'gb18030')
+
+
+def detect_csv_encoding(filepath: str, sample_size: int = 64 * 1024) -> str:
+    """根据文件开头的内容判断csv文件的编码。"""
+    with open(filepath, 'rb') as file:
+        sample = file.read(sample_size)
+    for encoding in CSV_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        except UnicodeDecodeError:
+            continue
+        return encoding
+    return CSV_ENCODINGS[-1]
+
+
+def iter_csv_rows(filepath: str,
+                  min_row: int = 1,
+                  min_col: int = 1,
+                  max_col: int = 1) -> Iterator[Tuple[Any, ...]]:
+    """流式读取csv文件，逐行产出指定列的值。
+
+    行列号从1开始，空单元格及缺失的列为None，与iter_xlsx_sheet_rows一致；跳过空行。
+    """
+    width = max_col - min_col + 1
+    with open(filepath, newline='', encoding=detect_csv_encoding(filepath)) as file:
+        for row in islice(csv.reader(file), min_row - 1, None):
+            if not any(row):
+                continue
+            values = row[min_col - 1:max_col]
+            yield tuple(value or None for value in values) + (None,) * (width - len(values))
+
+
+def is_csv_filepath(filepath: str) -> bool:
+    """是否为csv文件。"""
+    return filepath.lower().endswith('.csv')
+
+
+# 读取csv导出文件中的“成员观看明细”，列与convert_detail_sheet相同
+# str -> Iterator[Tuple[str, ...]]
+read_detail_csv = partial(iter_csv_rows, min_row=10, min_col=2, max_col=9)
+
+# 按扩展名读取考勤数据中的“成员观看明细”
+# str -> Iterator[Tuple[str, ...]]
+read_detail_rows = if_(is_csv_filepath, read_detail_csv, read_detail_sheet)
+
+# 解析考勤数据文件（xlsx或csv）中的“成员观看明细”
+# str -> Iterator[AttendanceInfo]
+parse_attendance_detail_file = pipe(
+    read_detail_rows, iter_attendance_detail_info,
+    name='parse_attendance_detail_file',
 )
 
 
@@ -219,3 +532,311 @@ def summarize_attendance_time(attendance_infos: AttendanceInfos) -> timedelta:
     return reduce(
         add, map(get_attendance_time_by_detail_info, attendance_infos), timedelta()
     )
+
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_microseconds(value: datetime) -> int:
+    """时间转换为距EPOCH的微秒数。"""
+    return (value - EPOCH) // MICROSECOND
+
+
+def microseconds_to_datetime(value: int) -> datetime:
+    """距EPOCH的微秒数转换为时间。"""
+    return EPOCH + timedelta(microseconds=value)
+
+
+class AttendanceTable:
+    """列式存储的参会信息。
+
+    时间列为距EPOCH的微秒数，名称列为names中的字典编码。
+    行号为解析时的序号，切片、划分后保持不变，可通过AttendanceRows按行号引用。
+    切片得到共享名称字典的新表，按需再转换为AttendanceInfo。
+    """
+
+    __slots__ = (
+        'names', 'nickname_codes', 'meeting_name_codes', 'origin_name_codes',
+        'enter_times', 'exit_times', 'row_ids',
+    )
+
+    def __init__(self,
+                 names: Tuple[str, ...],
+                 nickname_codes: np.ndarray,
+                 meeting_name_codes: np.ndarray,
+                 origin_name_codes: np.ndarray,
+                 enter_times: np.ndarray,
+                 exit_times: np.ndarray,
+                 row_ids: Optional[np.ndarray] = None):
+        self.names = names
+        self.nickname_codes = nickname_codes
+        self.meeting_name_codes = meeting_name_codes
+        self.origin_name_codes = origin_name_codes
+        self.enter_times = enter_times
+        self.exit_times = exit_times
+        if row_ids is None:
+            row_ids = np.arange(len(enter_times), dtype=ATTENDANCE_ROW_ID_TYPE)
+        self.row_ids = row_ids
+
+    def __len__(self) -> int:
+        return len(self.enter_times)
+
+    def __getitem__(self, key):
+        """整数下标返回AttendanceInfo，切片或下标数组返回AttendanceTable。"""
+        if isinstance(key, (int, np.integer)):
+            return AttendanceInfo(
+                self.names[self.nickname_codes[key]],
+                self.names[self.meeting_name_codes[key]],
+                self.names[self.origin_name_codes[key]],
+                microseconds_to_datetime(int(self.enter_times[key])),
+                microseconds_to_datetime(int(self.exit_times[key])),
+            )
+        return AttendanceTable(
+            self.names,
+            self.nickname_codes[key],
+            self.meeting_name_codes[key],
+            self.origin_name_codes[key],
+            self.enter_times[key],
+            self.exit_times[key],
+            self.row_ids[key],
+        )
+
+    def __iter__(self) -> Iterator[AttendanceInfo]:
+        names = self.names
+        for nickname, meeting_name, origin_name, enter_time, exit_time in zip(
+            self.nickname_codes.tolist(), self.meeting_name_codes.tolist(),
+            self.origin_name_codes.tolist(), self.enter_times.tolist(),
+            self.exit_times.tolist(),
+        ):
+            yield AttendanceInfo(
+                names[nickname], names[meeting_name], names[origin_name],
+                microseconds_to_datetime(enter_time),
+                microseconds_to_datetime(exit_time),
+            )
+
+    def __repr__(self) -> str:
+        return f'AttendanceTable(rows={len(self)}, names={len(self.names)})'
+
+    def name_pairs(self) -> Set[Tuple[str, str]]:
+        """去重后的(会议昵称, 会议名称)。"""
+        names = self.names
+        return {
+            (names[nickname], names[meeting_name])
+            for nickname, meeting_name in set(zip(
+                self.nickname_codes.tolist(), self.meeting_name_codes.tolist()
+            ))
+        }
+
+
+ATTENDANCE_CODE_TYPE = np.int32
+ATTENDANCE_TIME_TYPE = np.int64
+ATTENDANCE_ROW_ID_TYPE = np.int32
+
+
+class AttendanceRows:
+    """按行号引用参会信息表中的行，只保存行号数组，不复制各列。
+
+    table的行号须与行的位置一致，如create_attendance_table创建的表，
+    划分、切片后的表可通过行号引用原表。各列按需取出，行为与table[row_ids]一致。
+    """
+
+    __slots__ = ('table', 'row_ids')
+
+    def __init__(self, table: AttendanceTable, row_ids: np.ndarray):
+        self.table = table
+        self.row_ids = row_ids
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def __getitem__(self, key):
+        """整数下标返回AttendanceInfo，切片或下标数组返回AttendanceTable。"""
+        return self.table[self.row_ids[key]]
+
+    def __iter__(self) -> Iterator[AttendanceInfo]:
+        return iter(self.to_table())
+
+    def __repr__(self) -> str:
+        return f'AttendanceRows(rows={len(self)}, table={self.table!r})'
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return self.table.names
+
+    @property
+    def meeting_name_codes(self) -> np.ndarray:
+        return self.table.meeting_name_codes[self.row_ids]
+
+    @property
+    def enter_times(self) -> np.ndarray:
+        return self.table.enter_times[self.row_ids]
+
+    @property
+    def exit_times(self) -> np.ndarray:
+        return self.table.exit_times[self.row_ids]
+
+    def to_table(self) -> AttendanceTable:
+        """取出引用的行，创建参会信息表。"""
+        return self.table[self.row_ids]
+
+
+def create_attendance_table(attendance_infos: Iterable[AttendanceInfo]) -> AttendanceTable:
+    """逐条读取参会信息，创建列式参会信息表。"""
+    codes: Dict[str, int] = {}
+    nickname_codes, meeting_name_codes, origin_name_codes = array('i'), array('i'), array('i')
+    enter_times, exit_times = array('q'), array('q')
+    for info in attendance_infos:
+        nickname_codes.append(codes.setdefault(info.nickname, len(codes)))
+        meeting_name_codes.append(codes.setdefault(info.meeting_name, len(codes)))
+        origin_name_codes.append(codes.setdefault(info.origin_name, len(codes)))
+        enter_times.append(datetime_to_microseconds(info.enter_time))
+        exit_times.append(datetime_to_microseconds(info.exit_time))
+    return AttendanceTable(
+        tuple(codes),
+        np.frombuffer(nickname_codes, dtype=ATTENDANCE_CODE_TYPE),
+        np.frombuffer(meeting_name_codes, dtype=ATTENDANCE_CODE_TYPE),
+        np.frombuffer(origin_name_codes, dtype=ATTENDANCE_CODE_TYPE),
+        np.frombuffer(enter_times, dtype=ATTENDANCE_TIME_TYPE),
+        np.frombuffer(exit_times, dtype=ATTENDANCE_TIME_TYPE),
+    )
+
+
+def concat_attendance_tables(tables: Iterable[AttendanceTable]) -> AttendanceTable:
+    """拼接共享名称字典的参会信息表。"""
+    tables = tuple(tables)
+    if not tables:
+        return create_attendance_table(())
+    names = tables[0].names
+    if any(table.names is not names for table in tables):
+        raise ValueError('参会信息表的名称字典不一致')
+    if len(tables) == 1:
+        return tables[0]
+    return AttendanceTable(
+        names,
+        *(
+            np.concatenate([getattr(table, column) for table in tables])
+            for column in AttendanceTable.__slots__[1:]
+        )
+    )
+
+
+def select_attendance_rows(table: AttendanceTable,
+                           tables: Iterable[AttendanceTable]) -> AttendanceRows:
+    """按行号引用table中若干参会信息表的行，保持各表及表内的顺序。"""
+    row_ids = [one_table.row_ids for one_table in tables]
+    if not row_ids:
+        return AttendanceRows(table, np.empty(0, dtype=ATTENDANCE_ROW_ID_TYPE))
+    return AttendanceRows(table, np.concatenate(row_ids))
+
+
+def partition_attendance_table(table: AttendanceTable) -> Dict[str, AttendanceTable]:
+    """按会议名称划分参会信息表，与partition_attendance_infos的顺序一致。
+
+    整表按会议名称首次出现的顺序稳定排序一次，各组为排序后表的连续切片。
+    """
+    codes, first_rows = np.unique(table.meeting_name_codes, return_index=True)
+    keys = codes[np.argsort(first_rows)].tolist()
+    ranks = np.zeros(len(table.names), dtype=np.int64)
+    ranks[keys] = np.arange(len(keys))
+    order = np.argsort(ranks[table.meeting_name_codes], kind='stable')
+    ordered = table[order]
+    bounds = np.searchsorted(
+        ranks[ordered.meeting_name_codes], np.arange(len(keys) + 1)
+    ).tolist()
+    return {
+        table.names[key]: ordered[lower:upper]
+        for key, lower, upper in zip(keys, bounds, bounds[1:])
+    }
+
+
+def attendance_times_to_arrays(attendance_infos: Iterable[AttendanceInfo]
+                               ) -> Tuple[np.ndarray, np.ndarray]:
+    """参会信息的入会、退会时间转换为int64微秒数组。参会信息表直接返回时间列。"""
+    if isinstance(attendance_infos, (AttendanceTable, AttendanceRows)):
+        return attendance_infos.enter_times, attendance_infos.exit_times
+    attendance_infos = tuple(attendance_infos)
+    enter_times = np.fromiter(
+        (datetime_to_microseconds(info.enter_time) for info in attendance_infos),
+        dtype=ATTENDANCE_TIME_TYPE, count=len(attendance_infos),
+    )
+    exit_times = np.fromiter(
+        (datetime_to_microseconds(info.exit_time) for info in attendance_infos),
+        dtype=ATTENDANCE_TIME_TYPE, count=len(attendance_infos),
+    )
+    return enter_times, exit_times
+
+
+def clip_attendance_times(meeting_start_time: datetime,
+                          meeting_end_time: datetime,
+                          enter_times: np.ndarray,
+                          exit_times: np.ndarray
+                          ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """批量裁剪到会议时间内，返回(相交掩码, 裁剪后入会时间, 裁剪后退会时间)。
+
+    与does_attendance_detail_info_intersect、normalize_attendance_detail_info_time逐条处理的结果一致。
+    """
+    start = datetime_to_microseconds(meeting_start_time)
+    end = datetime_to_microseconds(meeting_end_time)
+    intersected = (enter_times <= end) & (exit_times >= start)
+    return (
+        intersected,
+        np.clip(enter_times, start, end),
+        np.clip(exit_times, start, end),
+    )
+
+
+def clip_attendance_infos(meeting_start_time: datetime,
+                          meeting_end_time: datetime,
+                          attendance_infos: Iterable[AttendanceInfo]) -> AttendanceInfos:
+    """批量标准化参会明细信息：去掉与会议时间不相交的条目，并裁剪到会议时间内。"""
+    if not isinstance(attendance_infos, AttendanceTable):
+        attendance_infos = tuple(attendance_infos)
+    enter_times, exit_times = attendance_times_to_arrays(attendance_infos)
+    intersected, clipped_enter_times, clipped_exit_times = clip_attendance_times(
+        meeting_start_time, meeting_end_time, enter_times, exit_times
+    )
+    # 相交的条目入会时间只会被裁剪到会议开始时间，退会时间只会被裁剪到会议结束时间
+    enter_clipped = clipped_enter_times != enter_times
+    exit_clipped = clipped_exit_times != exit_times
+    result = []
+    for idx in np.flatnonzero(intersected).tolist():
+        info = attendance_infos[idx]
+        if enter_clipped[idx]:
+            info = info._replace(enter_time=meeting_start_time)
+        if exit_clipped[idx]:
+            info = info._replace(exit_time=meeting_end_time)
+        result.append(info)
+    return tuple(result)
+
+
+def summarize_grouped_attendance_times(meeting_start_time: datetime,
+                                       meeting_end_time: datetime,
+                                       groups: Sequence[Iterable[AttendanceInfo]]
+                                       ) -> List[timedelta]:
+    """批量汇总每组参会信息在会议时间内的出席时间。
+
+    所有条目一次性裁剪，再按组用bincount求和，
+    结果与逐组标准化后summarize_attendance_time一致。
+    """
+    times = [attendance_times_to_arrays(group) for group in groups]
+    if not times:
+        return []
+    counts = np.fromiter(
+        (len(enter_times) for enter_times, _ in times), dtype=np.int64, count=len(times)
+    )
+    owners = np.repeat(np.arange(len(times)), counts)
+    intersected, enter_times, exit_times = clip_attendance_times(
+        meeting_start_time, meeting_end_time,
+        np.concatenate([enter_times for enter_times, _ in times]),
+        np.concatenate([exit_times for _, exit_times in times]),
+    )
+    totals = np.bincount(
+        owners[intersected],
+        weights=(exit_times - enter_times)[intersected],
+        minlength=len(times),
+    )
+    return [
+        timedelta(microseconds=total)
+        for total in np.rint(totals).astype(np.int64).tolist()
+    ]
@@ -1,20 +1,41 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import hashlib
+import json
+import os
+import pickle
 import re
-from collections import deque
-from functools import partial
+import sys
+import threading
+import tracemalloc
+import zlib
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from concurrent.futures import (
+    FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait,
+)
+from functools import lru_cache, partial
 from itertools import chain, filterfalse, groupby, islice, tee
-from operator import contains, eq, itemgetter, not_
+from operator import attrgetter, contains, eq, itemgetter, not_
 from pathlib import Path
+from time import perf_counter
+from types import CodeType, ModuleType
+from unicodedata import east_asian_width
 from typing import (
-    Any, Callable, Iterator, NamedTuple, Union, Tuple, TypeVar,
+    Any, Callable, Dict, Generic, Iterable, Iterator, List, NamedTuple,
+    Optional, Set, Union, Tuple, TypeVar,
 )
 
 
 MEETING_SUMMARY_FILENAME = '生活修行考勤表.xlsx'
 MEETING_SUMMARY_OUTPUT_FILENAME = '生活修行考勤表（生成）.xlsx'
 MEETING_ATTENDANCE_FILENAME = '考勤数据.xlsx'
+MEETING_ATTENDANCE_CSV_FILENAME = '考勤数据.csv'
+MEETING_CACHE_FILENAME = '.考勤缓存'
+MEETING_PROFILE_FILENAME = '性能统计.jsonl'
+MEETING_PIPE_TRACE_FILENAME = '管道统计.json'
+MEETING_STORE_FILENAME = '考勤结果.db'
 
 SUFFIX_NUMBER = re.compile(r'\d+$')
 
@@ -67,6 +88,7 @@ def cross(*funcs) -> Callable:
     """交错。"""
     def cross_func(x):
         return map(starapply(invoke), zip(funcs, x))
+    cross_func.combinator = (cross, funcs)
     return cross_func
 
 
@@ -80,6 +102,7 @@ def dispatch(*funcs) -> Callable:
     """分派。"""
     def dispatch_func(*args, **kwargs):
         return (func(*args, **kwargs) for func in funcs)
+    dispatch_func.combinator = (dispatch, funcs)
     return dispatch_func
 
 
@@ -103,6 +126,7 @@ def if_(predicate: Callable,
         if else_func:
             return else_func(x)
         return x
+    if_func.combinator = (if_, (predicate, then_func, else_func))
     return if_func
 
 
@@ -117,16 +141,15 @@ def islice_(iterable, start = None, stop = None, step = None):
 
 
 def make_graph(*args: Tuple[str, str, Callable]):
-    """创建图。"""
-    graph = tuple(GraphRule(*arg) for arg in args)
+    """创建图。同时建立目标到规则的索引。"""
+    graph = RuleGraph(GraphRule(*arg) for arg in args)
 
-    targets = set()
     for rule in graph:
         for output in target_to_targets(rule.outputs):
-            if output in targets:
+            if output in graph.target_index:
                 raise DuplicateTarget(output)
             else:
-                targets.add(output)
+                graph.target_index[output] = rule
     return graph
 
 
@@ -140,20 +163,262 @@ def partition(pred, iterable):
     return filter(pred, t1), filterfalse(pred, t2)
 
 
+class PipeTraceStats:
+    """命名管道的调用统计。"""
+
+    __slots__ = ('calls', 'total_seconds', 'self_seconds', 'input_sizes')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.self_seconds = 0.0  # 扣除内层命名管道后的耗时
+        self.input_sizes: Dict[str, int] = {}  # 输入大小区间 -> 次数
+
+
+def size_bucket(value: Any) -> Optional[str]:
+    """输入大小所在的区间，按数量级划分。不是可迭代对象时返回None。"""
+    if isinstance(value, (str, bytes)) or not hasattr(value, '__iter__'):
+        return None
+    try:
+        size = len(value)
+    except TypeError:
+        return 'unsized'
+    if size == 0:
+        return '0'
+    lower = 10 ** (len(str(size)) - 1)
+    return f'{lower}-{lower * 10 - 1}'
+
+
+def is_lazy_iterator(value: Any) -> bool:
+    """是否为生成器、map等内置惰性迭代器。文件、数据库游标等带其它方法的迭代器不计入。"""
+    return isinstance(value, Iterator) and type(value).__module__ in ('builtins', 'itertools')
+
+
+class PipeTracer:
+    """命名管道的追踪器，记录调用次数、累计耗时、自身耗时和可迭代输入的大小分布。
+
+    返回生成器、map等内置惰性迭代器的管道，消费时每取一项的耗时也计入该管道。
+    同名管道递归调用时累计耗时会重复计入。
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, PipeTraceStats] = {}
+        self._local = threading.local()
+
+    def call(self, name: str, func: Callable, args: tuple, kwargs: dict):
+        """调用并记录。"""
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats.setdefault(name, PipeTraceStats())
+        if len(args) == 1 and not kwargs:
+            bucket = size_bucket(args[0])
+            if bucket is not None:
+                stats.input_sizes[bucket] = stats.input_sizes.get(bucket, 0) + 1
+        stats.calls += 1
+        result = self.timed(stats, func, args, kwargs)
+        if is_lazy_iterator(result):
+            return self.timed_iter(stats, result)
+        return result
+
+    def timed(self, stats: PipeTraceStats, func: Callable, args: tuple, kwargs: dict):
+        """调用并计入耗时，内层命名管道的耗时从外层的自身耗时中扣除。"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0)
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            inner = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            stats.total_seconds += elapsed
+            stats.self_seconds += elapsed - inner
+
+    def timed_iter(self, stats: PipeTraceStats, iterator: Iterator) -> Iterator:
+        """逐项产出迭代器的元素，取每一项的耗时计入管道。"""
+        while True:
+            try:
+                yield self.timed(stats, next, (iterator,), {})
+            except StopIteration:
+                return
+
+    def report(self) -> List[dict]:
+        """按自身耗时降序导出统计。"""
+        return [
+            {
+                'name': name,
+                'calls': stats.calls,
+                'total_seconds': stats.total_seconds,
+                'self_seconds': stats.self_seconds,
+                'input_sizes': dict(stats.input_sizes),
+            }
+            for name, stats in sorted(
+                self.stats.items(), key=lambda item: item[1].self_seconds, reverse=True
+            )
+        ]
+
+
+class PipeTracing:
+    """管道追踪开关。tracer为None时命名管道只多一次属性判断。"""
+    tracer: Optional[PipeTracer] = None
+
+
+PIPE_TRACING = PipeTracing()
+
+
+def enable_pipe_tracing(tracer: Optional[PipeTracer] = None) -> PipeTracer:
+    """开启命名管道追踪。"""
+    PIPE_TRACING.tracer = PipeTracer() if tracer is None else tracer
+    return PIPE_TRACING.tracer
+
+
+def disable_pipe_tracing() -> Optional[PipeTracer]:
+    """关闭命名管道追踪，返回关闭前的追踪器。"""
+    tracer, PIPE_TRACING.tracer = PIPE_TRACING.tracer, None
+    return tracer
+
+
+@contextmanager
+def trace_pipes(enabled: bool = True) -> Iterator[Optional[PipeTracer]]:
+    """在上下文中追踪命名管道，产出追踪器；未启用时产出None。"""
+    if not enabled:
+        yield None
+        return
+    previous = PIPE_TRACING.tracer
+    tracer = enable_pipe_tracing()
+    try:
+        yield tracer
+    finally:
+        PIPE_TRACING.tracer = previous
+
+
+def traceable(name: str, func: Callable) -> Callable:
+    """开启追踪时以name记录func的调用。"""
+    def traceable_func(*args, **kwargs):
+        tracer = PIPE_TRACING.tracer
+        if tracer is None:
+            return func(*args, **kwargs)
+        return tracer.call(name, func, args, kwargs)
+    return traceable_func
+
+
 def pipe(*funcs, name: str = ''):
-    """函数管道。"""
+    """函数管道。命名管道可被追踪，见enable_pipe_tracing。"""
+    first_func, rest_funcs = funcs[:1], funcs[1:]
+
     def pipe_func(*args, **kwargs):
         idx = 0
         try:
-            result = funcs[idx](*args, **kwargs)
-            for idx, func in enumerate(funcs[1:], start=1):
+            result = first_func[0](*args, **kwargs)
+            for func in rest_funcs:
+                idx += 1
                 result = func(result)
             return result
         except Exception as ex:
             raise PipeError(name if name else funcs, idx) from ex
+    if name:
+        pipe_func = traceable(name, pipe_func)
+    pipe_func.pipe_funcs = funcs
+    pipe_func.pipe_name = name
     return pipe_func
 
 
+def is_pipe(func: Callable) -> bool:
+    """是否为函数管道。"""
+    return hasattr(func, 'pipe_funcs')
+
+
+def _compile_stage(func: Callable) -> Callable:
+    """编译管道中的单个函数。组合子和偏函数参数中的管道也会被编译。"""
+    if is_pipe(func):
+        return compile_pipe(func)
+    if hasattr(func, 'combinator'):
+        factory, args = func.combinator
+        return factory(*map(_compile_stage, args))
+    if isinstance(func, partial):
+        return partial(
+            _compile_stage(func.func),
+            *map(_compile_stage, func.args),
+            **{key: _compile_stage(value) for key, value in func.keywords.items()},
+        )
+    return func
+
+
+def _flatten_pipe(func: Callable, path: Tuple[Tuple[Any, int], ...]
+                  ) -> Iterator[Tuple[Callable, Tuple[Tuple[Any, int], ...]]]:
+    """展开嵌套管道，产出各函数及其在各层管道中的位置。"""
+    label = func.pipe_name if func.pipe_name else func.pipe_funcs
+    for idx, stage in enumerate(func.pipe_funcs):
+        stage_path = path + ((label, idx),)
+        if is_pipe(stage) and not stage.pipe_name:
+            yield from _flatten_pipe(stage, stage_path)
+        else:
+            yield _compile_stage(stage), stage_path
+
+
+def _raise_pipe_error(path: Tuple[Tuple[Any, int], ...], ex: Exception):
+    """按嵌套管道的层次重建PipeError异常链，与未编译时一致。"""
+    cause = ex
+    for label, idx in reversed(path):
+        error = PipeError(label, idx)
+        error.__cause__ = cause
+        error.__suppress_context__ = True
+        cause = error
+    raise cause
+
+
+def compile_pipe(func: Callable) -> Callable:
+    """编译函数管道。
+
+    将嵌套的管道展开为一段直线代码，调用时不再逐层进入管道，
+    出错时仍抛出与原管道相同的PipeError(name, idx)异常链。
+    内层的命名管道单独编译，保留为一次调用，以便追踪。
+    原管道保存在__wrapped__中。
+    """
+    if not is_pipe(func) or not func.pipe_funcs:
+        return func
+    stages = tuple(_flatten_pipe(func, tuple()))
+    namespace = {
+        f'func{idx}': stage for idx, (stage, _) in enumerate(stages)
+    }
+    namespace['paths'] = tuple(path for _, path in stages)
+    namespace['raise_pipe_error'] = _raise_pipe_error
+    namespace['pipe_tracing'] = PIPE_TRACING
+    namespace['name'] = func.pipe_name
+    body = [
+        '    idx = 0',
+        '    try:',
+        '        result = func0(*args, **kwargs)',
+    ]
+    for idx in range(1, len(stages)):
+        body.append(f'        idx = {idx}')
+        body.append(f'        result = func{idx}(result)')
+    body.extend((
+        '        return result',
+        '    except Exception as ex:',
+        '        raise_pipe_error(paths[idx], ex)',
+    ))
+    lines = ['def compiled_pipe_func(*args, **kwargs):']
+    if func.pipe_name:
+        # 命名管道在函数体内判断是否追踪，未开启追踪时不增加调用层次
+        lines = [
+            'def compiled_pipe_body(*args, **kwargs):',
+            *body,
+            *lines,
+            '    tracer = pipe_tracing.tracer',
+            '    if tracer is not None:',
+            '        return tracer.call(name, compiled_pipe_body, args, kwargs)',
+        ]
+    lines.extend(body)
+    exec('\n'.join(lines), namespace)
+    compiled_pipe_func = namespace['compiled_pipe_func']
+    compiled_pipe_func.__wrapped__ = func
+    return compiled_pipe_func
+
+
 def raise_(exp: Exception):
     raise exp
 
@@ -162,6 +427,7 @@ def side_effect(func):
     def side_effect_func(x):
         func(x)
         return x
+    side_effect_func.combinator = (side_effect, (func,))
     return side_effect_func
 
 
@@ -171,6 +437,7 @@ def starapply(func: Callable) -> Callable:
         if isinstance(x, dict):
             return func(**x)
         return func(*x)
+    starapply_func.combinator = (starapply, (func,))
     return starapply_func
 
 
@@ -205,6 +472,61 @@ def unique_justseen(iterable, key=None):
     return map(next, map(itemgetter(1), groupby(iterable, key)))
 
 
+class AhoCorasick(Generic[A]):
+    """Aho–Corasick多模式匹配自动机。
+
+    一次扫描文本即可找出所有作为子串出现的模式，等价于对每个模式做``in``判断。
+    """
+
+    def __init__(self, pairs: Iterable[Tuple[str, A]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[Set[A]] = [set()]
+        for pattern, value in pairs:
+            self._add_pattern(pattern, value)
+        self._build_fail()
+
+    def _add_pattern(self, pattern: str, value: A):
+        """添加模式。"""
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append(set())
+                self.goto[state][char] = next_state
+            state = next_state
+        self.outputs[state].add(value)
+
+    def _build_fail(self):
+        """广度优先构建失败指针，并合并后缀状态的输出。"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail_state = self.fail[state]
+                while fail_state and char not in self.goto[fail_state]:
+                    fail_state = self.fail[fail_state]
+                self.fail[next_state] = self.goto[fail_state].get(char, 0)
+                self.outputs[next_state] |= self.outputs[self.fail[next_state]]
+
+    def search(self, text: str) -> Set[A]:
+        """查找文本中出现的所有模式对应的值。"""
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        result = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if outputs[state]:
+                result |= outputs[state]
+        return result
+
+
 ##########  ##########
 
 
@@ -237,6 +559,26 @@ dict_groupby = pipe(
 )
 
 
+def hash_groupby(iterable: Iterable[A], key: Callable[[A], B]) -> Iterator[Tuple[B, List[A]]]:
+    """按键哈希分组，只遍历一次，不需要排序。
+
+    与groupby不同，相同键的元素不必相邻。各组按键首次出现的顺序排列，组内保持原顺序。
+    """
+    groups: Dict[B, List[A]] = defaultdict(list)
+    for item in iterable:
+        groups[key(item)].append(item)
+    return iter(groups.items())
+
+
+# 哈希分组并展开
+# (Iterable[A], Callable[[A], B]) -> Iterator[Tuple[B, Tuple[A, ...]]]
+expand_hash_groupby = pipe(hash_groupby, expand_groupby)
+
+# 哈希分组并字典化
+# (Iterable[Tuple[K, V]], Callable[[Tuple[K, V]], B]) -> Iterator[Tuple[B, Dict[K, V]]]
+dict_hash_groupby = pipe(hash_groupby, dict_groupby)
+
+
 class Chain(tuple):
     """顺序调用链。"""
 
@@ -252,6 +594,24 @@ class GraphRule(NamedTuple):
 Graph = Tuple[GraphRule, ...]
 
 
+class RuleGraph(tuple):
+    """规则图。附带目标到规则的索引，以及按(目标, 已提供输入)缓存的执行计划。"""
+
+    def __init__(self, rules=()):
+        super().__init__()
+        self.target_index: Dict[str, GraphRule] = {}
+        self.plans: Dict[Tuple[Tuple[str, ...], frozenset], Tuple[GraphRule, ...]] = {}
+
+
+def create_target_index(graph: Graph) -> Dict[str, GraphRule]:
+    """创建目标到规则的索引。重复目标取第一条规则。"""
+    target_index = {}
+    for rule in graph:
+        for output in target_to_targets(rule.outputs):
+            target_index.setdefault(output, rule)
+    return target_index
+
+
 def target_to_targets(target: Targets) -> Iterator[str]:
     """目标转换为目标序列。"""
     if isinstance(target, tuple):
@@ -279,17 +639,15 @@ def calc_execute_rules(goals: Tuple[str, ...],
     """计算执行规则序列。"""
     targets = deque(goals)
     visited = set()
+    target_index = getattr(graph, 'target_index', None)
+    if target_index is None:
+        target_index = create_target_index(graph)
 
     def dfs(target: str) -> Iterator[GraphRule]:
         if target in data:
             return
-        try:
-            matched_rule = next(
-                filter(
-                    pipe(itemgetter(0), partial(target_matched, target)), graph
-                )
-            )
-        except StopIteration:
+        matched_rule = target_index.get(target)
+        if matched_rule is None:
             raise MissingTarget(target)
 
         if matched_rule not in visited:
@@ -306,6 +664,20 @@ def calc_execute_rules(goals: Tuple[str, ...],
     return tuple(chain.from_iterable(map(dfs, targets)))
 
 
+def plan_execute_rules(goals: Tuple[str, ...],
+                       graph: Graph,
+                       data: dict) -> Tuple[GraphRule, ...]:
+    """获取执行规则序列。规则图会缓存执行计划，重复求值时跳过计算。"""
+    plans = getattr(graph, 'plans', None)
+    if plans is None:
+        return calc_execute_rules(goals, graph, data)
+    key = (tuple(goals), frozenset(data))
+    plan = plans.get(key)
+    if plan is None:
+        plan = plans[key] = calc_execute_rules(goals, graph, data)
+    return plan
+
+
 def eval_refs(refs: Union[str, Tuple[str, ...]],
               data: dict) -> Union[Any, Tuple[Any, ...]]:
     """引用求值。"""
@@ -369,22 +741,432 @@ def create_targets(results: Union[str, Tuple[str, ...]],
     return _Targets(results, depends_only)
 
 
+@lru_cache(maxsize=None)
+def module_source_digest(module_name: str) -> str:
+    """模块源文件的sha256，没有源文件时为空。
+
+    函数通过全局名称调用的辅助函数和模块常量不在其代码对象中，以所在模块的源文件代表。
+    """
+    filepath = getattr(sys.modules.get(module_name), '__file__', None)
+    if not filepath or not os.path.isfile(filepath):
+        return ''
+    return hash_file(filepath)
+
+
+def describe_code(code: CodeType) -> str:
+    """代码对象的哈希。
+
+    常量中嵌套的代码对象(lambda、推导式、内部函数)递归计算，不使用含内存地址的repr。
+    """
+    sha256 = hashlib.sha256(code.co_code)
+    sha256.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        sha256.update(describe_value(const).encode())
+    return sha256.hexdigest()
+
+
+def describe_value(value: Any, describe: Optional[Callable[[Any], str]] = None) -> str:
+    """描述常量或捕获的值，不同进程中结果一致。
+
+    容器的元素用describe描述，默认递归调用本函数。
+    默认repr含内存地址的对象以类型及序列化后的哈希描述。
+    """
+    if describe is None:
+        describe = describe_value
+    if isinstance(value, CodeType):
+        return f'code:{describe_code(value)}'
+    if isinstance(value, (tuple, list)):
+        return f'{type(value).__name__}({",".join(map(describe, value))})'
+    if isinstance(value, (set, frozenset)):
+        return f'{type(value).__name__}({",".join(sorted(map(describe, value)))})'
+    if isinstance(value, dict):
+        items = sorted(f'{describe(key)}={describe(item)}' for key, item in value.items())
+        return f'dict({",".join(items)})'
+    if type(value).__repr__ is not object.__repr__:
+        return repr(value)
+    cls = type(value)
+    try:
+        state = hashlib.sha256(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)).hexdigest()[:16]
+    except (pickle.PicklingError, TypeError, AttributeError):
+        state = describe_value(getattr(value, '__dict__', {}), describe)
+    return f'{cls.__module__}.{cls.__qualname__}:{state}'
+
+
+def describe_callable(func: Any, _visiting: Optional[Set[int]] = None) -> str:
+    """描述可调用对象的结构，用作规则缓存键的一部分。
+
+    函数取代码、常量、默认值、闭包及所在模块源文件的哈希，修改其引用的辅助函数后缓存失效。
+    绑定方法另取所绑定对象的类型和状态。描述不含内存地址，不同进程中结果一致。
+    """
+    if _visiting is None:
+        _visiting = set()
+    if id(func) in _visiting:
+        return '<recursive>'
+    _visiting.add(id(func))
+    describe = partial(describe_callable, _visiting=_visiting)
+    try:
+        if hasattr(func, '__wrapped__'):
+            return describe(func.__wrapped__)
+        if is_pipe(func):
+            return f'pipe({",".join(map(describe, func.pipe_funcs))})'
+        if hasattr(func, 'combinator'):
+            factory, args = func.combinator
+            return f'{factory.__name__}({",".join(map(describe, args))})'
+        if isinstance(func, partial):
+            args = chain(
+                map(describe, func.args),
+                (f'{key}={describe(value)}' for key, value in func.keywords.items()),
+            )
+            return f'partial({describe(func.func)},{",".join(args)})'
+        bound = getattr(func, '__self__', None)
+        if bound is None or isinstance(bound, ModuleType):
+            bound_description = ''
+        else:
+            bound_description = f'@{describe_value(bound, describe)}'
+        if hasattr(func, '__code__'):
+            code = func.__code__
+            captured = ','.join(
+                map(
+                    describe,
+                    chain(
+                        func.__defaults__ or (),
+                        (cell.cell_contents for cell in func.__closure__ or ()),
+                    ),
+                )
+            )
+            digest = hashlib.sha256(
+                (
+                    describe_code(code) + captured
+                    + module_source_digest(func.__module__)
+                ).encode()
+            ).hexdigest()
+            return f'{func.__module__}.{func.__qualname__}:{digest[:16]}{bound_description}'
+        if hasattr(func, '__qualname__'):
+            if bound_description:
+                return f'{func.__qualname__}{bound_description}'
+            return f'{getattr(func, "__module__", "")}.{func.__qualname__}'
+        return describe_value(func, describe)
+    finally:
+        _visiting.discard(id(func))
+
+
+def hash_file(filepath: str) -> str:
+    """文件内容的sha256。"""
+    sha256 = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for block in iter(partial(file.read, 1024 * 1024), b''):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+class RuleCache:
+    """规则输出的磁盘缓存。
+
+    键由规则标识(输出、输入、动作结构)及输入指纹组成：已存在的文件路径取内容哈希，
+    其它值取序列化后的哈希。无法序列化的输入或输出不缓存。
+    缓存总大小超过max_bytes时，按最近使用时间淘汰。总大小在内存中累计，超限时才扫描目录。
+    """
+
+    def __init__(self, directory: Union[str, Path],
+                 max_bytes: int = 256 * 1024 * 1024,
+                 version: str = ''):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._file_digests: Dict[Tuple[str, int, int], str] = {}
+        self._total_bytes = sum(entry.stat().st_size for entry in self.directory.glob('*.pickle'))
+
+    def file_digest(self, filepath: str) -> str:
+        """文件内容哈希。按(路径, 大小, 修改时间)缓存。"""
+        stat = os.stat(filepath)
+        key = (os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+        digest = self._file_digests.get(key)
+        if digest is None:
+            digest = self._file_digests[key] = hash_file(filepath)
+        return digest
+
+    def fingerprint(self, value: Any) -> str:
+        """值的指纹。"""
+        if isinstance(value, (str, Path)) and os.path.isfile(value):
+            return f'file:{self.file_digest(str(value))}'
+        if isinstance(value, tuple):
+            return f'({",".join(map(self.fingerprint, value))})'
+        return hashlib.sha256(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+    def make_key(self, rule: GraphRule, data: dict) -> Optional[str]:
+        """计算规则的缓存键。输入无法计算指纹时返回None。"""
+        try:
+            fingerprint = self.fingerprint(eval_refs(rule.inputs, data))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return None
+        identity = f'{self.version}|{rule.outputs!r}|{rule.inputs!r}|{describe_callable(rule.action)}'
+        return hashlib.sha256(f'{identity}|{fingerprint}'.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.pickle'
+
+    def load(self, key: Optional[str]) -> Tuple[bool, Any]:
+        """读取缓存，返回(是否命中, 输出)。"""
+        path = None if key is None else self._path(key)
+        if path is not None and path.is_file():
+            try:
+                with open(path, 'rb') as file:
+                    outputs = pickle.load(file)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                # 引用的类已改名或模块已移动时视为未命中
+                pass
+            else:
+                os.utime(path)
+                self.hits += 1
+                return True, outputs
+        self.misses += 1
+        return False, None
+
+    def store(self, key: Optional[str], outputs: Any):
+        """写入缓存并按大小淘汰。"""
+        if key is None:
+            return
+        try:
+            content = pickle.dumps(outputs, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        path = self._path(key)
+        try:
+            self._total_bytes -= path.stat().st_size
+        except OSError:
+            pass
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+        self._total_bytes += len(content)
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """淘汰最久未使用的缓存，直到总大小不超过max_bytes。重新统计总大小。"""
+        entries = []
+        for entry in self.directory.glob('*.pickle'):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        entries.sort()
+        total = sum(map(itemgetter(1), entries))
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+        self._total_bytes = total
+
+
+class FileFingerprint(NamedTuple):
+    """源文件指纹。"""
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class SidecarEntry(NamedTuple):
+    """解析结果缓存条目。"""
+    fingerprint: FileFingerprint
+    value: Any
+
+
+class SidecarCache:
+    """存放在源文件旁的解析结果缓存。
+
+    每个条目记录源文件的大小、修改时间和内容哈希：大小和修改时间不变时直接命中；
+    否则计算内容哈希，内容未变时更新指纹后命中，内容变化时重新解析。
+    缓存文件为压缩后的pickle，版本不一致或损坏时视为空缓存。
+    """
+
+    def __init__(self, filepath: str, version: int = 1):
+        self.filepath = filepath
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.changed = False
+        self.entries: Dict[str, SidecarEntry] = self._read()
+
+    def _read(self) -> Dict[str, SidecarEntry]:
+        try:
+            with open(self.filepath, 'rb') as file:
+                version, entries = pickle.loads(zlib.decompress(file.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError,
+                AttributeError, ImportError, TypeError, ValueError):
+            return {}
+        if version != self.version or not isinstance(entries, dict):
+            return {}
+        return entries
+
+    def lookup(self, key: str, source: str) -> Tuple[bool, Any]:
+        """查询缓存，返回(是否命中, 解析结果)。"""
+        stat = os.stat(source)
+        entry = self.entries.get(key)
+        if entry is not None:
+            fingerprint = entry.fingerprint
+            if (fingerprint.size, fingerprint.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+                self.hits += 1
+                return True, entry.value
+            if fingerprint.size == stat.st_size and fingerprint.sha256 == hash_file(source):
+                self.entries[key] = entry._replace(
+                    fingerprint=fingerprint._replace(mtime_ns=stat.st_mtime_ns)
+                )
+                self.changed = True
+                self.hits += 1
+                return True, entry.value
+        self.misses += 1
+        return False, None
+
+    def store(self, key: str, source: str, value: Any):
+        """记录解析结果。"""
+        stat = os.stat(source)
+        self.entries[key] = SidecarEntry(
+            FileFingerprint(stat.st_size, stat.st_mtime_ns, hash_file(source)), value
+        )
+        self.changed = True
+
+    def get(self, key: str, source: str, parse: Callable[[], A]) -> A:
+        """读取源文件的解析结果，缓存未命中时调用parse解析。"""
+        hit, value = self.lookup(key, source)
+        if not hit:
+            value = parse()
+            self.store(key, source, value)
+        return value
+
+    def save(self):
+        """有变化时写入缓存文件。"""
+        if not self.changed:
+            return
+        content = zlib.compress(
+            pickle.dumps((self.version, self.entries), pickle.HIGHEST_PROTOCOL)
+        )
+        tmp_filepath = f'{self.filepath}.tmp'
+        with open(tmp_filepath, 'wb') as file:
+            file.write(content)
+        os.replace(tmp_filepath, self.filepath)
+        self.changed = False
+
+
+def lookup_rule_cache(rule: GraphRule,
+                      data: dict,
+                      cache: Optional[RuleCache]) -> Tuple[Optional[str], bool, Any]:
+    """查询规则缓存，返回(缓存键, 是否命中, 输出)。"""
+    if cache is None:
+        return None, False, None
+    key = cache.make_key(rule, data)
+    hit, outputs = cache.load(key)
+    return key, hit, outputs
+
+
+def execute_rules_sequentially(execute_rules: Tuple[GraphRule, ...],
+                               data: dict,
+                               cache: Optional[RuleCache] = None):
+    """按顺序执行规则。命中缓存的规则不再求值。"""
+    for rule in execute_rules:
+        key, hit, outputs = lookup_rule_cache(rule, data, cache)
+        if not hit:
+            try:
+                outputs = eval_graph_rule(rule, data)
+            except Exception as ex:
+                raise EvalGraphRuleError(rule) from ex
+            if cache is not None:
+                cache.store(key, outputs)
+        assign_outputs(zip_refs_values(rule.outputs, outputs), data)
+
+
+def execute_rules_concurrently(execute_rules: Tuple[GraphRule, ...],
+                               data: dict,
+                               max_workers: int,
+                               executor_class: Callable[..., Executor] = ThreadPoolExecutor,
+                               cache: Optional[RuleCache] = None):
+    """并发执行规则。输入全部就绪的规则即提交到执行器，最多同时执行max_workers条。
+
+    使用进程池时，规则的动作、输入和输出须可序列化。
+    """
+    producers = set(
+        chain.from_iterable(
+            target_to_targets(rule.outputs) for rule in execute_rules
+        )
+    )
+    waiting = {
+        rule: set(target_to_targets(rule.inputs)) & producers
+        for rule in execute_rules
+    }
+    with executor_class(max_workers=max_workers) as executor:
+        running = {}
+
+        def complete_rule(rule: GraphRule, outputs: Any):
+            assign_outputs(zip_refs_values(rule.outputs, outputs), data)
+            outputs = set(target_to_targets(rule.outputs))
+            for need_targets in waiting.values():
+                need_targets -= outputs
+
+        def submit_ready_rules():
+            ready_rules = True
+            while ready_rules:
+                ready_rules = tuple(
+                    rule for rule, need_targets in waiting.items() if not need_targets
+                )
+                for rule in ready_rules:
+                    del waiting[rule]
+                    key, hit, outputs = lookup_rule_cache(rule, data, cache)
+                    if hit:
+                        complete_rule(rule, outputs)
+                        continue
+                    try:
+                        inputs = eval_refs(rule.inputs, data)
+                    except Exception as ex:
+                        raise EvalGraphRuleError(rule) from ex
+                    running[executor.submit(rule.action, inputs)] = rule, key
+
+        try:
+            submit_ready_rules()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rule, key = running.pop(future)
+                    try:
+                        outputs = future.result()
+                    except Exception as ex:
+                        raise EvalGraphRuleError(rule) from ex
+                    if cache is not None:
+                        cache.store(key, outputs)
+                    complete_rule(rule, outputs)
+                submit_ready_rules()
+        finally:
+            for future in running:
+                future.cancel()
+
+
 def eval_graph(graph: Graph,
                goal: Union[str, Tuple[str, ...]],
-               pairs) -> Callable:
-    """图求值。"""
+               pairs,
+               max_workers: int = 0,
+               executor_class: Callable[..., Executor] = ThreadPoolExecutor,
+               cache: Optional[RuleCache] = None) -> Callable:
+    """图求值。
+
+    max_workers大于0时，互不依赖的规则在executor_class创建的执行器中并发执行。
+    指定cache时，输入未变化的规则直接读取上次的输出。
+    """
     data = {pair[0]: pair[1] for pair in pairs}
     if isinstance(goal, _Targets):
         targets = goal
     else:
         targets = create_targets(goal)
-    execute_rules = calc_execute_rules(targets.depend_targets, graph, data)
-    for rule in execute_rules:
-        try:
-            outputs = eval_graph_rule(rule, data)
-        except Exception as ex:
-            raise EvalGraphRuleError(rule) from ex
-        assign_outputs(zip_refs_values(rule.outputs, outputs), data)
+    execute_rules = plan_execute_rules(targets.depend_targets, graph, data)
+    if max_workers:
+        execute_rules_concurrently(
+            execute_rules, data, max_workers, executor_class, cache
+        )
+    else:
+        execute_rules_sequentially(execute_rules, data, cache)
     return eval_refs(targets.result_targets, data)
 
 
@@ -394,3 +1176,145 @@ def save_file(filepath: Union[str, Path], content: str):
     """保存文件。"""
     with open(str(filepath), 'w', encoding='utf-8') as file:
         file.write(content)
+
+
+class StageRecord(NamedTuple):
+    """阶段统计记录。"""
+    stage: str
+    seconds: float
+    peak_bytes: int  # 阶段内的内存峰值，相对阶段开始时
+    net_bytes: int  # 阶段结束时的内存增量
+    count: Optional[int]  # 阶段产出的条目数
+
+
+def count_items(value: Any) -> Optional[int]:
+    """条目数。没有长度的值返回None。"""
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+class StageProfiler:
+    """分阶段统计耗时、内存峰值(tracemalloc)和条目数。
+
+    作为上下文管理器使用时开启tracemalloc。未启用时run直接调用函数，不做统计。
+    阶段不可嵌套，否则外层阶段的内存峰值不准确。
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.records: List[StageRecord] = []
+        self._tracing = False
+
+    def __enter__(self) -> 'StageProfiler':
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def run(self,
+            stage: str,
+            func: Callable[..., A],
+            *args,
+            count: Callable[[A], Optional[int]] = count_items,
+            **kwargs) -> A:
+        """执行一个阶段并记录统计。"""
+        if not self.enabled:
+            return func(*args, **kwargs)
+        tracemalloc.reset_peak()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        start = perf_counter()
+        result = func(*args, **kwargs)
+        seconds = perf_counter() - start
+        end_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        self.records.append(
+            StageRecord(
+                stage, seconds, max(peak_bytes - start_bytes, 0),
+                end_bytes - start_bytes, count(result),
+            )
+        )
+        return result
+
+
+# 未启用的统计器，run直接调用函数
+NULL_PROFILER = StageProfiler(enabled=False)
+
+
+def display_width(text: str) -> int:
+    """终端显示宽度，全角字符占两格。"""
+    return sum(2 if east_asian_width(char) in 'WF' else 1 for char in text)
+
+
+def justify(text: str, width: int, left: bool = False) -> str:
+    """按显示宽度对齐。"""
+    padding = ' ' * max(width - display_width(text), 0)
+    return text + padding if left else padding + text
+
+
+def format_stage_records(records: Iterable[StageRecord]) -> str:
+    """格式化阶段统计为表格。"""
+    records = tuple(records)
+    mebibyte = 1024 * 1024
+    rows = [('阶段', '耗时(秒)', '峰值(MiB)', '增量(MiB)', '条目数')]
+    for record in records:
+        rows.append((
+            record.stage,
+            f'{record.seconds:.3f}',
+            f'{record.peak_bytes / mebibyte:.2f}',
+            f'{record.net_bytes / mebibyte:.2f}',
+            '-' if record.count is None else str(record.count),
+        ))
+    rows.append(('合计', f'{sum(map(attrgetter("seconds"), records)):.3f}', '', '', ''))
+    widths = [max(display_width(row[idx]) for row in rows) + 2 for idx in range(5)]
+    return '\n'.join(
+        ''.join(
+            justify(text, width, left=idx == 0)
+            for idx, (text, width) in enumerate(zip(row, widths))
+        ).rstrip()
+        for row in rows
+    )
+
+
+def format_pipe_trace(tracer: PipeTracer) -> str:
+    """格式化管道追踪统计为表格。"""
+    rows = [('管道', '调用次数', '累计(秒)', '自身(秒)', '输入大小分布')]
+    for item in tracer.report():
+        rows.append((
+            item['name'],
+            str(item['calls']),
+            f'{item["total_seconds"]:.3f}',
+            f'{item["self_seconds"]:.3f}',
+            ' '.join(f'{bucket}:{count}' for bucket, count in item['input_sizes'].items()),
+        ))
+    widths = [max(display_width(row[idx]) for row in rows) + 2 for idx in range(4)]
+    return '\n'.join(
+        (
+            ''.join(
+                justify(text, width, left=idx == 0)
+                for idx, (text, width) in enumerate(zip(row[:4], widths))
+            ) + '  ' + row[4]
+        ).rstrip()
+        for row in rows
+    )
+
+
+def dump_pipe_trace(tracer: PipeTracer, filepath: str):
+    """导出管道追踪统计为JSON文件。"""
+    with open(filepath, 'w', encoding='utf-8') as file:
+        json.dump(tracer.report(), file, ensure_ascii=False, indent=2)
+
+
+def dump_stage_records(records: Iterable[StageRecord], filepath: str, **fields):
+    """追加一行JSON到统计文件，便于跟踪趋势。fields为附加字段，如节气目录。"""
+    line = json.dumps(
+        {**fields, 'stages': [record._asdict() for record in records]},
+        ensure_ascii=False,
+    )
+    with open(filepath, 'a', encoding='utf-8') as file:
+        file.write(line + '\n')
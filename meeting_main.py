@@ -11,7 +11,31 @@ def main():
 
     subparsers = parser.add_subparsers(dest='subparser_name')
     parser_stat_time = subparsers.add_parser('stat_time', help='统计参会时长')
-    parser_stat_time.add_argument('meeting')
+    parser_stat_time.add_argument('meeting', nargs='+', help='节气目录，支持多个目录或通配符')
+    parser_stat_time.add_argument('--workers', type=int, default=None, help='批量统计的进程数')
+    parser_stat_time.add_argument('--no-cache', action='store_true', help='不使用解析结果缓存')
+    parser_stat_time.add_argument(
+        '--profile', action='store_true',
+        help='统计各阶段的耗时、内存峰值和条目数，并追加到节气目录的性能统计.jsonl',
+    )
+    parser_stat_time.add_argument(
+        '--trace-pipes', action='store_true',
+        help='追踪命名管道的调用次数、耗时和输入大小，并保存到节气目录的管道统计.json',
+    )
+    parser_stat_time.add_argument(
+        '--archive', action='store_true',
+        help='归档参会明细和人员匹配到上级目录的考勤结果.db，用于跨节气查询',
+    )
+    parser_stat_time.add_argument(
+        '--no-store', action='store_true',
+        help='不保存统计结果到上级目录的考勤结果.db，--archive随之不生效',
+    )
+
+    parser_watch = subparsers.add_parser('watch', help='监视考勤数据，增量统计参会时长')
+    parser_watch.add_argument('meeting', help='节气目录')
+    parser_watch.add_argument(
+        '--interval', type=float, default=5.0, help='检查考勤数据是否更新的间隔秒数'
+    )
 
     parser_stat_absent = subparsers.add_parser('stat_absent', help='统计缺勤人数')
     parser_stat_absent.add_argument('meeting')
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""各节气统计结果的存储。
+
+stat_time每统计一个节气目录，将每人的参会时长和是否参会写入上级目录的SQLite数据库，
+stat_absent直接查询数据库统计累计缺勤次数，不再读取历史表格。
+加上--archive参数时还保存每条参会明细和人员匹配的会议名称，用于跨节气的查询。
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from meeting_comm import MEETING_STORE_FILENAME, StatError
+
+
+# 归档时每批插入的行数
+ARCHIVE_BATCH_SIZE = 10000
+
+# 数据库结构的迁移脚本，第n个脚本将版本n的数据库升级到版本n+1。
+# 结构变化时追加脚本，只能添加表、索引或列，不能删除已有的统计结果。
+MEETING_STORE_MIGRATIONS = (
+    '''
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting TEXT PRIMARY KEY,
+    solar_term TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    meeting_time INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS meetings_start_time ON meetings (start_time);
+CREATE TABLE IF NOT EXISTS person_results (
+    meeting TEXT NOT NULL REFERENCES meetings (meeting) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    team TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    zone TEXT,
+    attendance_seconds INTEGER NOT NULL,
+    is_attendanced INTEGER NOT NULL,
+    PRIMARY KEY (meeting, team, number, name)
+);
+CREATE INDEX IF NOT EXISTS person_results_person ON person_results (team, number, name);
+CREATE INDEX IF NOT EXISTS person_results_zone ON person_results (zone, team);
+''',
+    '''
+CREATE TABLE IF NOT EXISTS attendance_rows (
+    meeting TEXT NOT NULL REFERENCES meetings (meeting) ON DELETE CASCADE,
+    row_id INTEGER NOT NULL,
+    nickname TEXT NOT NULL,
+    meeting_name TEXT NOT NULL,
+    origin_name TEXT NOT NULL,
+    enter_time TEXT NOT NULL,
+    exit_time TEXT NOT NULL,
+    clipped_enter_time TEXT,
+    clipped_exit_time TEXT,
+    PRIMARY KEY (meeting, row_id)
+);
+CREATE INDEX IF NOT EXISTS attendance_rows_nickname ON attendance_rows (nickname);
+CREATE INDEX IF NOT EXISTS attendance_rows_meeting_name
+    ON attendance_rows (meeting, meeting_name);
+CREATE TABLE IF NOT EXISTS person_matches (
+    meeting TEXT NOT NULL REFERENCES meetings (meeting) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    team TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    meeting_name TEXT NOT NULL,
+    PRIMARY KEY (meeting, team, number, name, meeting_name)
+);
+CREATE INDEX IF NOT EXISTS person_matches_person ON person_matches (team, number, name);
+CREATE INDEX IF NOT EXISTS person_matches_meeting_name
+    ON person_matches (meeting, meeting_name);
+''',
+)
+
+# 数据库结构的当前版本
+MEETING_STORE_VERSION = len(MEETING_STORE_MIGRATIONS)
+
+
+class MeetingStoreVersionError(StatError):
+    """数据库由更新版本的程序创建。"""
+
+
+class MeetingRecord(NamedTuple):
+    """节气统计记录。"""
+    meeting: str  # 节气目录名
+    solar_term: str  # 节气名
+    start_time: datetime  # 会议开始时间
+    meeting_time: int  # 会议时长（分钟）
+
+
+class PersonResult(NamedTuple):
+    """个人在一个节气的统计结果。"""
+    name: str
+    team: str
+    number: int
+    zone: Optional[str]
+    attendance_seconds: int  # 参会时长（秒）
+    is_attendanced: bool
+
+
+class AttendanceRow(NamedTuple):
+    """归档的参会明细。裁剪后的时间为会议时间内的部分，与会议时间不相交时为None。"""
+    row_id: int  # 在节气内的序号
+    nickname: str  # 标准化后的会议昵称
+    meeting_name: str
+    origin_name: str
+    enter_time: datetime
+    exit_time: datetime
+    clipped_enter_time: Optional[datetime]
+    clipped_exit_time: Optional[datetime]
+
+
+class PersonMatch(NamedTuple):
+    """人员匹配的会议名称。同一会议名称的参会明细整组匹配。"""
+    name: str
+    team: str
+    number: int
+    meeting_name: str
+
+
+class AbsentCount(NamedTuple):
+    """累计缺勤次数。人员按(小组, 编号, 姓名)、小组按(区域, 小组)、区域按(区域,)分组。"""
+    key: Tuple
+    meetings: int  # 有统计结果的节气数（人员）或人次（小组、区域）
+    absent: int  # 缺勤次数（人员）或人次（小组、区域）
+
+
+def get_meeting_store_filepath(meeting: str) -> str:
+    """统计结果数据库位于节气目录的上级目录。"""
+    return os.path.join(os.path.dirname(os.path.abspath(meeting)), MEETING_STORE_FILENAME)
+
+
+def to_isoformat(value: Optional[datetime]) -> Optional[str]:
+    """时间转为ISO格式文本，按文本比较即按时间比较。"""
+    return None if value is None else value.isoformat()
+
+
+def iter_batches(iterable: Iterable, size: int) -> Iterator[list]:
+    """按size切分为批次。"""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def get_meeting_key(meeting: str) -> str:
+    """节气目录在数据库中的键，为目录名。"""
+    return os.path.basename(os.path.abspath(meeting))
+
+
+class MeetingStore:
+    """各节气统计结果的SQLite数据库。作为上下文管理器使用时退出后关闭连接。"""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.connection = sqlite3.connect(filepath, timeout=30)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self._create_schema()
+
+    def _create_schema(self):
+        """按数据库版本依次执行迁移脚本，保留已有的统计结果。
+
+        版本高于当前程序时报错，避免旧程序改写新结构的数据库。
+        """
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version > MEETING_STORE_VERSION:
+            self.connection.close()
+            raise MeetingStoreVersionError(
+                f"'{self.filepath}'的版本为{version}，高于程序支持的版本{MEETING_STORE_VERSION}，"
+                '请升级程序'
+            )
+        for idx, script in enumerate(MEETING_STORE_MIGRATIONS[version:], version + 1):
+            with self.connection:
+                self.connection.executescript(f'BEGIN;\n{script}\nPRAGMA user_version = {idx};')
+
+    def __enter__(self) -> 'MeetingStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def save_meeting(self, record: MeetingRecord, results: Iterable[PersonResult]):
+        """在一个事务中替换节气的统计结果。已归档的参会明细和人员匹配保留。"""
+        with self.connection:
+            self.connection.execute(
+                'INSERT INTO meetings VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (meeting) DO UPDATE SET solar_term = excluded.solar_term, '
+                'start_time = excluded.start_time, meeting_time = excluded.meeting_time',
+                (record.meeting, record.solar_term, to_isoformat(record.start_time),
+                 record.meeting_time),
+            )
+            self.connection.execute(
+                'DELETE FROM person_results WHERE meeting = ?', (record.meeting,)
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO person_results VALUES (?, ?, ?, ?, ?, ?, ?)',
+                ((record.meeting, *result) for result in results),
+            )
+
+    def archive_meeting(self,
+                        meeting: str,
+                        rows: Iterable[AttendanceRow],
+                        matches: Iterable[PersonMatch],
+                        batch_size: int = ARCHIVE_BATCH_SIZE):
+        """在一个事务中替换节气的参会明细和人员匹配，分批插入。节气须已保存。"""
+        with self.connection:
+            self.connection.execute('DELETE FROM attendance_rows WHERE meeting = ?', (meeting,))
+            self.connection.execute('DELETE FROM person_matches WHERE meeting = ?', (meeting,))
+            for batch in iter_batches(rows, batch_size):
+                self.connection.executemany(
+                    'INSERT INTO attendance_rows VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        (meeting, *row[:4], *map(to_isoformat, row[4:]))
+                        for row in batch
+                    ),
+                )
+            for batch in iter_batches(matches, batch_size):
+                self.connection.executemany(
+                    'INSERT OR IGNORE INTO person_matches VALUES (?, ?, ?, ?, ?)',
+                    ((meeting, *match) for match in batch),
+                )
+
+    def list_unrenamed_people(self, until: Optional[datetime] = None) -> List[Tuple[str, int, str]]:
+        """列出归档的节气中，匹配的会议昵称从未以“小组名+编号”开头的人员(小组, 编号, 姓名)。"""
+        rows = self.connection.execute(
+            'SELECT person_matches.team, person_matches.number, person_matches.name '
+            'FROM person_matches '
+            'JOIN meetings USING (meeting) '
+            'JOIN attendance_rows USING (meeting, meeting_name) '
+            'WHERE start_time <= ? '
+            'GROUP BY person_matches.team, person_matches.number, person_matches.name '
+            'HAVING MAX(substr(nickname, 1, length(person_matches.team || person_matches.number))'
+            ' = person_matches.team || person_matches.number) = 0 '
+            'ORDER BY person_matches.team, person_matches.number, person_matches.name',
+            (to_isoformat(until or datetime.max),),
+        )
+        return [tuple(row) for row in rows]
+
+    def list_meetings(self, until: Optional[datetime] = None) -> List[MeetingRecord]:
+        """按会议开始时间列出节气，until为开始时间的上限（含）。"""
+        rows = self.connection.execute(
+            'SELECT meeting, solar_term, start_time, meeting_time FROM meetings '
+            'WHERE start_time <= ? ORDER BY start_time',
+            (to_isoformat(until or datetime.max),),
+        )
+        return [
+            MeetingRecord(meeting, solar_term, datetime.fromisoformat(start_time), meeting_time)
+            for meeting, solar_term, start_time, meeting_time in rows
+        ]
+
+    def _count_absences(self, columns: str, until: Optional[datetime]) -> List[AbsentCount]:
+        rows = self.connection.execute(
+            f'SELECT {columns}, COUNT(*), SUM(NOT is_attendanced) '
+            'FROM person_results JOIN meetings USING (meeting) '
+            f'WHERE start_time <= ? GROUP BY {columns} ORDER BY {columns}',
+            (to_isoformat(until or datetime.max),),
+        )
+        return [AbsentCount(tuple(row[:-2]), row[-2], row[-1]) for row in rows]
+
+    def count_person_absences(self, until: Optional[datetime] = None) -> List[AbsentCount]:
+        """统计每人截至until的累计缺勤次数。"""
+        return self._count_absences('team, number, name', until)
+
+    def count_team_absences(self, until: Optional[datetime] = None) -> List[AbsentCount]:
+        """统计每个小组截至until的累计缺勤人次。"""
+        return self._count_absences('zone, team', until)
+
+    def count_zone_absences(self, until: Optional[datetime] = None) -> List[AbsentCount]:
+        """统计每个区域截至until的累计缺勤人次。"""
+        return self._count_absences('zone', until)
@@ -5,34 +5,53 @@
 
 import os
 import re
+import sqlite3
 from argparse import Namespace
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from glob import glob
 from datetime import datetime, time, timedelta
-from functools import partial
+from functools import lru_cache, partial
 from itertools import (
-    chain, filterfalse, groupby, repeat
+    chain, filterfalse, repeat
 )
 from operator import (
     attrgetter, eq, itemgetter, lt, methodcaller
 )
-from typing import Dict, Iterator, List, NamedTuple, Tuple
+from time import perf_counter, sleep
+from typing import Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
 
+import numpy as np
 from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Alignment, Border, Font, Side
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, Side
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.cell_style import StyleArray
 from pypinyin import pinyin, Style
 
 from meeting_attendance_workbook import (
-    AttendanceInfo, AttendanceInfos, DETAIL_OF_MEMBER_ATTENDANCE,
-    does_attendance_detail_info_intersect,
-    normalize_attendance_detail_info_time, merge_attendance_infos,
-    parse_attendance_detail_sheet, partition_attendance_infos,
-    summarize_attendance_time,
+    AttendanceInfo, AttendanceInfos, AttendanceRows, AttendanceTable,
+    clip_attendance_infos, clip_attendance_times, concat_attendance_tables,
+    create_attendance_table, microseconds_to_datetime,
+    merge_attendance_infos,
+    iter_attendance_detail_info, parse_attendance_info, partition_attendance_table,
+    read_detail_rows, select_attendance_rows, transform_row_data,
+    summarize_attendance_time, summarize_grouped_attendance_times,
 )
 from meeting_comm import (
     MEETING_SUMMARY_FILENAME, MEETING_SUMMARY_OUTPUT_FILENAME,
-    MEETING_ATTENDANCE_FILENAME,
-    constant, cross, dispatch, ensure, identity, if_, invoke, pipe,
+    MEETING_ATTENDANCE_FILENAME, MEETING_ATTENDANCE_CSV_FILENAME, MEETING_CACHE_FILENAME,
+    MEETING_PROFILE_FILENAME, MEETING_PIPE_TRACE_FILENAME, NULL_PROFILER,
+    AhoCorasick, PipeTracer, SidecarCache, StageProfiler,
+    compile_pipe, constant, cross, dispatch, ensure, identity, if_, invoke, pipe,
     side_effect, starapply, to_stream, tuple_args,
-    dict_groupby, expand_groupby,
+    dump_pipe_trace, dump_stage_records, format_pipe_trace, format_stage_records,
+    trace_pipes,
+    dict_hash_groupby, expand_hash_groupby,
+)
+from meeting_store import (
+    AbsentCount, AttendanceRow, MeetingRecord, MeetingStore, MeetingStoreVersionError,
+    PersonMatch, PersonResult, get_meeting_key, get_meeting_store_filepath,
 )
 
 
@@ -46,6 +65,8 @@ TOTAL_ABSENT_SHEET_FIRST_LINE = 3
 
 TEAM_NAME_REGEX = re.compile(r'(..)组')
 
+NUMBER_REGEX = re.compile(r'(\d+)')
+
 BLACK_FONT = Font(color='00000000')
 RED_FONT = Font(color='00FF0000')
 CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
@@ -56,46 +77,77 @@ BORDER = Border(
 )
 
 
-class PersoneelInfo(NamedTuple):
-    """人员信息。"""
+@lru_cache(maxsize=None)
+def get_team_pinyin_initials(team: str) -> str:
+    """获取小组名的拼音首字母（大写）。"""
+    return ''.join(chain.from_iterable(pinyin(team, style=Style.FIRST_LETTER))).upper()
+
+
+class _PersoneelInfoFields(NamedTuple):
+    """人员信息字段。"""
     name: str  # 姓名
     team: str  # 小组
     number: int  # 小组编号
-    
-    @property
-    def team_number(self) -> str:
-        """小组名+编号。"""
-        return f'{self.team}{self.number}'
-
-    @property
-    def formal_name(self) -> str:
-        """正式名称。"""
-        return f'{self.team}{self.number}{self.name}'
-
-    @property
-    def formal_nick_name(self) -> str:
-        """正式昵称。"""
-        if len(self.name) >= 3:
-            nick_name = self.name[1:]
+    team_number: str  # 小组名+编号
+    formal_name: str  # 正式名称
+    formal_nick_name: str  # 正式昵称
+    formal_pinyin_name: str  # 正式拼音名称
+
+
+class PersoneelInfo(_PersoneelInfoFields):
+    """人员信息。
+
+    只接受姓名、小组和编号，派生名称在构造时计算一次，匹配时直接读取字段。
+    """
+    __slots__ = ()
+
+    def __new__(cls, name: str, team: str, number: int) -> 'PersoneelInfo':
+        team_number = f'{team}{number}'
+        if len(name) >= 3:
+            nick_name = name[1:]
         else:
-            nick_name = self.name
-        return f'{self.team}{self.number}{nick_name}'
+            nick_name = name
+        return super().__new__(
+            cls, name, team, number,
+            team_number,
+            f'{team_number}{name}',
+            f'{team_number}{nick_name}',
+            f'{get_team_pinyin_initials(team)}{number}{name}',
+        )
+
+    def __getnewargs__(self) -> Tuple[str, str, int]:
+        return self.name, self.team, self.number
+
+    @classmethod
+    def _make(cls, iterable) -> 'PersoneelInfo':
+        return cls(*iterable)
 
-    @property
-    def formal_pinyin_name(self) -> str:
-        """正式拼音名称。"""
-        pinyin_team = ''.join(chain.from_iterable(pinyin(self.team, style=Style.FIRST_LETTER)))
-        pinyin_team = pinyin_team.upper()
-        return f'{pinyin_team}{self.number}{self.name}'
+    def _replace(self, **kwargs) -> 'PersoneelInfo':
+        return type(self)(
+            **{'name': self.name, 'team': self.team, 'number': self.number, **kwargs}
+        )
+
+
+def create_personeel_info(name: str, team: str, number: int) -> PersoneelInfo:
+    """创建人员信息。"""
+    return PersoneelInfo(name, team, number)
 
 
 PersoneelInfos = Tuple[PersoneelInfo, ...]
 
 
+class PersoneelNameIndex(NamedTuple):
+    """人员名称索引。值为人员在人员总表中的序号。"""
+    formal_names: AhoCorasick  # 正式名称、正式昵称、正式拼音名称
+    exact_formal_names: Dict[str, Tuple[int, ...]]  # 正式名称等在formal_names中的查找结果
+    team_numbers: Dict[str, Tuple[int, ...]]  # 小组名+编号
+    names: Dict[str, Tuple[int, ...]]  # 姓名
+
+
 class PersoneelAttendanceInfo(NamedTuple):
     """个人参会信息。"""
     personeel_info: PersoneelInfo
-    personeel_attendance_infos: AttendanceInfos
+    personeel_attendance_infos: AttendanceRows  # 按行号引用的匹配参会信息
     personeel_attendance_time: timedelta
     is_attendanced: bool
 
@@ -116,6 +168,14 @@ class MeetingInfo(NamedTuple):
     meeting_enough_time: int
 
 
+class StatTimeResult(NamedTuple):
+    """单个节气目录的统计结果。"""
+    meeting: str  # 节气目录
+    succeeded: bool
+    seconds: float  # 耗时
+    message: str  # 输出文件或错误信息
+
+
 class FillCommand(NamedTuple):
     """填充指令。"""
     line_no: int
@@ -135,7 +195,7 @@ MEETING_INFO_KEYS = {
 
 def parse_personnel_info(row: Tuple[str, ...]) -> PersoneelInfo:
     """解析人员信息。"""
-    return PersoneelInfo(row[0], row[2], int(row[3]))
+    return create_personeel_info(row[0], row[2], int(row[3]))
 
 
 # 转换人员总表为内部数据结构
@@ -151,7 +211,8 @@ parse_people_sheet = pipe(
     convert_people_sheet,
     partial(filter, pipe(itemgetter(0), bool)),
     partial(map, parse_personnel_info),
-    tuple
+    tuple,
+    name='parse_people_sheet',
 )
 
 # 转换会议信息为内部数据结构
@@ -180,6 +241,7 @@ parse_meeting_info = pipe(
         identity,
     ),
     tuple,
+    name='parse_meeting_info',
 )
 
 
@@ -251,6 +313,7 @@ generate_mismatched_commands = pipe(
     partial(map, starapply(generate_mismatched_command)),
     chain.from_iterable,
     tuple,
+    name='generate_mismatched_commands',
 )
 
 # 填充单元格
@@ -325,7 +388,7 @@ fill_workcell = pipe(
 
 # 填充工作表
 # Tuple[Worksheet, FillCommand] -> None
-fill_worksheet_command = pipe(
+fill_worksheet_command = compile_pipe(pipe(
     tuple_args,
     dispatch(
         pipe(
@@ -340,46 +403,140 @@ fill_worksheet_command = pipe(
     ),
     tuple,
     fill_workcell,
-)
+    name='fill_worksheet_command',
+))
+
+# 填充指令使用的命名样式，键为(是否红字, 是否缺勤)
+FILL_STYLE_NAMES = {
+    (False, False): '考勤黑字',
+    (True, False): '考勤红字',
+    (False, True): '考勤黑字居中',
+    (True, True): '考勤红字居中',
+}
 
-# 填充工作表
-# Tuple[Worksheet, Tuple[FillCommand, ...]] -> Tuple[FillCommand, ...]
-do_fill_worksheet_commands = pipe(
-    tuple_args,
-    side_effect(
-        pipe(
-            cross(repeat, identity),
-            starapply(zip),
-            partial(map, fill_worksheet_command),
-            tuple,
-        ),
-    ),
-    itemgetter(1),
-)
+
+def create_fill_named_style(name: str, is_red: bool, is_absent: bool) -> NamedStyle:
+    """创建填充指令的命名样式，与fill_workcell设置的样式一致。"""
+    style = NamedStyle(
+        name, font=RED_FONT if is_red else BLACK_FONT, border=DEFAULT_BORDER
+    )
+    if is_absent:
+        style.alignment = CENTER_ALIGN
+        style.border = BORDER
+    return style
+
+
+def register_fill_named_styles(workbook: Workbook) -> Dict[Tuple[bool, bool], str]:
+    """在工作簿中注册填充指令的命名样式，已注册的不重复注册。"""
+    registered = set(workbook.named_styles)
+    for (is_red, is_absent), name in FILL_STYLE_NAMES.items():
+        if name not in registered:
+            workbook.add_named_style(create_fill_named_style(name, is_red, is_absent))
+    return FILL_STYLE_NAMES
+
+
+def group_fill_commands(commands: Iterable[FillCommand]) -> Dict[int, Dict[int, FillCommand]]:
+    """按行、列合并填充指令。
+
+    同一单元格的多条指令合并为一条：值和字色取最后一条，居中和边框只设置不清除，
+    与依次执行各条指令的结果一致。
+    """
+    rows: Dict[int, Dict[int, FillCommand]] = {}
+    for command in commands:
+        row = rows.setdefault(command.line_no, {})
+        previous = row.get(command.column_no)
+        if previous is not None and previous.is_absent and not command.is_absent:
+            command = command._replace(is_absent=True)
+        row[command.column_no] = command
+    return rows
+
+
+def fill_styled_workcell(workcell, command: FillCommand):
+    """设置已有样式的单元格，跳过不改变样式的赋值，保留模板中的其它样式。"""
+    font = RED_FONT if command.is_red else BLACK_FONT
+    if workcell.font != font:
+        workcell.font = font
+    if command.is_absent:
+        if workcell.alignment != CENTER_ALIGN:
+            workcell.alignment = CENTER_ALIGN
+        if workcell.border != BORDER:
+            workcell.border = BORDER
+
+
+def do_fill_worksheet_commands(worksheet, commands: Iterable[FillCommand]
+                               ) -> Tuple[FillCommand, ...]:
+    """批量填充工作表。
+
+    指令按行合并后逐行写入；没有样式的单元格一次赋予预先注册的命名样式，
+    结果与逐条执行fill_worksheet_command一致。
+    """
+    commands = tuple(commands)
+    style_names = register_fill_named_styles(worksheet.parent)
+    for line_no, row in group_fill_commands(commands).items():
+        for column_no, command in row.items():
+            workcell = worksheet.cell(line_no, column_no)
+            workcell.value = command.text
+            if workcell.has_style:
+                fill_styled_workcell(workcell, command)
+            else:
+                workcell.style = style_names[bool(command.is_red), bool(command.is_absent)]
+    return commands
 
 
 def normalize_attendance_detail_infos(meeting_info: MeetingInfo):
     """标准化参会明细信息。"""
-    return pipe(
-        partial(
-            filter,
-            partial(
-                does_attendance_detail_info_intersect,
-                meeting_info.meeting_start_time,
-                meeting_info.meeting_end_time,
-            ),
-        ),
-        partial(
-            map,
-            partial(
-                normalize_attendance_detail_info_time,
-                meeting_info.meeting_start_time,
-                meeting_info.meeting_end_time
+    return partial(
+        clip_attendance_infos,
+        meeting_info.meeting_start_time,
+        meeting_info.meeting_end_time,
+    )
+
+
+def create_personeel_name_index(personeel_infos: PersoneelInfos) -> PersoneelNameIndex:
+    """创建人员名称索引。"""
+    formal_names = AhoCorasick(
+        chain.from_iterable(
+            (
+                (personeel_info.formal_name, idx),
+                (personeel_info.formal_nick_name, idx),
+                (personeel_info.formal_pinyin_name, idx),
             )
-        ),
-        tuple,
+            for idx, personeel_info in enumerate(personeel_infos)
+        )
+    )
+    exact_formal_names: Dict[str, Tuple[int, ...]] = {}
+    team_numbers: Dict[str, List[int]] = {}
+    names: Dict[str, List[int]] = {}
+    for idx, personeel_info in enumerate(personeel_infos):
+        for formal_name in (
+            personeel_info.formal_name,
+            personeel_info.formal_nick_name,
+            personeel_info.formal_pinyin_name,
+        ):
+            if formal_name not in exact_formal_names:
+                # 正式名称中可能包含他人的正式名称，如“中乾1张三丰”包含“中乾1张三”
+                exact_formal_names[formal_name] = tuple(sorted(formal_names.search(formal_name)))
+        team_numbers.setdefault(personeel_info.team_number, []).append(idx)
+        names.setdefault(personeel_info.name, []).append(idx)
+    return PersoneelNameIndex(
+        formal_names,
+        exact_formal_names,
+        {key: tuple(value) for key, value in team_numbers.items()},
+        {key: tuple(value) for key, value in names.items()},
     )
 
+
+def search_formal_names(name_index: PersoneelNameIndex, text: str) -> Set[int]:
+    """查找名称中出现的正式名称，返回人员序号。
+
+    名称与正式名称完全相同时直接取建索引时的查找结果，其余名称再做子串匹配。
+    """
+    exact = name_index.exact_formal_names.get(text)
+    if exact is not None:
+        return set(exact)
+    return name_index.formal_names.search(text)
+
+
 class StatAttendanceInfos:
 
     def __init__(self, name_match: bool = False):
@@ -415,9 +572,67 @@ class StatAttendanceInfos:
         return False
 
 
+    def match_indexed_attendance_info(self,
+                                      name_index: PersoneelNameIndex,
+                                      attendance_info: AttendanceInfo) -> Set[int]:
+        """通过人员名称索引匹配参会信息，返回匹配的人员序号。
+
+        结果与逐人调用match_personeel_info_and_attendance_info一致。
+        """
+        return self.match_indexed_names(
+            name_index, attendance_info.nickname, attendance_info.meeting_name
+        )
+
+
+    def match_indexed_names(self,
+                            name_index: PersoneelNameIndex,
+                            nickname: str,
+                            meeting_name: str) -> Set[int]:
+        """通过人员名称索引匹配会议昵称和会议名称，返回匹配的人员序号。"""
+        matched = search_formal_names(name_index, nickname)
+        if meeting_name != nickname:
+            matched |= search_formal_names(name_index, meeting_name)
+        matched.update(name_index.team_numbers.get(nickname, ()))
+
+        if self.name_match:
+            matched.update(name_index.names.get(nickname, ()))
+            for idx in range(1, min(len(nickname)-1, 3)):
+                matched.update(name_index.names.get(nickname[idx:], ()))
+
+        return matched
+
+
+    def match_indexed_attendance_table(self,
+                                       name_index: PersoneelNameIndex,
+                                       attendance_table: AttendanceTable) -> Set[int]:
+        """匹配一组参会信息，返回匹配的人员序号。只匹配去重后的名称。"""
+        matched = set()
+        for nickname, meeting_name in attendance_table.name_pairs():
+            matched |= self.match_indexed_names(name_index, nickname, meeting_name)
+        return matched
+
+
+    def stat_people_matched_attendance_infos(self,
+                                             personeel_infos: PersoneelInfos,
+                                             attendance_table: AttendanceTable,
+                                             attendance_infos: dict[str, AttendanceTable],
+                                             ) -> List[AttendanceRows]:
+        """统计每个人匹配的参会详情。每组参会信息只匹配去重后的名称。
+
+        attendance_infos为attendance_table按会议名称划分的结果，
+        匹配结果按行号引用attendance_table，不复制匹配的行。
+        """
+        name_index = create_personeel_name_index(personeel_infos)
+        people_matched: List[List[AttendanceTable]] = [[] for _ in personeel_infos]
+        for one_attendance_infos in attendance_infos.values():
+            for idx in self.match_indexed_attendance_table(name_index, one_attendance_infos):
+                people_matched[idx].append(one_attendance_infos)
+        return [select_attendance_rows(attendance_table, tables) for tables in people_matched]
+
+
     def stat_personeel_attendance_infos(self,
                                         personeel_info: PersoneelInfo,
-                                        attendance_infos: dict[str, AttendanceInfos],
+                                        attendance_infos: dict[str, Iterable[AttendanceInfo]],
                                         ) -> Iterator[AttendanceInfo]:
         """统计个人参会详情。"""
         for _, one_attendance_infos in attendance_infos.items():
@@ -433,19 +648,23 @@ class StatAttendanceInfos:
 
     def stat_people_attendance_infos(self,
                                      personeel_infos: PersoneelInfos,
-                                     attendance_infos: dict[str, AttendanceInfos],
+                                     attendance_table: AttendanceTable,
+                                     attendance_infos: dict[str, AttendanceTable],
                                      meeting_info: MeetingInfo,
                                      ) -> Iterator[PersoneelAttendanceInfo]:
         """统计个人参会详情。"""
         enough_attendance_time = timedelta(minutes=meeting_info.meeting_enough_time)
 
-        for personeel_info in personeel_infos:
-            personeel_attendance_infos = tuple(
-                self.stat_personeel_attendance_infos(personeel_info, attendance_infos)
-            )
-            personeel_attendance_time = summarize_attendance_time(
-                normalize_attendance_detail_infos(meeting_info)(personeel_attendance_infos)
-            )
+        people_matched = self.stat_people_matched_attendance_infos(
+            personeel_infos, attendance_table, attendance_infos
+        )
+        people_attendance_time = summarize_grouped_attendance_times(
+            meeting_info.meeting_start_time, meeting_info.meeting_end_time,
+            people_matched,
+        )
+        for personeel_info, personeel_attendance_infos, personeel_attendance_time in zip(
+            personeel_infos, people_matched, people_attendance_time
+        ):
             is_attendanced = personeel_attendance_time >= enough_attendance_time
             yield PersoneelAttendanceInfo(
                 personeel_info, personeel_attendance_infos, personeel_attendance_time,
@@ -453,24 +672,31 @@ class StatAttendanceInfos:
             )
 
 
-def stat_mismatched_attendance_infos(matched_attendance_infos: AttendanceInfos,
-                                     attendance_infos: dict[str, AttendanceInfos]
-                                     ) -> Iterator[AttendanceInfo]:
-    """统计没有匹配的参会信息。"""
-    for attendance_info in chain.from_iterable(attendance_infos.values()):
-        if attendance_info not in matched_attendance_infos:
-            yield attendance_info
+def stat_mismatched_attendance_infos(matched_row_ids: Iterable[np.ndarray],
+                                     attendance_infos: dict[str, AttendanceTable]
+                                     ) -> AttendanceTable:
+    """统计没有匹配的参会信息。
+
+    按行号在位图中标记已匹配的行，各组中未标记的行即为未匹配，保持分组顺序。
+    """
+    row_count = max(
+        (int(table.row_ids.max()) + 1 for table in attendance_infos.values() if len(table)),
+        default=0,
+    )
+    matched = np.zeros(row_count, dtype=bool)
+    for row_ids in matched_row_ids:
+        matched[row_ids] = True
+    return concat_attendance_tables(
+        table[~matched[table.row_ids]] for table in attendance_infos.values()
+    )
 
 
 def classify_team_attendance_infos(people_attendance_infos: PersoneelAttendanceInfos,
                                    ) -> TeamAttendanceInfos:
-    """分类小组参会信息。"""
+    """按小组分类参会信息，同组人员不必相邻。"""
     return dict(
-        expand_groupby(
-            groupby(
-                people_attendance_infos,
-                key=pipe(itemgetter(0), attrgetter('team'))
-            )
+        expand_hash_groupby(
+            people_attendance_infos, pipe(itemgetter(0), attrgetter('team'))
         )
     )
 
@@ -478,13 +704,10 @@ def classify_team_attendance_infos(people_attendance_infos: PersoneelAttendanceI
 def classify_zone_attendance_infos(team_attendance_infos: TeamAttendanceInfos,
                                    team_mapping: dict[str, str]
                                    ) -> ZoneAttendanceInfos:
-    """分类区域参会信息。"""
+    """按区域分类小组参会信息，同区域的小组不必相邻。"""
     return dict(
-        dict_groupby(
-            groupby(
-                team_attendance_infos.items(),
-                key=pipe(itemgetter(0), team_mapping.get)
-            )
+        dict_hash_groupby(
+            team_attendance_infos.items(), pipe(itemgetter(0), team_mapping.get)
         )
     )
 
@@ -571,86 +794,714 @@ def fill_mismatched_attendance_infos(mismatched_attendance_infos: AttendanceInfo
 
 
 def fill_zone_attendance_infos(zone_attendance_infos: ZoneAttendanceInfos,
-                               workbook: Workbook):
+                               workbook: Workbook) -> Tuple[FillCommand, ...]:
     """填充区域的参会信息。"""
-    for zone, attendance_infos in zone_attendance_infos.items():
-        fill_commands = generate_attendance_infos_fill_commands(attendance_infos)
-        do_fill_worksheet_commands(workbook[zone], fill_commands)
+    return tuple(
+        chain.from_iterable(
+            do_fill_worksheet_commands(
+                workbook[zone], generate_attendance_infos_fill_commands(attendance_infos)
+            )
+            for zone, attendance_infos in zone_attendance_infos.items()
+        )
+    )
 
 
-def overlapped(items: List) -> bool:
-    """是否重叠。"""
-    result = False
-    for idx_i in range(len(items)):
-        for idx_j in range(idx_i + 1, len(items)):
-            if items[idx_i] == items[idx_j]:
-                result = True
-    return result
+def overlapped(items: Iterable[Hashable]) -> bool:
+    """是否重叠。一次遍历，遇到重复项即返回。"""
+    seen = set()
+    for item in items:
+        if item in seen:
+            return True
+        seen.add(item)
+    return False
 
 
-def stat_time(args: Namespace) -> bool:
-    """统计参会时长。"""
-    summary_workbook = load_workbook(
-        os.path.join(args.meeting, MEETING_SUMMARY_FILENAME)
-    )
-    attendance_workbook = load_workbook(
-        os.path.join(args.meeting, MEETING_ATTENDANCE_FILENAME)
+def load_attendance_table(filepath: str,
+                          profiler: StageProfiler = NULL_PROFILER) -> AttendanceTable:
+    """流式加载考勤数据为列式参会信息表。
+
+    分阶段统计时先读出全部行，以便分别计量读取和解析。
+    """
+    rows = read_detail_rows(filepath)
+    if profiler.enabled:
+        rows = profiler.run('load_attendance', tuple, rows)
+    return profiler.run(
+        'parse_attendance', create_attendance_table, iter_attendance_detail_info(rows)
     )
-    summary_workbook_output_filepath = os.path.join(
-        args.meeting, MEETING_SUMMARY_OUTPUT_FILENAME
+
+
+def load_attendance_infos(filepath: str) -> dict[str, AttendanceTable]:
+    """流式加载考勤数据，并按会议名称划分。"""
+    return partition_attendance_table(load_attendance_table(filepath))
+
+
+def parse_summary_workbook(summary_workbook: Workbook
+                           ) -> Tuple[PersoneelInfos, MeetingInfo, Dict[str, str]]:
+    """解析生活修行考勤表中的人员、会议参数和小组映射。"""
+    return (
+        parse_people_sheet(summary_workbook[PEOPLE_SHEET_NAME]),
+        parse_meeting_info_sheet(summary_workbook[MEETING_INFO_SHEET_NAME]),
+        parse_team_mapping_sheet(summary_workbook[TEAM_MAPPING_SHEET_NAME]),
     )
-    people_sheet = summary_workbook[PEOPLE_SHEET_NAME]
-    personeel_infos = parse_people_sheet(people_sheet)
-    attendance_infos = parse_attendance_detail_sheet(
-        attendance_workbook[DETAIL_OF_MEMBER_ATTENDANCE]
+
+
+# 解析结果缓存的格式版本，解析逻辑或数据结构变化时递增
+MEETING_CACHE_VERSION = 2
+
+
+def open_meeting_cache(meeting: str, no_cache: bool = False) -> Optional[SidecarCache]:
+    """打开节气目录中的解析结果缓存。"""
+    if no_cache:
+        return None
+    return SidecarCache(
+        os.path.join(meeting, MEETING_CACHE_FILENAME), MEETING_CACHE_VERSION
     )
-    meeting_info = parse_meeting_info_sheet(summary_workbook[MEETING_INFO_SHEET_NAME])
-    team_mapping = parse_team_mapping_sheet(summary_workbook[TEAM_MAPPING_SHEET_NAME])
 
-    print(f'会议时长为{meeting_info.meeting_time}分钟。')
-    print(f'参会时间下限为{meeting_info.meeting_enough_time}分钟。')
 
-    attendance_infos = partition_attendance_infos(attendance_infos)
+def find_attendance_filepath(meeting: str) -> str:
+    """查找节气目录中的考勤数据，优先使用csv导出文件。"""
+    csv_filepath = os.path.join(meeting, MEETING_ATTENDANCE_CSV_FILENAME)
+    if os.path.isfile(csv_filepath):
+        return csv_filepath
+    return os.path.join(meeting, MEETING_ATTENDANCE_FILENAME)
+
+
+def load_meeting_inputs(meeting: str,
+                        summary_workbook: Workbook,
+                        cache: Optional[SidecarCache] = None,
+                        profiler: StageProfiler = NULL_PROFILER,
+                        ) -> Tuple[PersoneelInfos, MeetingInfo, Dict[str, str],
+                                   AttendanceTable, dict[str, AttendanceTable]]:
+    """加载节气目录的输入数据。源文件未变化时使用缓存的解析结果。
+
+    返回的参会信息包括完整的参会信息表及其按会议名称划分的结果。
+    """
+    summary_filepath = os.path.join(meeting, MEETING_SUMMARY_FILENAME)
+    attendance_filepath = find_attendance_filepath(meeting)
+    parse_summary = partial(
+        profiler.run, 'parse_people', parse_summary_workbook, summary_workbook,
+        count=pipe(itemgetter(0), len),
+    )
+    parse_attendance = partial(load_attendance_table, attendance_filepath, profiler)
+    if cache is None:
+        summary_inputs, attendance_table = parse_summary(), parse_attendance()
+    else:
+        summary_inputs = cache.get(MEETING_SUMMARY_FILENAME, summary_filepath, parse_summary)
+        attendance_table = cache.get(
+            os.path.basename(attendance_filepath), attendance_filepath, parse_attendance
+        )
+        cache.save()
+    return (
+        *summary_inputs, attendance_table,
+        profiler.run('partition', partition_attendance_table, attendance_table),
+    )
 
-    people_attendance_infos = tuple(
+
+def stat_people_attendance(personeel_infos: PersoneelInfos,
+                           attendance_table: AttendanceTable,
+                           attendance_infos: dict[str, AttendanceTable],
+                           meeting_info: MeetingInfo) -> PersoneelAttendanceInfos:
+    """匹配人员与参会信息，统计个人参会详情。人员没有重名时按姓名匹配。"""
+    return tuple(
         StatAttendanceInfos(
-            not overlapped(list(map(attrgetter('name'), personeel_infos)))
+            not overlapped(map(attrgetter('name'), personeel_infos))
         ).stat_people_attendance_infos(
-            personeel_infos, attendance_infos, meeting_info,
+            personeel_infos, attendance_table, attendance_infos, meeting_info,
         )
     )
 
-    matched_attendance_infos = set(
-        chain.from_iterable(
-            map(attrgetter('personeel_attendance_infos'), people_attendance_infos)
+
+def stat_meeting_mismatched(people_attendance_infos: PersoneelAttendanceInfos,
+                            attendance_infos: dict[str, AttendanceTable],
+                            meeting_info: MeetingInfo) -> AttendanceInfos:
+    """统计没有匹配的参会信息，按会议昵称排序。"""
+    matched_row_ids = map(
+        attrgetter('personeel_attendance_infos.row_ids'), people_attendance_infos
+    )
+    return sort_mismatched_attendance_infos(
+        stat_mismatched_attendance_infos(matched_row_ids, attendance_infos),
+        meeting_info,
+    )
+
+
+def sort_mismatched_attendance_infos(mismatched_attendance_infos: AttendanceTable,
+                                     meeting_info: MeetingInfo) -> AttendanceInfos:
+    """截取会议时间内的未匹配参会信息，按会议昵称排序。"""
+    return tuple(
+        sorted(
+            normalize_attendance_detail_infos(meeting_info)(mismatched_attendance_infos),
+            key=itemgetter(0)
         )
     )
 
-    team_attendance_infos = classify_team_attendance_infos(people_attendance_infos)
-    zone_attendance_infos = classify_zone_attendance_infos(
-        team_attendance_infos, team_mapping
+
+def classify_meeting_attendance_infos(people_attendance_infos: PersoneelAttendanceInfos,
+                                      team_mapping: dict[str, str]) -> ZoneAttendanceInfos:
+    """按小组、区域分类个人参会信息。"""
+    return classify_zone_attendance_infos(
+        classify_team_attendance_infos(people_attendance_infos), team_mapping
     )
 
-    mismatched_attendance_infos = tuple(
-        sorted(
-            normalize_attendance_detail_infos(meeting_info)(
-                stat_mismatched_attendance_infos(
-                    matched_attendance_infos, attendance_infos
+
+def fill_summary_workbook(mismatched_attendance_infos: AttendanceInfos,
+                          zone_attendance_infos: ZoneAttendanceInfos,
+                          summary_workbook: Workbook) -> Tuple[FillCommand, ...]:
+    """填充未改名表及各区域表，返回全部填充指令。"""
+    return (
+        fill_mismatched_attendance_infos(mismatched_attendance_infos, summary_workbook)
+        + fill_zone_attendance_infos(zone_attendance_infos, summary_workbook)
+    )
+
+
+def report_stage_records(meeting: str, profiler: StageProfiler):
+    """打印各阶段统计，并追加到节气目录的统计文件。"""
+    if not profiler.enabled:
+        return
+    print(format_stage_records(profiler.records))
+    profile_filepath = os.path.join(meeting, MEETING_PROFILE_FILENAME)
+    dump_stage_records(
+        profiler.records, profile_filepath,
+        meeting=meeting, time=datetime.now().isoformat(timespec='seconds'),
+    )
+    print(f"性能统计已追加到'{profile_filepath}'文件。")
+
+
+def report_pipe_trace(meeting: str, tracer: Optional[PipeTracer]):
+    """打印命名管道的追踪统计，并导出到节气目录。"""
+    if tracer is None:
+        return
+    print(format_pipe_trace(tracer))
+    trace_filepath = os.path.join(meeting, MEETING_PIPE_TRACE_FILENAME)
+    dump_pipe_trace(tracer, trace_filepath)
+    print(f"管道统计已保存到'{trace_filepath}'文件。")
+
+
+def create_person_results(people_attendance_infos: PersoneelAttendanceInfos,
+                          team_mapping: Dict[str, str]) -> Iterator[PersonResult]:
+    """转换个人参会信息为存储的统计结果。"""
+    for people_attendance_info in people_attendance_infos:
+        personeel_info = people_attendance_info.personeel_info
+        yield PersonResult(
+            personeel_info.name, personeel_info.team, personeel_info.number,
+            team_mapping.get(personeel_info.team),
+            int(people_attendance_info.personeel_attendance_time.total_seconds()),
+            people_attendance_info.is_attendanced,
+        )
+
+
+def save_meeting_results(meeting: str,
+                         meeting_info: MeetingInfo,
+                         people_attendance_infos: PersoneelAttendanceInfos,
+                         team_mapping: Dict[str, str]) -> str:
+    """保存节气的统计结果到上级目录的数据库，返回数据库路径。"""
+    store_filepath = get_meeting_store_filepath(meeting)
+    with MeetingStore(store_filepath) as store:
+        store.save_meeting(
+            MeetingRecord(
+                get_meeting_key(meeting), str(meeting_info.solar_term),
+                meeting_info.meeting_start_time, meeting_info.meeting_time,
+            ),
+            create_person_results(people_attendance_infos, team_mapping),
+        )
+    return store_filepath
+
+
+def create_attendance_rows(attendance_infos: dict[str, AttendanceTable],
+                           meeting_info: MeetingInfo) -> Iterator[AttendanceRow]:
+    """转换参会信息为归档的参会明细，保留解析时的行号，并附上裁剪到会议时间内的时间。"""
+    for table in attendance_infos.values():
+        intersected, enter_times, exit_times = clip_attendance_times(
+            meeting_info.meeting_start_time, meeting_info.meeting_end_time,
+            table.enter_times, table.exit_times,
+        )
+        for row_id, attendance_info, is_intersected, enter_time, exit_time in zip(
+            table.row_ids.tolist(), table,
+            intersected.tolist(), enter_times.tolist(), exit_times.tolist(),
+        ):
+            yield AttendanceRow(
+                row_id, *attendance_info,
+                microseconds_to_datetime(enter_time) if is_intersected else None,
+                microseconds_to_datetime(exit_time) if is_intersected else None,
+            )
+
+
+def create_person_matches(people_attendance_infos: PersoneelAttendanceInfos
+                          ) -> Iterator[PersonMatch]:
+    """列出每人匹配的会议名称。"""
+    for people_attendance_info in people_attendance_infos:
+        personeel_info = people_attendance_info.personeel_info
+        table = people_attendance_info.personeel_attendance_infos
+        for code in np.unique(table.meeting_name_codes).tolist():
+            yield PersonMatch(
+                personeel_info.name, personeel_info.team, personeel_info.number,
+                table.names[code],
+            )
+
+
+def archive_meeting_results(meeting: str,
+                            meeting_info: MeetingInfo,
+                            attendance_infos: dict[str, AttendanceTable],
+                            people_attendance_infos: PersoneelAttendanceInfos) -> str:
+    """归档节气的参会明细和人员匹配到上级目录的数据库，返回数据库路径。须先保存统计结果。"""
+    store_filepath = get_meeting_store_filepath(meeting)
+    with MeetingStore(store_filepath) as store:
+        store.archive_meeting(
+            get_meeting_key(meeting),
+            create_attendance_rows(attendance_infos, meeting_info),
+            create_person_matches(people_attendance_infos),
+        )
+    return store_filepath
+
+
+def store_meeting_results(args: Namespace,
+                          meeting_info: MeetingInfo,
+                          attendance_infos: dict[str, AttendanceTable],
+                          people_attendance_infos: PersoneelAttendanceInfos,
+                          team_mapping: Dict[str, str],
+                          profiler: StageProfiler):
+    """保存统计结果，按需归档参会明细。
+
+    此时生成的考勤表已保存，数据库出错只报告，不影响统计结果。
+    """
+    store_filepath = get_meeting_store_filepath(args.meeting)
+    try:
+        profiler.run(
+            'store', save_meeting_results,
+            args.meeting, meeting_info, people_attendance_infos, team_mapping,
+            count=constant(len(people_attendance_infos)),
+        )
+        print(f"统计结果已保存到'{store_filepath}'。")
+        if args.archive:
+            profiler.run(
+                'archive', archive_meeting_results,
+                args.meeting, meeting_info, attendance_infos, people_attendance_infos,
+                count=constant(sum(map(len, attendance_infos.values()))),
+            )
+            print(f"参会明细已归档到'{store_filepath}'。")
+    except (MeetingStoreVersionError, sqlite3.Error) as ex:
+        print(f"保存统计结果到'{store_filepath}'失败：{type(ex).__name__}: {ex}")
+
+
+def stat_time(args: Namespace) -> bool:
+    """统计参会时长。"""
+    with trace_pipes(args.trace_pipes) as tracer, StageProfiler(args.profile) as profiler:
+        summary_workbook = profiler.run(
+            'load_summary', load_workbook,
+            os.path.join(args.meeting, MEETING_SUMMARY_FILENAME),
+            count=pipe(attrgetter('worksheets'), len),
+        )
+        summary_workbook_output_filepath = os.path.join(
+            args.meeting, MEETING_SUMMARY_OUTPUT_FILENAME
+        )
+        personeel_infos, meeting_info, team_mapping, attendance_table, attendance_infos = (
+            load_meeting_inputs(
+                args.meeting, summary_workbook,
+                open_meeting_cache(args.meeting, args.no_cache), profiler,
+            )
+        )
+
+        print(f'会议时长为{meeting_info.meeting_time}分钟。')
+        print(f'参会时间下限为{meeting_info.meeting_enough_time}分钟。')
+
+        people_attendance_infos = profiler.run(
+            'match', stat_people_attendance,
+            personeel_infos, attendance_table, attendance_infos, meeting_info,
+        )
+        mismatched_attendance_infos = profiler.run(
+            'mismatch', stat_meeting_mismatched,
+            people_attendance_infos, attendance_infos, meeting_info,
+        )
+        zone_attendance_infos = profiler.run(
+            'classify', classify_meeting_attendance_infos,
+            people_attendance_infos, team_mapping,
+        )
+        profiler.run(
+            'fill', fill_summary_workbook,
+            mismatched_attendance_infos, zone_attendance_infos, summary_workbook,
+        )
+
+        profiler.run('save', summary_workbook.save, summary_workbook_output_filepath)
+        print(f"保存'{summary_workbook_output_filepath}'文件成功。")
+
+        if not args.no_store:
+            store_meeting_results(
+                args, meeting_info, attendance_infos, people_attendance_infos, team_mapping,
+                profiler,
+            )
+
+    report_stage_records(args.meeting, profiler)
+    report_pipe_trace(args.meeting, tracer)
+    return True
+
+
+def clear_worksheet_rows(worksheet, min_row: int):
+    """清除min_row行及以下单元格的值，避免上次较长的填充残留。保留模板的样式。"""
+    for row in worksheet.iter_rows(min_row=min_row):
+        for workcell in row:
+            workcell.value = None
+
+
+def generate_total_absent_commands(personeel_infos: PersoneelInfos,
+                                   team_mapping: Dict[str, str],
+                                   person_counts: List[AbsentCount],
+                                   team_counts: List[AbsentCount],
+                                   zone_counts: List[AbsentCount]) -> Iterator[FillCommand]:
+    """生成缺勤总表的填充命令。表头沿用模板。
+
+    从TOTAL_ABSENT_SHEET_FIRST_LINE行起按人员总表的顺序填写每人的序号、区域、小组、人员、
+    统计次数和缺勤次数，空一行后依次填写小组和区域的累计缺勤人次。
+    """
+    person_absent_counts = {count.key: count for count in person_counts}
+    line_no = TOTAL_ABSENT_SHEET_FIRST_LINE
+    for idx, personeel_info in enumerate(personeel_infos, start=1):
+        count = person_absent_counts.get(
+            (personeel_info.team, personeel_info.number, personeel_info.name),
+            AbsentCount((), 0, 0),
+        )
+        yield FillCommand(line_no, 1, idx, False)
+        yield FillCommand(line_no, 2, team_mapping.get(personeel_info.team, ''), False)
+        yield FillCommand(line_no, 3, personeel_info.team, False)
+        yield FillCommand(line_no, 4, personeel_info.formal_name, False)
+        yield FillCommand(line_no, 5, count.meetings, False)
+        yield FillCommand(line_no, 6, count.absent, count.absent > 0)
+        line_no += 1
+
+    for title, counts in (('小组合计', team_counts), ('区域合计', zone_counts)):
+        line_no += 1
+        yield FillCommand(line_no, 1, title, False)
+        yield FillCommand(line_no, 5, '人次', False)
+        yield FillCommand(line_no, 6, '缺勤人次', False)
+        line_no += 1
+        for count in counts:
+            for column_no, value in enumerate(count.key, start=2):
+                yield FillCommand(line_no, column_no, value or '', False)
+            yield FillCommand(line_no, 5, count.meetings, False)
+            yield FillCommand(line_no, 6, count.absent, count.absent > 0)
+            line_no += 1
+
+
+def stat_absent(args: Namespace) -> bool:
+    """统计截至本节气的累计缺勤次数，填充缺勤总表。只查询统计结果数据库，不读取历史表格。
+
+    本节气的统计结果未保存或数据库出错时只报告，不填充。
+    """
+    output_filepath = os.path.join(args.meeting, MEETING_SUMMARY_OUTPUT_FILENAME)
+    if os.path.isfile(output_filepath):
+        summary_workbook = load_workbook(output_filepath)
+    else:
+        summary_workbook = load_workbook(os.path.join(args.meeting, MEETING_SUMMARY_FILENAME))
+    personeel_infos, meeting_info, team_mapping = parse_summary_workbook(summary_workbook)
+    until = meeting_info.meeting_start_time
+
+    store_filepath = get_meeting_store_filepath(args.meeting)
+    try:
+        with MeetingStore(store_filepath) as store:
+            meetings = store.list_meetings(until)
+            if get_meeting_key(args.meeting) not in map(attrgetter('meeting'), meetings):
+                print(f"'{store_filepath}'中没有'{args.meeting}'的统计结果，请先执行stat_time。")
+                return False
+            commands = generate_total_absent_commands(
+                personeel_infos, team_mapping,
+                store.count_person_absences(until),
+                store.count_team_absences(until),
+                store.count_zone_absences(until),
+            )
+    except (MeetingStoreVersionError, sqlite3.Error) as ex:
+        print(f"读取统计结果'{store_filepath}'失败：{type(ex).__name__}: {ex}")
+        return False
+
+    if TOTAL_ABSENT_SHEET_NAME not in summary_workbook.sheetnames:
+        summary_workbook.create_sheet(TOTAL_ABSENT_SHEET_NAME)
+    total_absent_sheet = summary_workbook[TOTAL_ABSENT_SHEET_NAME]
+    clear_worksheet_rows(total_absent_sheet, TOTAL_ABSENT_SHEET_FIRST_LINE)
+    do_fill_worksheet_commands(total_absent_sheet, commands)
+    print(f'统计{len(meetings)}次节气：{"、".join(map(attrgetter("solar_term"), meetings))}。')
+    summary_workbook.save(output_filepath)
+    print(f"保存'{output_filepath}'文件成功。")
+    return True
+
+
+class MeetingWatcher:
+    """增量统计参会时长。
+
+    人员、名称索引和每人的统计结果常驻内存。考勤数据更新时只解析新出现的行，
+    只重新匹配变化的会议名称分组，只重新汇总受影响的人员、重新填充受影响的区域表。
+    """
+
+    def __init__(self, meeting: str):
+        self.meeting = meeting
+        self.summary_workbook = load_workbook(os.path.join(meeting, MEETING_SUMMARY_FILENAME))
+        self.personeel_infos, self.meeting_info, self.team_mapping = parse_summary_workbook(
+            self.summary_workbook
+        )
+        self.name_index = create_personeel_name_index(self.personeel_infos)
+        self.stat = StatAttendanceInfos(
+            not overlapped(map(attrgetter('name'), self.personeel_infos))
+        )
+        self.rows: Counter = Counter()  # 考勤数据的原始行及出现次数
+        self.parsed_rows: Dict[Tuple, AttendanceInfo] = {}
+        self.table = create_attendance_table(())  # 最新的考勤数据
+        self.groups: Dict[str, AttendanceTable] = {}  # 按会议名称划分的参会信息
+        self.group_people: Dict[str, Set[int]] = {}  # 会议名称匹配的人员序号
+        self.people_groups: List[Set[str]] = [set() for _ in self.personeel_infos]
+        empty_rows = select_attendance_rows(self.table, ())
+        self.people_attendance_infos: List[PersoneelAttendanceInfo] = [
+            PersoneelAttendanceInfo(personeel_info, empty_rows, timedelta(), False)
+            for personeel_info in self.personeel_infos
+        ]
+        self.mismatched_attendance_infos: Optional[AttendanceInfos] = None
+        self.filled_commands: Dict[str, Tuple[FillCommand, ...]] = {}  # 各工作表上次的填充指令
+        self.template_styles: Dict[str, Dict[Tuple[int, int], StyleArray]] = {}  # 首次填充前的单元格样式
+
+    def parse_rows(self, rows: Iterable[Tuple]) -> Set[str]:
+        """更新考勤数据的原始行，只解析新出现的行。返回行有变化的会议名称。"""
+        rows = Counter(map(tuple, rows))
+        changed_rows = (rows - self.rows) + (self.rows - rows)
+        for row in rows:
+            if row not in self.parsed_rows:
+                self.parsed_rows[row] = parse_attendance_info(transform_row_data(row))
+        changed_groups = {self.parsed_rows[row].meeting_name for row in changed_rows}
+        self.parsed_rows = {row: self.parsed_rows[row] for row in rows}
+        self.rows = rows
+        return changed_groups
+
+    def match_groups(self, changed_groups: Set[str]) -> Set[int]:
+        """重新匹配变化的分组，返回受影响的人员序号。"""
+        self.table = create_attendance_table(
+            map(self.parsed_rows.__getitem__, self.rows.elements())
+        )
+        self.groups = partition_attendance_table(self.table)
+        affected_people = set()
+        for group in changed_groups:
+            matched = self.group_people.pop(group, set())
+            if group in self.groups:
+                self.group_people[group] = self.stat.match_indexed_attendance_table(
+                    self.name_index, self.groups[group]
                 )
+            for idx in matched - self.group_people.get(group, set()):
+                self.people_groups[idx].discard(group)
+            for idx in self.group_people.get(group, ()):
+                self.people_groups[idx].add(group)
+            affected_people |= matched | self.group_people.get(group, set())
+        return affected_people
+
+    def stat_people(self, affected_people: Set[int]):
+        """重新汇总受影响人员的参会详情和参会时长。
+
+        考勤数据每次更新都会重建，未受影响人员的参会详情仍引用旧表，只用于填充。
+        """
+        affected_people = sorted(affected_people)
+        people_matched = [
+            select_attendance_rows(
+                self.table, map(self.groups.__getitem__, sorted(self.people_groups[idx]))
+            )
+            for idx in affected_people
+        ]
+        people_attendance_time = summarize_grouped_attendance_times(
+            self.meeting_info.meeting_start_time, self.meeting_info.meeting_end_time,
+            people_matched,
+        )
+        enough_attendance_time = timedelta(minutes=self.meeting_info.meeting_enough_time)
+        for idx, personeel_attendance_infos, personeel_attendance_time in zip(
+            affected_people, people_matched, people_attendance_time
+        ):
+            self.people_attendance_infos[idx] = PersoneelAttendanceInfo(
+                self.personeel_infos[idx], personeel_attendance_infos,
+                personeel_attendance_time,
+                personeel_attendance_time >= enough_attendance_time,
+            )
+
+    def refill_worksheet(self, sheet_name: str, commands: Iterable[FillCommand]):
+        """重新填充工作表。
+
+        上次填充的单元格先清除值并恢复模板的样式，再按本次的指令填充，与在模板上首次填充的结果一致。
+        """
+        worksheet = self.summary_workbook[sheet_name]
+        commands = tuple(commands)
+        template_styles = self.template_styles.setdefault(sheet_name, {})
+        for command in self.filled_commands.get(sheet_name, ()):
+            workcell = worksheet.cell(command.line_no, command.column_no)
+            workcell.value = None
+            workcell._style = copy(template_styles[command.line_no, command.column_no])
+        for command in commands:
+            key = (command.line_no, command.column_no)
+            if key not in template_styles:
+                template_styles[key] = copy(worksheet.cell(*key)._style)
+        self.filled_commands[sheet_name] = do_fill_worksheet_commands(worksheet, commands)
+
+    def fill(self, affected_people: Set[int]) -> int:
+        """重新填充未改名表和受影响的区域表，返回填充的区域数。"""
+        mismatched_attendance_infos = sort_mismatched_attendance_infos(
+            concat_attendance_tables(
+                table for group, table in self.groups.items()
+                if not self.group_people.get(group)
             ),
-            key=itemgetter(0)
+            self.meeting_info,
+        )
+        if mismatched_attendance_infos != self.mismatched_attendance_infos:
+            self.refill_worksheet(
+                MISMATCHED_SHEET_NAME,
+                generate_mismatched_commands(
+                    merge_attendance_infos(mismatched_attendance_infos).items()
+                ),
+            )
+            self.mismatched_attendance_infos = mismatched_attendance_infos
+
+        zone_attendance_infos = classify_meeting_attendance_infos(
+            self.people_attendance_infos, self.team_mapping
+        )
+        affected_zones = {
+            zone for zone in zone_attendance_infos if zone not in self.filled_commands
+        } | {
+            self.team_mapping.get(self.personeel_infos[idx].team) for idx in affected_people
+        }
+        for zone in affected_zones & zone_attendance_infos.keys():
+            self.refill_worksheet(
+                zone, generate_attendance_infos_fill_commands(zone_attendance_infos[zone])
+            )
+        return len(affected_zones & zone_attendance_infos.keys())
+
+    def update(self, rows: Iterable[Tuple]) -> Optional[Tuple[int, int]]:
+        """用最新的考勤数据更新统计。没有变化时返回None，否则返回(受影响人数, 填充区域数)。"""
+        changed_groups = self.parse_rows(rows)
+        if not changed_groups and self.filled_commands:
+            return None
+        affected_people = self.match_groups(changed_groups)
+        self.stat_people(affected_people)
+        return len(affected_people), self.fill(affected_people)
+
+    def save(self) -> str:
+        """保存生成的考勤表，返回文件路径。"""
+        output_filepath = os.path.join(self.meeting, MEETING_SUMMARY_OUTPUT_FILENAME)
+        self.summary_workbook.save(output_filepath)
+        return output_filepath
+
+
+def get_file_signature(filepath: str) -> Optional[Tuple[int, int]]:
+    """文件的大小和修改时间，文件不存在时返回None。"""
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def watch(args: Namespace) -> bool:
+    """监视节气目录的考勤数据，有新的导出文件时增量统计参会时长。按Ctrl+C退出。"""
+    watcher = MeetingWatcher(args.meeting)
+    print(f'会议时长为{watcher.meeting_info.meeting_time}分钟。')
+    print(f'参会时间下限为{watcher.meeting_info.meeting_enough_time}分钟。')
+    print(f"监视'{args.meeting}'目录的考勤数据，按Ctrl+C退出。")
+    signature = None
+    try:
+        while True:
+            attendance_filepath = find_attendance_filepath(args.meeting)
+            current_signature = get_file_signature(attendance_filepath)
+            if current_signature is not None and current_signature != signature:
+                start = perf_counter()
+                try:
+                    updated = watcher.update(read_detail_rows(attendance_filepath))
+                except Exception as ex:  # 导出文件可能尚未写完，下次轮询重试
+                    print(f"读取'{attendance_filepath}'失败：{type(ex).__name__}: {ex}")
+                else:
+                    signature = current_signature
+                    if updated is not None:
+                        people, zones = updated
+                        output_filepath = watcher.save()
+                        print(
+                            f'更新{people}人、{zones}个区域表，用时{perf_counter() - start:.2f}秒，'
+                            f"已保存'{output_filepath}'文件。"
+                        )
+            sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    return True
+
+
+def natural_sort_key(text: str) -> Tuple:
+    """按数字大小排序的键，如2.小寒排在10.立夏之前。"""
+    return tuple(
+        int(part) if idx % 2 else part
+        for idx, part in enumerate(NUMBER_REGEX.split(text))
+    )
+
+
+def expand_meeting_dirs(patterns: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    """展开节气目录参数中的通配符，按目录名中的序号排序，保持参数顺序并去重。"""
+    if isinstance(patterns, str):
+        patterns = (patterns,)
+    meetings = []
+    for pattern in patterns:
+        matched = sorted(
+            filter(os.path.isdir, glob(pattern)), key=natural_sort_key
+        ) or [pattern]
+        for meeting in matched:
+            if meeting not in meetings:
+                meetings.append(meeting)
+    return tuple(meetings)
+
+
+# stat_time的选项及默认值
+STAT_TIME_OPTIONS = {
+    'no_cache': False,
+    'profile': False,
+    'trace_pipes': False,
+    'archive': False,
+    'no_store': False,
+}
+
+
+def get_stat_time_options(args: Namespace) -> dict:
+    """从命令行参数中提取stat_time的选项。"""
+    return {
+        key: getattr(args, key, default) for key, default in STAT_TIME_OPTIONS.items()
+    }
+
+
+def stat_time_worker(meeting: str, **options) -> StatTimeResult:
+    """统计单个节气目录的参会时长，记录耗时与错误。options见STAT_TIME_OPTIONS。"""
+    start = perf_counter()
+    try:
+        stat_time(Namespace(meeting=meeting, **{**STAT_TIME_OPTIONS, **options}))
+    except Exception as ex:
+        return StatTimeResult(
+            meeting, False, perf_counter() - start, f'{type(ex).__name__}: {ex}'
         )
+    return StatTimeResult(
+        meeting, True, perf_counter() - start,
+        os.path.join(meeting, MEETING_SUMMARY_OUTPUT_FILENAME),
     )
 
-    fill_mismatched_attendance_infos(mismatched_attendance_infos, summary_workbook)
-    fill_zone_attendance_infos(zone_attendance_infos, summary_workbook)
 
-    summary_workbook.save(summary_workbook_output_filepath)
-    print(f"保存'{summary_workbook_output_filepath}'文件成功。")
+def stat_time_batch(meetings: Tuple[str, ...],
+                    workers: Optional[int] = None,
+                    **options) -> Tuple[StatTimeResult, ...]:
+    """在进程池中并行统计多个节气目录，各目录的结果相互独立。"""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return tuple(executor.map(partial(stat_time_worker, **options), meetings))
 
-    return True
+
+def print_stat_time_results(results: Tuple[StatTimeResult, ...]):
+    """打印批量统计汇总。"""
+    print('批量统计汇总：')
+    for result in results:
+        status = '成功' if result.succeeded else '失败'
+        print(f'{status}\t{result.seconds:.2f}秒\t{result.meeting}\t{result.message}')
+    succeeded = sum(map(attrgetter('succeeded'), results))
+    print(f'共{len(results)}个目录，成功{succeeded}个，失败{len(results) - succeeded}个。')
 
 
 def main_process(args: Namespace):
     """主流程。"""
-    stat_time(args)
+    if args.subparser_name == 'watch':
+        watch(args)
+        return
+    if args.subparser_name == 'stat_absent':
+        stat_absent(args)
+        return
+    meetings = expand_meeting_dirs(args.meeting)
+    options = get_stat_time_options(args)
+    if len(meetings) == 1:
+        stat_time(Namespace(meeting=meetings[0], **options))
+        return
+    print_stat_time_results(stat_time_batch(meetings, args.workers, **options))
@@ -1,20 +1,26 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from datetime import time
-from functools import partial
+import csv
+from datetime import datetime, timedelta
 
 import pytest
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
 
 from meeting_attendance_workbook import (
-    AttendanceInfo, GET_NICKNAME_ERROR,
-    DETAIL_OF_MEMBER_ATTENDANCE, OVERVIEW_OF_MEMBER_ATTENDANCE,
-    create_origin_attendance_info, get_nickname,
-    merge_attendance_info,
-    parse_attendance_info, parse_attendance_detail_info, parse_attendance_overview_sheet
+    AttendanceInfo, DETAIL_OF_MEMBER_ATTENDANCE, get_nickname,
+    parse_attendance_info, parse_attendance_detail_info,
+    parse_attendance_detail_file, parse_attendance_detail_sheet,
+    parse_datetime, read_detail_sheet,
+    detect_csv_encoding, iter_csv_rows, read_detail_csv,
+    clip_attendance_infos, summarize_attendance_time,
+    summarize_grouped_attendance_times,
+    concat_attendance_tables, create_attendance_table,
+    merge_attendance_infos, partition_attendance_infos, partition_attendance_table,
+    select_attendance_rows,
+    normalize_name, parse_normalized_fullname,
 )
-from meeting_comm import Cell, StatError
+from meeting_comm import StatError
 
 
 def test_get_nickname_01():
@@ -30,247 +36,319 @@ def test_get_nickname_02():
 def test_get_nickname_03():
     with pytest.raises(StatError) as ex:
         get_nickname('')
-    assert GET_NICKNAME_ERROR == str(ex.value)
+    assert '获取用户昵称错误：' == str(ex.value)
 
 
-def create_test_attendance_workbook_01() -> Workbook:
-    wb = Workbook()
-    ws = wb.active
-    ws.title = OVERVIEW_OF_MEMBER_ATTENDANCE
-    ws.cell(row=9, column=1, value='用户昵称（入会昵称）')
-    ws.cell(row=9, column=2, value='首次入会时间')
-    ws.cell(row=9, column=3, value='最后退会时间')
-    ws.cell(row=9, column=4, value='入会次数')
-    ws.cell(row=9, column=5, value='累计参会时长')
-    ws.cell(row=9, column=6, value='身份')
-
-    ws.cell(row=10, column=1, value='人员1(中乾0人员1)')
-    ws.cell(row=10, column=2, value='2024-01-01 00:00:00')
-    ws.cell(row=10, column=3, value='2024-01-01 00:30:00')
-    ws.cell(row=10, column=4, value='1')
-    ws.cell(row=10, column=5, value='0:30:00')
-    ws.cell(row=10, column=6, value='普通参会者')
-
-    ws.cell(row=11, column=1, value='人员2(人员2)')
-    ws.cell(row=11, column=2, value='2024-01-01 00:00:00')
-    ws.cell(row=11, column=3, value='2024-01-01 00:30:00')
-    ws.cell(row=11, column=4, value='2')
-    ws.cell(row=11, column=5, value='0:30:00')
-    ws.cell(row=11, column=6, value='普通参会者')
-
-    ws.cell(row=12, column=1, value='人员2(人员2)')
-    ws.cell(row=12, column=2, value='2024-01-01 00:30:00')
-    ws.cell(row=12, column=3, value='2024-01-01 00:40:00')
-    ws.cell(row=12, column=4, value='1')
-    ws.cell(row=12, column=5, value='0:10:00')
-    ws.cell(row=12, column=6, value='普通参会者')
-
-    ws.cell(row=13, column=1, value='人员3&人员4(中乾2人员3＆中坤0人员4)')
-    ws.cell(row=13, column=2, value='2024-01-01 00:00:00')
-    ws.cell(row=13, column=3, value='2024-01-01 00:40:00')
-    ws.cell(row=13, column=4, value='1')
-    ws.cell(row=13, column=5, value='0:40:00')
-    ws.cell(row=13, column=6, value='主持人')
-
-    ws = wb.create_sheet(DETAIL_OF_MEMBER_ATTENDANCE)
-    ws.cell(row=9, column=1, value='用户昵称（入会昵称）')
-    ws.cell(row=9, column=2, value='入会时间')
-    ws.cell(row=9, column=3, value='退会时间')
-    ws.cell(row=9, column=4, value='单次参会时长')
-    ws.cell(row=9, column=5, value='房间类型')
-
-    ws.cell(row=10, column=1, value='人员1(中乾0人员1)')
-    ws.cell(row=10, column=2, value='2024-01-01 00:00:00')
-    ws.cell(row=10, column=3, value='2024-01-01 00:10:00')
-    ws.cell(row=10, column=4, value='0:10:00')
-    ws.cell(row=10, column=5, value='会议室')
-
-    ws.cell(row=10, column=1, value='人员1(中乾0人员1)')
-    ws.cell(row=10, column=2, value='2024-01-01 00:10:00')
-    ws.cell(row=10, column=3, value='2024-01-01 00:30:00')
-    ws.cell(row=10, column=4, value='0:20:00')
-    ws.cell(row=10, column=5, value='会议室')
-
-    ws.cell(row=10, column=1, value='人员1(人员1)')
-    ws.cell(row=10, column=2, value='2024-01-01 00:30:00')
-    ws.cell(row=10, column=3, value='2024-01-01 00:40:00')
-    ws.cell(row=10, column=4, value='0:10:00')
-    ws.cell(row=10, column=5, value='会议室')
-
-    ws.cell(row=11, column=1, value='人员2(人员2)')
-    ws.cell(row=11, column=2, value='2024-01-01 00:00:00')
-    ws.cell(row=11, column=3, value='2024-01-01 00:30:00')
-    ws.cell(row=11, column=4, value='0:30:00')
-    ws.cell(row=11, column=5, value='会议室')
-
-    ws.cell(row=12, column=1, value='人员2(人员2)')
-    ws.cell(row=12, column=2, value='2024-01-01 00:30:00')
-    ws.cell(row=12, column=3, value='2024-01-01 00:40:00')
-    ws.cell(row=12, column=4, value='0:10:00')
-    ws.cell(row=12, column=5, value='会议室')
-
-    ws.cell(row=13, column=1, value='人员3&人员4(中乾2人员3＆中坤0人员4)')
-    ws.cell(row=13, column=2, value='2024-01-01 00:00:00')
-    ws.cell(row=13, column=3, value='2024-01-01 00:40:00')
-    ws.cell(row=13, column=4, value='0:40:00')
-    ws.cell(row=13, column=5, value='会议室')
+def test_parse_attendance_info_01():
+    result = parse_attendance_info((
+        '人员1(中乾 0-人员1)', None, None, None, None,
+        '2024-01-01 00:00:00', '2024-01-01 00:30:00',
+    ))
+    expected = AttendanceInfo(
+        '中乾0人员1', '人员1', '人员1(中乾 0-人员1)',
+        datetime(2024, 1, 1, 0, 0, 0), datetime(2024, 1, 1, 0, 30, 0),
+    )
+    assert expected == result
 
-    return wb
+
+def test_parse_attendance_detail_info_01():
+    result = parse_attendance_detail_info(
+        ('(人员1)', None, None, None, None, '2024-01-01 00:00:00', '2024-01-01 00:30:00'),
+        ('(人员2)', None, None, None, None, '2024-01-01 00:10:00', '2024-01-01 00:20:00'),
+    )
+    expected = (
+        AttendanceInfo(
+            '人员1', '(人员1)', '(人员1)',
+            datetime(2024, 1, 1, 0, 0, 0), datetime(2024, 1, 1, 0, 30, 0),
+        ),
+        AttendanceInfo(
+            '人员2', '(人员2)', '(人员2)',
+            datetime(2024, 1, 1, 0, 10, 0), datetime(2024, 1, 1, 0, 20, 0),
+        ),
+    )
+    assert expected == result
 
 
-TEST_ATTENDANCE_WB_01 = create_test_attendance_workbook_01()
+def create_test_detail_workbook_01() -> Workbook:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = DETAIL_OF_MEMBER_ATTENDANCE
+    ws.cell(row=10, column=2, value='人员1(中乾0人员1)')
+    ws.cell(row=10, column=7, value='2024-01-01 00:00:00')
+    ws.cell(row=10, column=8, value='2024-01-01 00:10:00')
+    ws.cell(row=11, column=2, value='(中坤1人员2)')
+    ws.cell(row=11, column=7, value='2024-01-01 00:05:00')
+    ws.cell(row=11, column=8, value='2024-01-01 00:30:00')
+    return wb
 
-TEST_ATTENDANCE_INFO_01 = create_origin_attendance_info(
-    '中乾0人员1', '人员1(中乾0人员1)', time(0, 30, 0)
-)
-TEST_ATTENDANCE_INFO_01_01 = create_origin_attendance_info(
-    '*中乾0人员1*', '*中乾0人员1*', time(0, 30, 0)
-)
-TEST_ATTENDANCE_INFO_02 = AttendanceInfo(
-    '人员2', '人员2(人员2)', time(0, 40, 0), True
-)
-TEST_ATTENDANCE_INFO_03 = create_origin_attendance_info(
-    '中乾2人员3', '人员3&人员4(中乾2人员3＆中坤0人员4)', time(0, 40, 0)
-)
-TEST_ATTENDANCE_INFO_04 = create_origin_attendance_info(
-    '中坤0人员4', '人员3&人员4(中乾2人员3＆中坤0人员4)', time(0, 40, 0)
-)
 
-get_test_attendance_infos_01 = partial(
-    parse_attendance_overview_sheet, TEST_ATTENDANCE_WB_01[OVERVIEW_OF_MEMBER_ATTENDANCE]
+TEST_DETAIL_ATTENDANCE_INFOS_01 = (
+    AttendanceInfo(
+        '中乾0人员1', '人员1', '人员1(中乾0人员1)',
+        datetime(2024, 1, 1, 0, 0, 0), datetime(2024, 1, 1, 0, 10, 0),
+    ),
+    AttendanceInfo(
+        '中坤1人员2', '(中坤1人员2)', '(中坤1人员2)',
+        datetime(2024, 1, 1, 0, 5, 0), datetime(2024, 1, 1, 0, 30, 0),
+    ),
 )
 
 
-def test_create_origin_attendance_info_01():
-    result = create_origin_attendance_info(
-        '中乾0人员1', '中乾0人员1', time(0, 30, 0)
+def test_parse_attendance_detail_sheet_01(tmp_path):
+    filepath = tmp_path / 'detail.xlsx'
+    create_test_detail_workbook_01().save(filepath)
+    wb = load_workbook(filepath, read_only=True)
+    result = parse_attendance_detail_sheet(wb[DETAIL_OF_MEMBER_ATTENDANCE])
+    assert not isinstance(result, tuple)
+    assert TEST_DETAIL_ATTENDANCE_INFOS_01 == tuple(result)
+    wb.close()
+
+
+def test_read_detail_sheet_01(tmp_path):
+    filepath = tmp_path / 'detail.xlsx'
+    wb = create_test_detail_workbook_01()
+    wb.create_sheet('其他').cell(row=10, column=2, value='其他')
+    wb.active.cell(row=13, column=9, value=1)
+    wb.save(filepath)
+    result = tuple(read_detail_sheet(str(filepath)))
+    expected = tuple(
+        load_workbook(filepath, read_only=True)[DETAIL_OF_MEMBER_ATTENDANCE].iter_rows(
+            min_row=10, min_col=2, max_col=9, values_only=True
+        )
     )
-    expected = AttendanceInfo('中乾0人员1', '中乾0人员1', time(0, 30, 0), False)
     assert expected == result
+    assert (None,) * 7 + (1,) == result[-1]
 
 
-def test_parse_attendance_info_01():
-    result = list(
-        parse_attendance_info(
-            Cell('(人员1)'),
-            Cell(None),
-            Cell(None),
-            Cell(None),
-            Cell('0:30:00'),
-            Cell(None)
-        )
-    )
-    expected = [create_origin_attendance_info('人员1', '(人员1)', time(0, 30, 0))]
-    assert expected == result
+def test_parse_attendance_detail_file_01(tmp_path):
+    filepath = tmp_path / 'detail.xlsx'
+    create_test_detail_workbook_01().save(filepath)
+    result = tuple(parse_attendance_detail_file(str(filepath)))
+    assert TEST_DETAIL_ATTENDANCE_INFOS_01 == result
 
 
-def test_parse_attendance_detail_info_01():
-    result = list(
-        parse_attendance_detail_info(
-            Cell('(人员1)'),
-            Cell(None),
-            Cell(None),
-            Cell('0:30:00'),
-            Cell(None)
-        )
-    )
-    expected = [create_origin_attendance_info('人员1', '(人员1)', time(0, 30, 0))]
-    assert expected == result
+def test_parse_datetime_01():
+    result = parse_datetime('2024-01-01 19:00:05')
+    assert datetime(2024, 1, 1, 19, 0, 5) == result
 
 
-def test_parse_attendance_info_02():
-    result = list(
-        parse_attendance_info(
-            Cell('(人员 _-01＆人员2)'),
-            Cell(None),
-            Cell(None),
-            Cell(None),
-            Cell('0:30:00'),
-            Cell(None)
-        )
-    )
-    expected = [
-        create_origin_attendance_info('人员1', '(人员 _-01＆人员2)', time(0, 30, 0)),
-        create_origin_attendance_info('人员2', '(人员 _-01＆人员2)', time(0, 30, 0)),
-    ]
-    assert expected == result
+def test_parse_datetime_02():
+    result = parse_datetime('2024-1-1 19:00:05')
+    assert datetime(2024, 1, 1, 19, 0, 5) == result
 
 
-def test_parse_attendance_detail_info_02():
-    result = list(
-        parse_attendance_detail_info(
-            Cell('(人员 _-01＆人员2)'),
-            Cell(None),
-            Cell(None),
-            Cell('0:30:00'),
-            Cell(None)
-        )
+def test_parse_datetime_03():
+    value = datetime(2024, 1, 1, 19, 0, 5)
+    result = parse_datetime(value)
+    assert value is result
+
+
+def test_parse_datetime_04():
+    with pytest.raises(ValueError):
+        parse_datetime('2024-02-30 00:00:00')
+
+
+TEST_MEETING_START_TIME = datetime(2024, 1, 1, 19, 0)
+TEST_MEETING_END_TIME = datetime(2024, 1, 1, 21, 0)
+
+
+def create_test_clip_attendance_info(enter_time: datetime, exit_time: datetime):
+    return AttendanceInfo('鄂A', 'noway', 'noway(鄂A)', enter_time, exit_time)
+
+
+TEST_CLIP_ATTENDANCE_INFOS_01 = (
+    create_test_clip_attendance_info(datetime(2024, 1, 1, 18, 0), datetime(2024, 1, 1, 18, 30)),
+    create_test_clip_attendance_info(datetime(2024, 1, 1, 18, 50), datetime(2024, 1, 1, 19, 30)),
+    create_test_clip_attendance_info(datetime(2024, 1, 1, 19, 40), datetime(2024, 1, 1, 20, 0, 0, 500)),
+    create_test_clip_attendance_info(datetime(2024, 1, 1, 20, 30), datetime(2024, 1, 1, 22, 0)),
+    create_test_clip_attendance_info(datetime(2024, 1, 1, 21, 0), datetime(2024, 1, 1, 21, 5)),
+    create_test_clip_attendance_info(datetime(2024, 1, 1, 21, 1), datetime(2024, 1, 1, 21, 5)),
+)
+
+
+def test_clip_attendance_infos_01():
+    result = clip_attendance_infos(
+        TEST_MEETING_START_TIME, TEST_MEETING_END_TIME, TEST_CLIP_ATTENDANCE_INFOS_01
+    )
+    expected = (
+        create_test_clip_attendance_info(TEST_MEETING_START_TIME, datetime(2024, 1, 1, 19, 30)),
+        TEST_CLIP_ATTENDANCE_INFOS_01[2],
+        create_test_clip_attendance_info(datetime(2024, 1, 1, 20, 30), TEST_MEETING_END_TIME),
+        create_test_clip_attendance_info(TEST_MEETING_END_TIME, TEST_MEETING_END_TIME),
     )
-    expected = [
-        create_origin_attendance_info('人员1', '(人员 _-01＆人员2)', time(0, 30, 0)),
-        create_origin_attendance_info('人员2', '(人员 _-01＆人员2)', time(0, 30, 0)),
-    ]
     assert expected == result
+    assert result[0].enter_time is TEST_MEETING_START_TIME
 
 
-def test_parse_attendance_info_03():
-    result = list(
-        parse_attendance_info(
-            Cell('(人员1&人员2)'),
-            Cell(None),
-            Cell(None),
-            Cell(None),
-            Cell('0:30:00'),
-            Cell(None)
-        )
+def test_clip_attendance_infos_02():
+    result = clip_attendance_infos(TEST_MEETING_START_TIME, TEST_MEETING_END_TIME, iter(()))
+    assert tuple() == result
+
+
+def test_summarize_grouped_attendance_times_01():
+    groups = [
+        TEST_CLIP_ATTENDANCE_INFOS_01,
+        tuple(),
+        TEST_CLIP_ATTENDANCE_INFOS_01[2:3],
+    ]
+    result = summarize_grouped_attendance_times(
+        TEST_MEETING_START_TIME, TEST_MEETING_END_TIME, groups
     )
     expected = [
-        create_origin_attendance_info('人员1', '(人员1&人员2)', time(0, 30, 0)),
-        create_origin_attendance_info('人员2', '(人员1&人员2)', time(0, 30, 0)),
+        summarize_attendance_time(clip_attendance_infos(
+            TEST_MEETING_START_TIME, TEST_MEETING_END_TIME, infos
+        ))
+        for infos in groups
     ]
     assert expected == result
+    assert timedelta(minutes=20, microseconds=500) == result[2]
 
 
-def test_parse_attendance_detail_info_03():
-    result = list(
-        parse_attendance_detail_info(
-            Cell('(人员1&人员2)'),
-            Cell(None),
-            Cell(None),
-            Cell('0:30:00'),
-            Cell(None)
-        )
+def test_summarize_grouped_attendance_times_02():
+    result = summarize_grouped_attendance_times(
+        TEST_MEETING_START_TIME, TEST_MEETING_END_TIME, []
     )
-    expected = [
-        create_origin_attendance_info('人员1', '(人员1&人员2)', time(0, 30, 0)),
-        create_origin_attendance_info('人员2', '(人员1&人员2)', time(0, 30, 0)),
-    ]
-    assert expected == result
+    assert [] == result
 
 
-def test_merge_attendance_info_01():
-    result = merge_attendance_info(
-        create_origin_attendance_info(
-            '中乾0人员1', '#中乾0人员1#', time(0, 30, 30)
-        ),
-        create_origin_attendance_info(
-            '中乾0人员1', '*中乾0人员1*', time(0, 30, 41)
-        ),
+TEST_TABLE_ATTENDANCE_INFOS_01 = (
+    AttendanceInfo('鄂A', 'noway', 'noway(鄂A)', datetime(2024, 1, 1, 19, 0), datetime(2024, 1, 1, 19, 30)),
+    AttendanceInfo('鄂B', 'iPhone', 'iPhone(鄂B)', datetime(2024, 1, 1, 19, 5), datetime(2024, 1, 1, 20, 0)),
+    AttendanceInfo('鄂A', 'noway', 'noway(鄂A)', datetime(2024, 1, 1, 20, 0), datetime(2024, 1, 1, 20, 0, 0, 1)),
+    AttendanceInfo('noway', 'noway', 'noway', datetime(2024, 1, 1, 18, 0), datetime(2024, 1, 1, 22, 0)),
+)
+
+
+def test_create_attendance_table_01():
+    result = create_attendance_table(iter(TEST_TABLE_ATTENDANCE_INFOS_01))
+    assert 4 == len(result)
+    assert ('鄂A', 'noway', 'noway(鄂A)', '鄂B', 'iPhone', 'iPhone(鄂B)') == result.names
+    assert TEST_TABLE_ATTENDANCE_INFOS_01 == tuple(result)
+    assert TEST_TABLE_ATTENDANCE_INFOS_01[2] == result[2]
+    assert TEST_TABLE_ATTENDANCE_INFOS_01[1:3] == tuple(result[1:3])
+    assert {('鄂A', 'noway'), ('noway', 'noway')} == result[::2].name_pairs() | result[3:].name_pairs()
+
+
+def test_create_attendance_table_02():
+    result = create_attendance_table(())
+    assert 0 == len(result)
+    assert tuple() == tuple(result)
+
+
+def test_concat_attendance_tables_01():
+    table = create_attendance_table(TEST_TABLE_ATTENDANCE_INFOS_01)
+    result = concat_attendance_tables((table[2:], table[:1]))
+    expected = TEST_TABLE_ATTENDANCE_INFOS_01[2:] + TEST_TABLE_ATTENDANCE_INFOS_01[:1]
+    assert expected == tuple(result)
+    assert 0 == len(concat_attendance_tables(()))
+
+
+def test_concat_attendance_tables_02():
+    table = create_attendance_table(TEST_TABLE_ATTENDANCE_INFOS_01)
+    with pytest.raises(ValueError):
+        concat_attendance_tables((table, create_attendance_table(TEST_TABLE_ATTENDANCE_INFOS_01)))
+
+
+def test_partition_attendance_infos_01():
+    result = partition_attendance_infos(TEST_TABLE_ATTENDANCE_INFOS_01)
+    assert ['noway', 'iPhone'] == list(result)
+    assert (
+        TEST_TABLE_ATTENDANCE_INFOS_01[0], TEST_TABLE_ATTENDANCE_INFOS_01[2],
+        TEST_TABLE_ATTENDANCE_INFOS_01[3],
+    ) == result['noway']
+
+
+def test_merge_attendance_infos_01():
+    result = merge_attendance_infos(TEST_TABLE_ATTENDANCE_INFOS_01)
+    assert ['noway(鄂A)', 'iPhone(鄂B)', 'noway'] == list(result)
+    assert TEST_TABLE_ATTENDANCE_INFOS_01[::2] == result['noway(鄂A)']
+
+
+def test_partition_attendance_table_01():
+    result = partition_attendance_table(create_attendance_table(TEST_TABLE_ATTENDANCE_INFOS_01))
+    expected = partition_attendance_infos(TEST_TABLE_ATTENDANCE_INFOS_01)
+    assert list(expected) == list(result)
+    assert expected == {key: tuple(value) for key, value in result.items()}
+
+
+def test_create_attendance_table_03():
+    result = create_attendance_table(TEST_TABLE_ATTENDANCE_INFOS_01)
+    assert [0, 1, 2, 3] == result.row_ids.tolist()
+    assert [2, 3] == result[2:].row_ids.tolist()
+
+
+def test_select_attendance_rows_01():
+    table = create_attendance_table(TEST_TABLE_ATTENDANCE_INFOS_01)
+    result = select_attendance_rows(table, (table[3:], table[:1]))
+    assert [3, 0] == result.row_ids.tolist()
+    assert 2 == len(result)
+    assert (TEST_TABLE_ATTENDANCE_INFOS_01[3], TEST_TABLE_ATTENDANCE_INFOS_01[0]) == tuple(result)
+    assert TEST_TABLE_ATTENDANCE_INFOS_01[0] == result[1]
+    assert table.names == result.names
+    assert 0 == len(select_attendance_rows(table, ()))
+
+
+def test_summarize_grouped_attendance_times_03():
+    groups = list(
+        partition_attendance_table(create_attendance_table(TEST_TABLE_ATTENDANCE_INFOS_01)).values()
     )
-    expected = AttendanceInfo(
-        '中乾0人员1', '#中乾0人员1#', time(1, 1, 11), True
+    result = summarize_grouped_attendance_times(
+        TEST_MEETING_START_TIME, TEST_MEETING_END_TIME, groups
+    )
+    expected = summarize_grouped_attendance_times(
+        TEST_MEETING_START_TIME, TEST_MEETING_END_TIME, list(map(tuple, groups))
     )
     assert expected == result
+    assert timedelta(minutes=55) == result[1]
 
 
-def test_parse_attendance_overview_sheet_01():
-    result = parse_attendance_overview_sheet(
-        TEST_ATTENDANCE_WB_01[OVERVIEW_OF_MEMBER_ATTENDANCE]
-    )
-    expected = (
-        TEST_ATTENDANCE_INFO_01,
-        TEST_ATTENDANCE_INFO_03,
-        TEST_ATTENDANCE_INFO_04,
-        TEST_ATTENDANCE_INFO_02,
+def write_test_detail_csv_01(filepath, encoding: str):
+    with open(filepath, 'w', newline='', encoding=encoding) as file:
+        writer = csv.writer(file)
+        for row in create_test_detail_workbook_01().active.iter_rows(values_only=True):
+            writer.writerow(['' if value is None else value for value in row])
+        writer.writerow([])
+
+
+def test_detect_csv_encoding_01(tmp_path):
+    filepath = tmp_path / 'detail.csv'
+    write_test_detail_csv_01(filepath, 'utf-8-sig')
+    assert 'utf-8-sig' == detect_csv_encoding(str(filepath))
+    write_test_detail_csv_01(filepath, 'gb18030')
+    assert 'gb18030' == detect_csv_encoding(str(filepath))
+
+
+def test_iter_csv_rows_01(tmp_path):
+    filepath = tmp_path / 'rows.csv'
+    filepath.write_text('a,b,c\n\n,,x\nd\n', encoding='utf-8')
+    result = tuple(iter_csv_rows(str(filepath), min_row=1, min_col=2, max_col=3))
+    assert (('b', 'c'), (None, 'x'), (None, None)) == result
+
+
+def test_read_detail_csv_01(tmp_path):
+    filepath = tmp_path / 'detail.csv'
+    write_test_detail_csv_01(filepath, 'gb18030')
+    expected = tuple(
+        create_test_detail_workbook_01().active.iter_rows(
+            min_row=10, min_col=2, max_col=9, values_only=True
+        )
     )
-    assert expected == result
+    assert expected == tuple(read_detail_csv(str(filepath)))
+
+
+def test_parse_attendance_detail_file_02(tmp_path):
+    filepath = tmp_path / 'detail.CSV'
+    write_test_detail_csv_01(filepath, 'utf-8-sig')
+    result = tuple(parse_attendance_detail_file(str(filepath)))
+    assert TEST_DETAIL_ATTENDANCE_INFOS_01 == result
+
+
+def test_normalize_name_01():
+    assert '中乾1张三AB~!' == normalize_name('中乾 ０1-张三ＡＢ～！')
+
+
+def test_parse_normalized_fullname_01():
+    parse_normalized_fullname.cache_clear()
+    assert ('张三', '厦乾2张三') == parse_normalized_fullname('张三(厦门乾０2张三)')
+    assert ('张三', '厦乾2张三') == parse_normalized_fullname('张三(厦门乾０2张三)')
+    assert 1 == parse_normalized_fullname.cache_info().hits
@@ -1,16 +1,30 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+from concurrent.futures import ProcessPoolExecutor
+import importlib
+import json
+import os
+import pickle
+import subprocess
+import sys
 from functools import partial
 from operator import add, itemgetter
+from threading import Barrier
+from time import sleep
 
 import pytest
 
 from meeting_comm import (
-    DuplicateTarget, GraphRule, MissingTarget, assign_outputs,
-    calc_execute_rules, dispatch, eval_graph, eval_graph_rule, eval_refs,
-    identity, make_graph, pipe, starapply, target_matched, target_to_targets,
-    tuple_args, zip_refs_values,
+    AhoCorasick, DuplicateTarget, EvalGraphRuleError, GraphRule, MissingTarget,
+    PipeError, RuleCache, SidecarCache, StageProfiler, StageRecord, assign_outputs,
+    dump_stage_records, format_stage_records,
+    PIPE_TRACING, PipeTracer, disable_pipe_tracing, dump_pipe_trace, enable_pipe_tracing,
+    format_pipe_trace, size_bucket, trace_pipes, calc_execute_rules, compile_pipe,
+    constant, create_target_index, describe_callable, module_source_digest, dispatch, eval_graph, eval_graph_rule, eval_refs,
+    dict_hash_groupby, expand_hash_groupby, hash_groupby,
+    identity, is_pipe, make_graph, pipe, plan_execute_rules, side_effect,
+    starapply, target_matched, target_to_targets, tuple_args, zip_refs_values,
 )
 
 
@@ -230,3 +244,512 @@ def test_eval_graph_02():
     )
     expected = (0, 1, 1)
     assert expected == result
+
+
+def test_aho_corasick_01():
+    automaton = AhoCorasick((('he', 1), ('she', 2), ('his', 3), ('hers', 4)))
+    result = automaton.search('ushers')
+    assert {1, 2, 4} == result
+
+
+def test_aho_corasick_02():
+    automaton = AhoCorasick((('中乾1张三', 0), ('中乾1三', 0), ('中乾11李四', 1)))
+    result = automaton.search('中乾11李四')
+    assert {1} == result
+
+
+def test_aho_corasick_03():
+    automaton = AhoCorasick((('abc', 0),))
+    result = automaton.search('ab')
+    assert set() == result
+
+
+TEST_PIPE_01 = pipe(
+    partial(add, 1),
+    pipe(partial(add, 2), partial(map, pipe(identity, str, name='inner'))),
+    tuple,
+    name='outer',
+)
+
+
+def test_compile_pipe_01():
+    result = compile_pipe(pipe(tuple_args, sum))(1, 2, 3)
+    assert 6 == result
+
+
+def test_compile_pipe_02():
+    inner = pipe(list, len)
+    compiled = compile_pipe(pipe(partial(add, 1), inner, name='outer'))
+    with pytest.raises(PipeError) as ex:
+        compiled(1)
+    assert ('outer', 1) == ex.value.args
+    assert ((list, len), 0) == ex.value.__cause__.args
+    assert isinstance(ex.value.__cause__.__cause__, TypeError)
+
+
+def test_compile_pipe_03():
+    result = compile_pipe(
+        pipe(partial(map, pipe(partial(add, 1), str)), ','.join)
+    )((1, 2))
+    assert '2,3' == result
+
+
+def test_compile_pipe_04():
+    compiled = compile_pipe(TEST_PIPE_01)
+    assert not is_pipe(compiled)
+    assert TEST_PIPE_01 is compiled.__wrapped__
+    with pytest.raises(PipeError) as expected:
+        TEST_PIPE_01('a')
+    with pytest.raises(PipeError) as result:
+        compiled('a')
+    assert expected.value.args == result.value.args
+
+
+def test_compile_pipe_05():
+    compiled = compile_pipe(TEST_PIPE_01)
+    with pytest.raises(PipeError) as result:
+        compiled(None)
+    assert ('outer', 0) == result.value.args
+    assert isinstance(result.value.__cause__, TypeError)
+
+
+def test_make_graph_04():
+    result = make_graph(TEST_GRAPH_RULE_03, TEST_GRAPH_RULE_02_01)
+    expected = {
+        'output0': TEST_GRAPH_RULE_03,
+        'output1': TEST_GRAPH_RULE_03,
+        'target1': GraphRule(*TEST_GRAPH_RULE_02_01),
+    }
+    assert expected == result.target_index
+
+
+def test_create_target_index_01():
+    result = create_target_index(
+        (GraphRule('aaa', 'x', identity), GraphRule('aaa', 'y', identity))
+    )
+    assert {'aaa': GraphRule('aaa', 'x', identity)} == result
+
+
+def test_calc_execute_rules_04():
+    result = calc_execute_rules(('final',), tuple(TEST_GRAPH_02), {'input0': 0, 'input1': 1})
+    expected = tuple(TEST_GRAPH_02)
+    assert expected == result
+
+
+def test_plan_execute_rules_01():
+    graph = make_graph(
+        TEST_GRAPH_RULE_02_01, TEST_GRAPH_RULE_02_02, TEST_GRAPH_RULE_02_03,
+    )
+    result = plan_execute_rules(('target2',), graph, {'input1': 1})
+    assert result is plan_execute_rules(('target2',), graph, {'input1': 2})
+    assert 1 == len(graph.plans)
+    plan_execute_rules(('target2',), graph, {'target1': 1})
+    assert 2 == len(graph.plans)
+
+
+def test_eval_graph_03():
+    graph = make_graph(
+        TEST_GRAPH_RULE_02_01, TEST_GRAPH_RULE_02_02, TEST_GRAPH_RULE_02_03,
+    )
+    for value in range(3):
+        result = eval_graph(graph, 'final', (('input0', 0), ('input1', value)))
+        assert (0, value, value) == result
+    assert 1 == len(graph.plans)
+
+
+def test_eval_graph_04():
+    barrier = Barrier(2, timeout=5)
+    graph = make_graph(
+        ('left', 'input0', pipe(side_effect(lambda x: barrier.wait()), partial(add, 1))),
+        ('right', 'input1', pipe(side_effect(lambda x: barrier.wait()), partial(add, 2))),
+        ('final', ('left', 'right'), starapply(add)),
+    )
+    result = eval_graph(graph, 'final', (('input0', 0), ('input1', 1)), max_workers=2)
+    assert 4 == result
+
+
+def test_eval_graph_05():
+    rule = ('target2', 'target1', partial(add, 'x'))
+    graph = make_graph(TEST_GRAPH_RULE_02_01, rule, TEST_GRAPH_RULE_02_03)
+    with pytest.raises(EvalGraphRuleError) as ex:
+        eval_graph(graph, 'final', (('input0', 0), ('input1', 1)), max_workers=2)
+    assert (GraphRule(*rule),) == ex.value.args
+    assert isinstance(ex.value.__cause__, TypeError)
+
+
+def test_eval_graph_06():
+    graph = make_graph(
+        ('output0', 'input0', partial(add, 1)),
+        ('output1', 'input1', partial(add, 2)),
+        ('final', ('output0', 'output1'), sum),
+    )
+    result = eval_graph(
+        graph, 'final', (('input0', 0), ('input1', 1)),
+        max_workers=2, executor_class=ProcessPoolExecutor,
+    )
+    assert 4 == result
+
+
+TEST_RULE_CALLS = []
+
+
+def read_text(path: str) -> str:
+    TEST_RULE_CALLS.append(path)
+    with open(path, encoding='utf-8') as file:
+        return file.read()
+
+
+def create_counting_graph():
+    return make_graph(
+        ('content', 'path', read_text),
+        ('final', ('content', 'suffix'), starapply(add)),
+    )
+
+
+def test_describe_callable_01():
+    assert describe_callable(constant(1)) != describe_callable(constant(2))
+    assert describe_callable(pipe(identity, str)) == describe_callable(pipe(identity, str))
+    assert describe_callable(partial(add, 1)) != describe_callable(partial(add, 2))
+
+
+def test_describe_callable_02(tmp_path, monkeypatch):
+    """修改函数通过全局名称引用的辅助函数后，描述随之变化。"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module_path = tmp_path / 'test_describe_module.py'
+    module_path.write_text('def helper():\n    return 1\n\ndef action():\n    return helper()\n')
+    module = importlib.import_module('test_describe_module')
+    before = describe_callable(module.action)
+    module_path.write_text('def helper():\n    return 2\n\ndef action():\n    return helper()\n')
+    module_source_digest.cache_clear()
+    try:
+        assert before != describe_callable(importlib.reload(module).action)
+    finally:
+        module_source_digest.cache_clear()
+
+
+TEST_DESCRIBE_STABLE_MODULE = '''
+class Offset:
+    def __init__(self, value):
+        self.value = value
+
+    def add(self, values):
+        return [value + self.value for value in values]
+
+
+def action(values):
+    keep = lambda value: value in {'a', 'b', 'c'}
+    def inner(value):
+        return value * 2
+    return [inner(value) for value in values if keep(value)]
+
+
+OFFSET = Offset(1)
+'''
+
+TEST_DESCRIBE_STABLE_SCRIPT = '''
+import sys
+import test_describe_stable_module as module
+from meeting_comm import GraphRule, RuleCache, describe_callable
+cache = RuleCache(sys.argv[1])
+for action in (module.action, module.OFFSET.add, {'k': 1}.get):
+    print(cache.make_key(GraphRule('output', 'input', action), {'input': 'abc'}))
+'''
+
+
+def test_describe_callable_03(tmp_path, monkeypatch):
+    """嵌套代码对象和绑定方法的描述不含内存地址，其它进程中计算的缓存键一致。"""
+    (tmp_path / 'test_describe_stable_module.py').write_text(TEST_DESCRIBE_STABLE_MODULE)
+    script = tmp_path / 'describe.py'
+    script.write_text(TEST_DESCRIBE_STABLE_SCRIPT)
+    env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join((str(tmp_path), os.path.dirname(os.path.abspath(__file__)))),
+    }
+    keys = [
+        subprocess.run(
+            (sys.executable, str(script), str(tmp_path / 'cache')),
+            env={**env, 'PYTHONHASHSEED': seed}, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        for seed in ('1', '2')
+    ]
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module('test_describe_stable_module')
+    cache = RuleCache(tmp_path / 'cache')
+    expected = [
+        cache.make_key(GraphRule('output', 'input', action), {'input': 'abc'})
+        for action in (module.action, module.OFFSET.add, {'k': 1}.get)
+    ]
+    assert [expected, expected] == keys
+    assert describe_callable(module.OFFSET.add) != describe_callable(module.Offset(2).add)
+
+
+def test_rule_cache_01(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text('aaa')
+    cache = RuleCache(tmp_path / 'cache')
+    TEST_RULE_CALLS.clear()
+    pairs = (('path', str(path)), ('suffix', '!'))
+    assert 'aaa!' == eval_graph(create_counting_graph(), 'final', pairs, cache=cache)
+    assert (0, 2, 1) == (cache.hits, cache.misses, len(TEST_RULE_CALLS))
+    assert 'aaa!' == eval_graph(create_counting_graph(), 'final', pairs, cache=cache)
+    assert (2, 2, 1) == (cache.hits, cache.misses, len(TEST_RULE_CALLS))
+
+
+def test_rule_cache_02(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text('aaa')
+    cache = RuleCache(tmp_path / 'cache')
+    eval_graph(create_counting_graph(), 'final', (('path', str(path)), ('suffix', '!')), cache=cache)
+    result = eval_graph(
+        create_counting_graph(), 'final', (('path', str(path)), ('suffix', '?')),
+        max_workers=2, cache=cache,
+    )
+    assert 'aaa?' == result
+    assert (1, 3) == (cache.hits, cache.misses)
+    path.write_text('bbbb')
+    result = eval_graph(create_counting_graph(), 'final', (('path', str(path)), ('suffix', '?')), cache=cache)
+    assert 'bbbb?' == result
+    assert (1, 5) == (cache.hits, cache.misses)
+
+
+def test_rule_cache_03(tmp_path):
+    cache = RuleCache(tmp_path, max_bytes=0)
+    cache.store('key', 'value')
+    assert (False, None) == cache.load('key')
+    assert not tuple(tmp_path.glob('*.pickle'))
+
+
+def test_rule_cache_04(tmp_path):
+    """引用的类或模块已不存在的缓存视为未命中。"""
+    cache = RuleCache(tmp_path)
+    (tmp_path / 'class.pickle').write_bytes(b'cmeeting_comm\nNoSuchClass\n.')
+    (tmp_path / 'module.pickle').write_bytes(b'cno_such_module\nNoSuchClass\n.')
+    assert (False, None) == cache.load('class')
+    assert (False, None) == cache.load('module')
+    assert (0, 2) == (cache.hits, cache.misses)
+
+
+def test_rule_cache_05(tmp_path):
+    """总大小超过max_bytes时淘汰最久未使用的缓存。"""
+    size = len(pickle.dumps('a' * 100, pickle.HIGHEST_PROTOCOL))
+    cache = RuleCache(tmp_path, max_bytes=size * 2)
+    cache.store('key0', 'a' * 100)
+    os.utime(tmp_path / 'key0.pickle', ns=(0, 0))
+    cache.store('key1', 'b' * 100)
+    cache.store('key1', 'c' * 100)
+    assert 2 == len(tuple(tmp_path.glob('*.pickle')))
+    cache.store('key2', 'd' * 100)
+    assert ['key1.pickle', 'key2.pickle'] == sorted(path.name for path in tmp_path.glob('*.pickle'))
+    assert (True, 'c' * 100) == cache.load('key1')
+
+
+def test_sidecar_cache_01(tmp_path):
+    source = tmp_path / 'source.txt'
+    source.write_text('aaa')
+    calls = []
+    parse = lambda: calls.append(1) or source.read_text()
+    cache = SidecarCache(str(tmp_path / 'cache'))
+    assert 'aaa' == cache.get('source', str(source), parse)
+    cache.save()
+    cache = SidecarCache(str(tmp_path / 'cache'))
+    assert 'aaa' == cache.get('source', str(source), parse)
+    assert (1, 1, 1) == (cache.hits, cache.misses + 1, len(calls))
+    assert cache.changed is False
+
+
+def test_sidecar_cache_02(tmp_path):
+    source = tmp_path / 'source.txt'
+    source.write_text('aaa')
+    cache = SidecarCache(str(tmp_path / 'cache'))
+    cache.get('source', str(source), source.read_text)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert (True, 'aaa') == cache.lookup('source', str(source))
+    assert stat.st_mtime_ns + 10 ** 9 == cache.entries['source'].fingerprint.mtime_ns
+    source.write_text('bbb')
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10 ** 9))
+    assert 'bbb' == cache.get('source', str(source), source.read_text)
+    assert (1, 2) == (cache.hits, cache.misses)
+
+
+def test_sidecar_cache_03(tmp_path):
+    source = tmp_path / 'source.txt'
+    source.write_text('aaa')
+    (tmp_path / 'cache').write_bytes(b'broken')
+    cache = SidecarCache(str(tmp_path / 'cache'))
+    assert {} == cache.entries
+    cache.get('source', str(source), source.read_text)
+    cache.save()
+    assert {} == SidecarCache(str(tmp_path / 'cache'), version=2).entries
+    assert 'source' in SidecarCache(str(tmp_path / 'cache')).entries
+
+
+def test_stage_profiler_01():
+    with StageProfiler() as profiler:
+        assert [0] * 1000 == profiler.run('create', list, [0] * 1000)
+        assert 3 == profiler.run('add', add, 1, 2)
+    assert ('create', 1000) == (profiler.records[0].stage, profiler.records[0].count)
+    assert profiler.records[0].peak_bytes > 0
+    assert ('add', None) == (profiler.records[1].stage, profiler.records[1].count)
+
+
+def test_stage_profiler_02():
+    profiler = StageProfiler(enabled=False)
+    with profiler:
+        assert 3 == profiler.run('add', add, 1, 2)
+    assert [] == profiler.records
+
+
+def test_format_stage_records_01():
+    records = (
+        StageRecord('load', 1.5, 2 * 1024 * 1024, 1024 * 1024, 10),
+        StageRecord('save', 0.25, 0, 0, None),
+    )
+    result = format_stage_records(records).splitlines()
+    assert 4 == len(result)
+    assert result[1].split() == ['load', '1.500', '2.00', '1.00', '10']
+    assert result[2].split() == ['save', '0.250', '0.00', '0.00', '-']
+    assert result[3].split() == ['合计', '1.750']
+
+
+def test_dump_stage_records_01(tmp_path):
+    filepath = str(tmp_path / 'profile.jsonl')
+    records = (StageRecord('load', 1.5, 2, 1, 10),)
+    dump_stage_records(records, filepath, meeting='冬至')
+    dump_stage_records(records, filepath, meeting='小寒')
+    with open(filepath, encoding='utf-8') as file:
+        result = list(map(json.loads, file))
+    assert ['冬至', '小寒'] == [line['meeting'] for line in result]
+    assert [records[0]._asdict()] == result[0]['stages']
+
+
+def test_size_bucket_01():
+    assert [None, None, '0', '1-9', '10-99', '1000-9999', 'unsized'] == [
+        size_bucket(1), size_bucket('abc'), size_bucket(()), size_bucket([1]),
+        size_bucket(range(10)), size_bucket(range(1000)), size_bucket(iter(())),
+    ]
+
+
+def test_pipe_tracer_01():
+    tracer = PipeTracer()
+    outer = lambda values: tracer.call('inner', tuple, (values,), {})
+    assert 3 == tracer.call('add', add, (1, 2), {})
+    assert (1, 2) == tracer.call('outer', outer, ([1, 2],), {})
+    assert () == tracer.call('inner', tuple, ((),), {})
+    assert (1, 1, 2) == tuple(tracer.stats[name].calls for name in ('add', 'outer', 'inner'))
+    assert {} == tracer.stats['add'].input_sizes
+    assert {'1-9': 1, '0': 1} == tracer.stats['inner'].input_sizes
+    assert tracer.stats['outer'].self_seconds <= tracer.stats['outer'].total_seconds
+    result = format_pipe_trace(tracer).splitlines()
+    assert 4 == len(result)
+    rows = {line.split()[0]: line.split()[1:] for line in result[1:]}
+    assert ['1'] == rows['add'][:1] and 3 == len(rows['add'])
+    assert ['1', '1-9:1'] == [rows['outer'][0], *rows['outer'][3:]]
+    assert ['2', '1-9:1', '0:1'] == [rows['inner'][0], *rows['inner'][3:]]
+
+
+def iter_slow_values(count: int):
+    for value in range(count):
+        sleep(0.01)
+        yield value
+
+
+TEST_TRACE_SLOW_PIPE = pipe(iter_slow_values, name='slow')
+TEST_TRACE_CONSUME_PIPE = pipe(TEST_TRACE_SLOW_PIPE, tuple, name='consume')
+
+
+def test_pipe_tracer_02():
+    """返回生成器的管道，消费时取每一项的耗时计入该管道。"""
+    with trace_pipes() as tracer:
+        result = TEST_TRACE_SLOW_PIPE(3)
+        assert 0.01 > tracer.stats['slow'].total_seconds
+        assert (0, 1, 2) == tuple(result)
+        assert (0, 1) == TEST_TRACE_CONSUME_PIPE(2)
+    slow, consume = tracer.stats['slow'], tracer.stats['consume']
+    assert (2, 1) == (slow.calls, consume.calls)
+    assert 0.05 <= slow.self_seconds <= slow.total_seconds
+    assert 0.02 <= consume.total_seconds
+    assert consume.self_seconds < 0.02
+
+
+def test_pipe_tracer_03():
+    """文件等非内置迭代器原样返回。"""
+    tracer = PipeTracer()
+    with open(__file__, encoding='utf-8') as file:
+        assert file is tracer.call('open', identity, (file,), {})
+    assert (1, 2) == tuple(tracer.call('map', map, (int, '12'), {}))
+
+
+TEST_TRACE_INNER_PIPE = pipe(partial(map, str), tuple, name='inner')
+TEST_TRACE_OUTER_PIPE = pipe(tuple, TEST_TRACE_INNER_PIPE, ','.join, name='outer')
+
+
+def test_trace_pipes_01():
+    assert PIPE_TRACING.tracer is None
+    with trace_pipes() as tracer:
+        assert '1,2' == TEST_TRACE_OUTER_PIPE([1, 2])
+        assert '' == TEST_TRACE_OUTER_PIPE(())
+        assert ('0',) == TEST_TRACE_INNER_PIPE(range(1))
+    assert PIPE_TRACING.tracer is None
+    outer, inner = tracer.stats['outer'], tracer.stats['inner']
+    assert (2, 3) == (outer.calls, inner.calls)
+    assert {'1-9': 1, '0': 1} == outer.input_sizes
+    assert {'1-9': 2, '0': 1} == inner.input_sizes
+    assert outer.self_seconds <= outer.total_seconds
+    assert {'outer', 'inner'} == {item['name'] for item in tracer.report()}
+
+
+def test_trace_pipes_02():
+    with trace_pipes(False) as tracer:
+        TEST_TRACE_OUTER_PIPE([1])
+    assert tracer is None
+
+
+def test_trace_pipes_03():
+    compiled = compile_pipe(TEST_TRACE_OUTER_PIPE)
+    tracer = enable_pipe_tracing()
+    try:
+        assert '1,2' == compiled([1, 2])
+    finally:
+        assert tracer is disable_pipe_tracing()
+    assert (1, 1) == (tracer.stats['outer'].calls, tracer.stats['inner'].calls)
+    compiled([1, 2])
+    assert 1 == tracer.stats['outer'].calls
+
+
+def test_trace_pipes_04():
+    with trace_pipes() as tracer:
+        with pytest.raises(PipeError) as ex:
+            TEST_TRACE_OUTER_PIPE(None)
+    assert ('outer', 0) == ex.value.args
+    assert 1 == tracer.stats['outer'].calls
+
+
+def test_format_pipe_trace_01(tmp_path):
+    with trace_pipes() as tracer:
+        TEST_TRACE_OUTER_PIPE([1, 2])
+    result = format_pipe_trace(tracer).splitlines()
+    assert 3 == len(result)
+    assert '1-9:1' == result[1].split()[-1] or '1-9:1' == result[2].split()[-1]
+    filepath = tmp_path / 'trace.json'
+    dump_pipe_trace(tracer, str(filepath))
+    assert tracer.report() == json.loads(filepath.read_text(encoding='utf-8'))
+
+
+def test_hash_groupby_01():
+    result = hash_groupby('abAcBa', str.lower)
+    assert [('a', ['a', 'A', 'a']), ('b', ['b', 'B']), ('c', ['c'])] == list(result)
+    assert [] == list(hash_groupby((), str.lower))
+
+
+def test_expand_hash_groupby_01():
+    result = expand_hash_groupby(iter([3, 1, 4, 1, 5, 9, 2, 6]), lambda value: value % 2)
+    assert [(1, (3, 1, 1, 5, 9)), (0, (4, 2, 6))] == list(result)
+
+
+def test_dict_hash_groupby_01():
+    team_mapping = {'中乾': '区域1', '中坤': '区域2', '中离': '区域1'}
+    result = dict_hash_groupby(
+        {'中乾': 1, '中坤': 2, '中离': 3}.items(), lambda item: team_mapping[item[0]]
+    )
+    assert [('区域1', {'中乾': 1, '中离': 3}), ('区域2', {'中坤': 2})] == list(result)
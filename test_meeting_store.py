@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from meeting_store import (
+    MEETING_STORE_MIGRATIONS, MEETING_STORE_VERSION,
+    AbsentCount, AttendanceRow, MeetingRecord, MeetingStore, MeetingStoreVersionError,
+    PersonMatch, PersonResult,
+    get_meeting_key, get_meeting_store_filepath, iter_batches,
+)
+
+
+TEST_MEETING_RECORDS_01 = (
+    MeetingRecord('1.冬至', '冬至', datetime(2024, 12, 21, 19, 0, 0), 120),
+    MeetingRecord('2.小寒', '小寒', datetime(2025, 1, 5, 19, 0, 0), 120),
+)
+
+TEST_PERSON_RESULTS_01 = (
+    (
+        PersonResult('张三', '中乾', 1, '区域1', 7200, True),
+        PersonResult('李四', '中乾', 2, '区域1', 0, False),
+        PersonResult('王五', '中坤', 1, '区域2', 600, False),
+    ),
+    (
+        PersonResult('张三', '中乾', 1, '区域1', 0, False),
+        PersonResult('李四', '中乾', 2, '区域1', 0, False),
+        PersonResult('王五', '中坤', 1, '区域2', 7200, True),
+    ),
+)
+
+
+def create_test_meeting_store_01(filepath: str) -> MeetingStore:
+    store = MeetingStore(filepath)
+    for record, results in zip(TEST_MEETING_RECORDS_01, TEST_PERSON_RESULTS_01):
+        store.save_meeting(record, results)
+    return store
+
+
+def test_get_meeting_store_filepath_01(tmp_path):
+    meeting = str(tmp_path / '1.冬至')
+    assert str(tmp_path / '考勤结果.db') == get_meeting_store_filepath(meeting)
+    assert '1.冬至' == get_meeting_key(meeting + '/')
+
+
+def test_meeting_store_01(tmp_path):
+    with create_test_meeting_store_01(str(tmp_path / '考勤结果.db')) as store:
+        assert list(TEST_MEETING_RECORDS_01) == store.list_meetings()
+        assert [
+            AbsentCount(('中乾', 1, '张三'), 2, 1),
+            AbsentCount(('中乾', 2, '李四'), 2, 2),
+            AbsentCount(('中坤', 1, '王五'), 2, 1),
+        ] == store.count_person_absences()
+        assert [
+            AbsentCount(('区域1', '中乾'), 4, 3),
+            AbsentCount(('区域2', '中坤'), 2, 1),
+        ] == store.count_team_absences()
+        assert [
+            AbsentCount(('区域1',), 4, 3),
+            AbsentCount(('区域2',), 2, 1),
+        ] == store.count_zone_absences()
+
+
+def test_meeting_store_02(tmp_path):
+    """until只统计开始时间不晚于它的节气。"""
+    with create_test_meeting_store_01(str(tmp_path / '考勤结果.db')) as store:
+        until = TEST_MEETING_RECORDS_01[0].start_time
+        assert TEST_MEETING_RECORDS_01[:1] == tuple(store.list_meetings(until))
+        assert [
+            AbsentCount(('区域1',), 2, 1),
+            AbsentCount(('区域2',), 1, 1),
+        ] == store.count_zone_absences(until)
+
+
+def test_meeting_store_03(tmp_path):
+    """重新保存节气时替换原有结果。"""
+    with create_test_meeting_store_01(str(tmp_path / '考勤结果.db')) as store:
+        store.save_meeting(TEST_MEETING_RECORDS_01[1], TEST_PERSON_RESULTS_01[0][:1])
+        assert [
+            AbsentCount(('中乾', 1, '张三'), 2, 0),
+            AbsentCount(('中乾', 2, '李四'), 1, 1),
+            AbsentCount(('中坤', 1, '王五'), 1, 1),
+        ] == store.count_person_absences()
+
+
+def test_meeting_store_04(tmp_path):
+    """版本高于程序支持的数据库报错，且不改动数据。"""
+    filepath = str(tmp_path / '考勤结果.db')
+    create_test_meeting_store_01(filepath).close()
+    connection = sqlite3.connect(filepath)
+    connection.execute(f'PRAGMA user_version = {MEETING_STORE_VERSION + 1}')
+    connection.close()
+    with pytest.raises(MeetingStoreVersionError):
+        MeetingStore(filepath)
+    connection = sqlite3.connect(filepath)
+    assert (2,) == connection.execute('SELECT COUNT(*) FROM meetings').fetchone()
+    connection.close()
+
+
+def test_iter_batches_01():
+    assert [[0, 1], [2, 3], [4]] == list(iter_batches(range(5), 2))
+    assert [] == list(iter_batches((), 2))
+
+
+def create_test_attendance_row(row_id: int, nickname: str, meeting_name: str) -> AttendanceRow:
+    return AttendanceRow(
+        row_id, nickname, meeting_name, f'{meeting_name}({nickname})',
+        datetime(2024, 12, 21, 18, 50, 0), datetime(2024, 12, 21, 19, 30, 0),
+        datetime(2024, 12, 21, 19, 0, 0), datetime(2024, 12, 21, 19, 30, 0),
+    )
+
+
+def test_meeting_store_archive_01(tmp_path):
+    with create_test_meeting_store_01(str(tmp_path / '考勤结果.db')) as store:
+        store.archive_meeting(
+            '1.冬至',
+            (
+                create_test_attendance_row(0, '中乾1张三', '张三'),
+                create_test_attendance_row(1, '李四', 'iPhone'),
+                create_test_attendance_row(2, '王五', '王五'),
+                create_test_attendance_row(3, '中坤1王五', '王五'),
+            ),
+            (
+                PersonMatch('张三', '中乾', 1, '张三'),
+                PersonMatch('李四', '中乾', 2, 'iPhone'),
+                PersonMatch('王五', '中坤', 1, '王五'),
+            ),
+            batch_size=3,
+        )
+        assert [('中乾', 2, '李四')] == store.list_unrenamed_people()
+        assert [] == store.list_unrenamed_people(datetime(2024, 1, 1))
+        assert ('2024-12-21T19:00:00',) == store.connection.execute(
+            'SELECT clipped_enter_time FROM attendance_rows WHERE row_id = 3'
+        ).fetchone()
+
+        store.save_meeting(TEST_MEETING_RECORDS_01[0], TEST_PERSON_RESULTS_01[0][:2])
+        assert [('中乾', 2, '李四')] == store.list_unrenamed_people()
+        assert (2,) == store.connection.execute(
+            'SELECT COUNT(*) FROM person_results WHERE meeting = ?', ('1.冬至',)
+        ).fetchone()
+
+        store.connection.execute('DELETE FROM meetings WHERE meeting = ?', ('1.冬至',))
+        assert [] == store.list_unrenamed_people()
+
+
+def test_meeting_store_05(tmp_path):
+    """旧版本的数据库升级时保留统计结果。"""
+    filepath = str(tmp_path / '考勤结果.db')
+    connection = sqlite3.connect(filepath)
+    connection.executescript(MEETING_STORE_MIGRATIONS[0])
+    connection.execute('PRAGMA user_version = 1')
+    connection.execute(
+        "INSERT INTO meetings VALUES ('1.冬至', '冬至', '2024-12-21T19:00:00', 120)"
+    )
+    connection.execute(
+        "INSERT INTO person_results VALUES ('1.冬至', '张三', '中乾', 1, '区域1', 0, 0)"
+    )
+    connection.commit()
+    connection.close()
+    with MeetingStore(filepath) as store:
+        assert (MEETING_STORE_VERSION,) == store.connection.execute(
+            'PRAGMA user_version'
+        ).fetchone()
+        assert [AbsentCount(('中乾', 1, '张三'), 1, 1)] == store.count_person_absences()
+        assert [] == store.list_unrenamed_people()
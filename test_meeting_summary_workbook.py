@@ -1,563 +1,519 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from datetime import time
-from functools import partial
-from itertools import islice
-from operator import attrgetter, itemgetter
-from pprint import pprint
+import pickle
+from argparse import Namespace
+from datetime import datetime, timedelta
+from itertools import chain
 
 import pytest
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import PatternFill
 
-from meeting_comm import Cell, cross, pipe, swap_args
+from meeting_comm import NULL_PROFILER, PipeError
+from meeting_store import MeetingRecord, MeetingStore, PersonResult
 from meeting_attendance_workbook import (
-    AttendanceInfo, create_origin_attendance_info
+    AttendanceInfo, create_attendance_table, partition_attendance_table,
 )
 from meeting_summary_workbook import (
-    GET_NAME_ERROR, GET_GROUP_ERROR, GET_TEAM_ERROR, GET_NUMBER_ERROR,
-    MEETING_INFO_SHEET_NAME, PEOPLE_SHEET_NAME,
-    MeetingInfo,
-    ParsePersonnelInfoError, PersoneelInfo, TeamAttendanceInfo, TeamLocation,
-    contains_formal_name,
-    filter_infos_by_group_team,
-    filter_unmatched_attendance_infos,
-    generate_present_commands,
-    generate_team_commands,
-    generate_title_command,
-    get_group_teams_by_personeel_infos,
-    get_groups_by_personeel_infos,
-    group_attendance_sheet_to_team_locations,
-    group_infos_by_group,
-    group_infos_by_team,
-    is_enough_attendance_time,
-    is_person_present,
-    item_extract,
-    calc_group_attendance_infos,
+    MEETING_INFO_SHEET_NAME, MISMATCHED_SHEET_NAME, PEOPLE_SHEET_NAME, TEAM_MAPPING_SHEET_NAME,
+    MeetingInfo, MeetingWatcher, TOTAL_ABSENT_SHEET_NAME, TOTAL_ABSENT_SHEET_FIRST_LINE,
+    stat_absent,
+    PersoneelInfo, StatAttendanceInfos,
+    create_personeel_info, create_personeel_name_index, overlapped, search_formal_names,
+    expand_meeting_dirs, natural_sort_key, open_meeting_cache, stat_time_worker,
+    store_meeting_results,
+    stat_mismatched_attendance_infos,
+    PersoneelAttendanceInfo,
+    classify_meeting_attendance_infos, classify_team_attendance_infos,
+    classify_zone_attendance_infos,
+    FILL_STYLE_NAMES, RED_FONT, FillCommand,
+    do_fill_worksheet_commands, fill_worksheet_command, group_fill_commands,
     parse_meeting_info,
     parse_meeting_info_sheet,
     parse_personnel_info, parse_people_sheet,
-    partition_by_time,
-    partition_infos,
-    partition_present,
-    partition_present_personeel_infos,
-)
-from test_meeting_attendance_workbook import (
-    TEST_ATTENDANCE_INFO_01, TEST_ATTENDANCE_INFO_01_01,
-    TEST_ATTENDANCE_INFO_02, TEST_ATTENDANCE_INFO_03, TEST_ATTENDANCE_INFO_04,
-    get_test_attendance_infos_01
 )
 
 
 def test_parse_personnel_info_01():
-    row = (
-        Cell(1), Cell('无门'), Cell('元'), Cell('中乾'),
-        Cell('中乾0'), Cell('组长')
-    )
-    result = parse_personnel_info(row)
-    expected = PersoneelInfo(name='无门', group='元', team='中乾', number=0)
-    assert expected == result
+    result = parse_personnel_info(('无门', '元', '中乾', 0))
+    assert PersoneelInfo('无门', '中乾', 0) == result
 
 
 def test_parse_personnel_info_02():
-    row = (
-        Cell(1), Cell('无门'), Cell('元'), Cell('中乾'),
-        Cell('中乾'), Cell('组长')
-    )
-    with pytest.raises(ParsePersonnelInfoError) as exp:
-        parse_personnel_info(row)
-
-    assert GET_NUMBER_ERROR == str(exp.value)
-
-
-def test_parse_personnel_info_03():
-    row = (
-        Cell(1), Cell(''), Cell('元'), Cell('中乾'),
-        Cell('中乾0'), Cell('组长')
-    )
-    with pytest.raises(ParsePersonnelInfoError) as exp:
-        parse_personnel_info(row)
-
-    assert GET_NAME_ERROR == str(exp.value)
-
-
-def test_parse_personnel_info_04():
-    row = (
-        Cell(1), Cell('无门'), Cell(''), Cell('中乾'),
-        Cell('中乾0'), Cell('组长')
-    )
-    with pytest.raises(ParsePersonnelInfoError) as exp:
-        parse_personnel_info(row)
-
-    assert GET_GROUP_ERROR == str(exp.value)
-
-
-def test_parse_personnel_info_05():
-    row = (
-        Cell(1), Cell('无门'), Cell('元'), Cell(''),
-        Cell('中乾0'), Cell('组长')
-    )
-    with pytest.raises(ParsePersonnelInfoError) as exp:
-        parse_personnel_info(row)
-
-    assert GET_TEAM_ERROR == str(exp.value)
-
-
-TEST_GROUP_NAME_01 = '大组0'
-TEST_GROUP_NAME_02 = '大组1'
+    with pytest.raises(ValueError):
+        parse_personnel_info(('无门', '元', '中乾', '中乾0'))
 
 
 def create_test_summary_workbook_01() -> Workbook:
     wb = Workbook()
     ws = wb.active
     ws.title = PEOPLE_SHEET_NAME
-    ws.cell(row=1, column=1, value='序号')
-    ws.cell(row=1, column=2, value='姓名')
-    ws.cell(row=1, column=3, value='大组')
-    ws.cell(row=1, column=4, value='小组')
-    ws.cell(row=1, column=5, value='编号')
-    ws.cell(row=1, column=6, value='组长')
-    ws.cell(row=1, column=7, value='退出')
-
-    ws.cell(row=2, column=1, value=1)
-    ws.cell(row=2, column=2, value='人员1')
-    ws.cell(row=2, column=3, value='大组0')
-    ws.cell(row=2, column=4, value='中乾')
-    ws.cell(row=2, column=5, value='小组编号0')
-    ws.cell(row=2, column=6, value='组长')
-
-    ws.cell(row=3, column=1, value=2)
-    ws.cell(row=3, column=2, value='人员2')
-    ws.cell(row=3, column=3, value='大组0')
-    ws.cell(row=3, column=4, value='中乾')
-    ws.cell(row=3, column=5, value='小组编号1')
-
-    ws.cell(row=4, column=1, value=3)
-    ws.cell(row=4, column=2, value='人员3')
-    ws.cell(row=4, column=3, value='大组0')
-    ws.cell(row=4, column=4, value='中乾')
-    ws.cell(row=4, column=5, value='小组编号2')
-
-    ws.cell(row=5, column=1, value=4)
-    ws.cell(row=5, column=2, value='人员4')
-    ws.cell(row=5, column=3, value='大组0')
-    ws.cell(row=5, column=4, value='中坤')
-    ws.cell(row=5, column=5, value='小组编号0')
-    ws.cell(row=5, column=6, value='组长')
-
-    ws.cell(row=6, column=1, value=5)
-    ws.cell(row=6, column=2, value='人员5')
-    ws.cell(row=6, column=3, value='大组0')
-    ws.cell(row=6, column=4, value='中坤')
-    ws.cell(row=6, column=5, value='小组编号1')
-
-    ws.cell(row=7, column=1, value=6)
-    ws.cell(row=7, column=2, value='')
-    ws.cell(row=7, column=3, value='大组0')
-    ws.cell(row=7, column=4, value='中坤')
-    ws.cell(row=7, column=5, value='小组编号2')
-
-    ws.cell(row=8, column=1, value=7)
-    ws.cell(row=8, column=2, value='人员7')
-    ws.cell(row=8, column=3, value='大组1')
-    ws.cell(row=8, column=4, value='上乾')
-    ws.cell(row=8, column=5, value='小组编号0')
-    ws.cell(row=8, column=6, value='组长')
-
-    ws.cell(row=9, column=1, value=8)
-    ws.cell(row=9, column=2, value='')
-    ws.cell(row=9, column=3, value='大组1')
-    ws.cell(row=9, column=4, value='中乾')
-    ws.cell(row=9, column=5, value='小组编号1')
-
-    ws.cell(row=10, column=1, value=9)
-    ws.cell(row=10, column=2, value=None)
-    ws.cell(row=10, column=3, value='大组1')
-    ws.cell(row=10, column=4, value='中乾')
-    ws.cell(row=10, column=5, value='小组编号2')
+    ws.append(['序号', '姓名', '大组', '小组', '编号'])
+    ws.append([1, '人员1', '大组0', '中乾', 0])
+    ws.append([2, '人员2', '大组0', '中乾', 1])
+    ws.append([3, '', '大组0', '中坤', 0])
+    ws.append([4, None, '大组0', '中坤', 1])
+    ws.append([5, '人员5', '大组1', '上乾', 0])
 
     ws = wb.create_sheet(MEETING_INFO_SHEET_NAME)
-    ws.cell(row=1, column=1, value='节气名')
-    ws.cell(row=1, column=2, value='冬至')
-    ws.cell(row=2, column=1, value='会议总时长')
-    ws.cell(row=2, column=2, value='75')
-
-    ws = wb.create_sheet(TEST_GROUP_NAME_01)
-    ws.cell(row=1, column=1, value='中乾组（3人）')
-    ws.cell(row=1, column=2, value='序号')
-    ws.cell(row=1, column=3, value='用户入会昵称')
-    ws.cell(row=1, column=4, value='累计参会时长')
-    ws.cell(row=2, column=1, value='')
-    ws.cell(row=2, column=2, value='')
-    ws.cell(row=2, column=3, value='')
-    ws.cell(row=2, column=4, value='')
-    ws.cell(row=3, column=1, value='')
-    ws.cell(row=3, column=2, value='')
-    ws.cell(row=3, column=3, value='')
-    ws.cell(row=3, column=4, value='')
-    ws.cell(row=4, column=1, value='')
-    ws.cell(row=4, column=2, value='')
-    ws.cell(row=4, column=3, value='')
-    ws.cell(row=4, column=4, value='')
-
-    ws.cell(row=5, column=1, value='中坤组（3人）')
-    ws.cell(row=5, column=2, value='序号')
-    ws.cell(row=5, column=3, value='用户入会昵称')
-    ws.cell(row=5, column=4, value='累计参会时长')
-
+    ws.append(['节气名', '冬至'])
+    ws.append(['会议开始时间', datetime(2024, 12, 21, 19, 0, 0)])
+    ws.append(['会议结束时间', datetime(2024, 12, 21, 20, 15, 0)])
     return wb
 
 
 TEST_SUMMARY_WB_01 = create_test_summary_workbook_01()
 
-TEST_PERSONEEL_INFO_01 = PersoneelInfo(
-    name='人员1', group='大组0', team='中乾', number=0
-)
-TEST_PERSONEEL_INFO_02 = PersoneelInfo(
-    name='人员2', group='大组0', team='中乾', number=1
-)
-TEST_PERSONEEL_INFO_03 = PersoneelInfo(
-    name='人员3', group='大组0', team='中乾', number=2
-)
-TEST_PERSONEEL_INFO_04 = PersoneelInfo(
-    name='人员4', group='大组0', team='中坤', number=0
-)
-TEST_PERSONEEL_INFO_05 = PersoneelInfo(
-    name='人员5', group='大组0', team='中坤', number=1
-)
-TEST_PERSONEEL_INFO_07 = PersoneelInfo(
-    name='人员7', group='大组1', team='上乾', number=0
-)
 
-TEST_MEETING_INFO_01 = parse_meeting_info_sheet(
-    TEST_SUMMARY_WB_01[MEETING_INFO_SHEET_NAME]
-)
+def test_parse_people_sheet_01():
+    result = parse_people_sheet(TEST_SUMMARY_WB_01[PEOPLE_SHEET_NAME])
+    expected = (
+        PersoneelInfo('人员1', '中乾', 0),
+        PersoneelInfo('人员2', '中乾', 1),
+        PersoneelInfo('人员5', '上乾', 0),
+    )
+    assert expected == result
 
-TEST_GROUP_ATTENDANCE_SHEET_01 = TEST_SUMMARY_WB_01[TEST_GROUP_NAME_01]
 
-# TEST_TEAM_ATTENDANCES_01 = {
-#     '中乾': (('大组0', '中乾'), (), (), ()),
-#     '中坤': (('大组0', '中坤'), (), (), ()),
-# }
+def test_parse_meeting_info_01():
+    result = parse_meeting_info(('节气名', '冬至'))
+    expected = ('solar_term', '冬至')
+    assert expected == result
 
-TEST_TEAM_ATTENDANCE_INFO_01 = TeamAttendanceInfo(
-    ('大组0', '中乾'),
-    ((TEST_PERSONEEL_INFO_03, TEST_ATTENDANCE_INFO_03),),
-    ((TEST_PERSONEEL_INFO_01, TEST_ATTENDANCE_INFO_01),),
-    (TEST_PERSONEEL_INFO_02,),
-)
 
-TEST_TEAM_ATTENDANCE_INFO_02 = TeamAttendanceInfo(
-    ('大组0', '中坤'),
-    ((TEST_PERSONEEL_INFO_04, TEST_ATTENDANCE_INFO_04),),
-    (),
-    (TEST_PERSONEEL_INFO_05,),
-)
+def test_parse_meeting_info_02():
+    with pytest.raises(PipeError):
+        parse_meeting_info(('未知', '冬至'))
 
-TEST_TEAM_ATTENDANCE_INFOS_01 = {
-    '中乾': TEST_TEAM_ATTENDANCE_INFO_01,
-    '中坤': TEST_TEAM_ATTENDANCE_INFO_02,
-}
 
-TEST_TEAM_LOCATION_01 = TeamLocation('中乾', 1)
+def test_parse_meeting_info_sheet_01():
+    result = parse_meeting_info_sheet(TEST_SUMMARY_WB_01[MEETING_INFO_SHEET_NAME])
+    expected = MeetingInfo(
+        '冬至', datetime(2024, 12, 21, 19, 0, 0), datetime(2024, 12, 21, 20, 15, 0), 75, 50
+    )
+    assert expected == result
 
 
-get_test_personeel_infos_01 = pipe(
-    partial(
-        parse_people_sheet, TEST_SUMMARY_WB_01[PEOPLE_SHEET_NAME]
-    ),
-    itemgetter(0),
+TEST_MATCH_PERSONEEL_INFOS_01 = (
+    create_personeel_info('张三丰', '中乾', 1),
+    create_personeel_info('李四', '中乾', 11),
+    create_personeel_info('王五', '中坤', 0),
 )
 
 
-def test_contains_formal_name_01():
-    result = contains_formal_name((
-        TEST_PERSONEEL_INFO_01, TEST_ATTENDANCE_INFO_01
-    ))
-    assert result is True
+def create_test_match_attendance_info(nickname: str, meeting_name: str) -> AttendanceInfo:
+    return AttendanceInfo(
+        nickname, meeting_name, f'{meeting_name}({nickname})',
+        datetime(2024, 1, 1, 0, 0, 0), datetime(2024, 1, 1, 0, 30, 0),
+    )
 
 
-def test_contains_formal_name_02():
-    result = contains_formal_name((
-        TEST_PERSONEEL_INFO_01, TEST_ATTENDANCE_INFO_01_01
-    ))
-    assert result is True
+TEST_MATCH_ATTENDANCE_TABLE_01 = create_attendance_table((
+    create_test_match_attendance_info('中乾1三丰', ''),
+    create_test_match_attendance_info('ZK0王五', '王五'),
+    create_test_match_attendance_info('中乾11', ''),
+    create_test_match_attendance_info('乾李四', 'iPhone'),
+    create_test_match_attendance_info('无名', '路人'),
+))
 
 
-def test_contains_formal_name_03():
-    result = contains_formal_name((
-        TEST_PERSONEEL_INFO_01, TEST_ATTENDANCE_INFO_02
-    ))
-    assert result is False
+TEST_MATCH_ATTENDANCE_INFOS_01 = partition_attendance_table(TEST_MATCH_ATTENDANCE_TABLE_01)
 
 
-def test_parse_people_sheet_01():
-    result = parse_people_sheet(TEST_SUMMARY_WB_01[PEOPLE_SHEET_NAME])
-    expected = (
-        (
-            TEST_PERSONEEL_INFO_01,
-            TEST_PERSONEEL_INFO_02,
-            TEST_PERSONEEL_INFO_03,
-            TEST_PERSONEEL_INFO_04,
-            TEST_PERSONEEL_INFO_05,
-            TEST_PERSONEEL_INFO_07,
-        ),
-        ((0, '中乾'), (1, '中坤'), (2, '上乾'), (3, '中乾')),
-    )
-    assert expected == result
+def test_create_personeel_name_index_01():
+    result = create_personeel_name_index(TEST_MATCH_PERSONEEL_INFOS_01)
+    assert {0} == result.formal_names.search('中乾1张三丰')
+    assert (1,) == result.team_numbers['中乾11']
+    assert (2,) == result.names['王五']
 
 
-def test_is_person_present_01():
-    result = is_person_present((
-        PersoneelInfo(name='人员1', group='大组0', team='中乾', number=0),
-        get_test_attendance_infos_01()
-    ))
-    assert result is True
+def test_search_formal_names_01():
+    name_index = create_personeel_name_index(TEST_MATCH_PERSONEEL_INFOS_01)
+    assert {0} == search_formal_names(name_index, '中乾1张三丰')
+    assert {0} == search_formal_names(name_index, 'ZQ1张三丰')
+    assert {0, 1} == search_formal_names(name_index, '中乾1张三丰中乾11李四')
+    assert set() == search_formal_names(name_index, '路人')
 
 
-def test_is_person_present_02():
-    result = is_person_present((
-        PersoneelInfo(name='人员7', group='大组1', team='上乾', number=0),
-        get_test_attendance_infos_01()
+def test_search_formal_names_02():
+    """正式名称包含他人的正式名称时，与子串匹配的结果一致。"""
+    name_index = create_personeel_name_index((
+        create_personeel_info('张三丰', '中乾', 1),
+        create_personeel_info('张三', '中乾', 1),
     ))
-    assert result is False
+    for text in ('中乾1张三丰', '中乾1三丰', '中乾1张三', 'ZQ1张三丰'):
+        assert name_index.formal_names.search(text) == search_formal_names(name_index, text)
+    assert {0, 1} == search_formal_names(name_index, '中乾1张三丰')
 
 
-def test_partition_present_personeel_infos_01():
-    result = partition_present_personeel_infos(
-        (get_test_personeel_infos_01(), get_test_attendance_infos_01())
-    )
-    expected_lens = (3, 3)
-    expected_names = (
-        ('人员1', '人员3', '人员4'), ('人员2', '人员5', '人员7')
+def test_overlapped_01():
+    assert not overlapped([])
+    assert not overlapped(['张三', '李四'])
+    assert overlapped(iter(['张三', '李四', '张三']))
+
+
+def test_stat_people_matched_attendance_infos_01():
+    for name_match in (False, True):
+        stat = StatAttendanceInfos(name_match)
+        result = stat.stat_people_matched_attendance_infos(
+            TEST_MATCH_PERSONEEL_INFOS_01, TEST_MATCH_ATTENDANCE_TABLE_01,
+            TEST_MATCH_ATTENDANCE_INFOS_01,
+        )
+        expected = [
+            tuple(
+                stat.stat_personeel_attendance_infos(
+                    personeel_info, TEST_MATCH_ATTENDANCE_INFOS_01
+                )
+            )
+            for personeel_info in TEST_MATCH_PERSONEEL_INFOS_01
+        ]
+        assert expected == list(map(tuple, result))
+        assert all(rows.table is TEST_MATCH_ATTENDANCE_TABLE_01 for rows in result)
+
+
+def test_stat_mismatched_attendance_infos_01():
+    people_matched = StatAttendanceInfos(True).stat_people_matched_attendance_infos(
+        TEST_MATCH_PERSONEEL_INFOS_01, TEST_MATCH_ATTENDANCE_TABLE_01,
+        TEST_MATCH_ATTENDANCE_INFOS_01,
     )
-    assert expected_lens == tuple(map(len, result))
-    assert expected_names == tuple(
-        map(pipe(partial(map, attrgetter('name')), tuple), result)
+    result = stat_mismatched_attendance_infos(
+        [rows.row_ids for rows in people_matched], TEST_MATCH_ATTENDANCE_INFOS_01,
     )
+    expected = (create_test_match_attendance_info('无名', '路人'),)
+    assert expected == tuple(result)
 
 
-def test_filter_unmatched_attendance_infos_01():
-    result = filter_unmatched_attendance_infos(
-        get_test_personeel_infos_01(), get_test_attendance_infos_01()
+def test_stat_mismatched_attendance_infos_02():
+    result = stat_mismatched_attendance_infos((), TEST_MATCH_ATTENDANCE_INFOS_01)
+    expected = tuple(chain.from_iterable(TEST_MATCH_ATTENDANCE_INFOS_01.values()))
+    assert expected == tuple(result)
+
+
+def create_test_classify_attendance_info(name: str, team: str, number: int
+                                        ) -> PersoneelAttendanceInfo:
+    return PersoneelAttendanceInfo(
+        create_personeel_info(name, team, number), (), timedelta(), False
     )
-    assert 1 == len(result)
 
 
-def test_parse_meeting_info_01():
-    result = parse_meeting_info((Cell('节气名'), Cell('冬至')))
-    expected = ('solar_term', '冬至')
-    assert expected == result
+def test_classify_team_attendance_infos_01():
+    """同组人员不相邻时也归为一组。"""
+    people = (
+        create_test_classify_attendance_info('张三', '中乾', 1),
+        create_test_classify_attendance_info('李四', '中坤', 1),
+        create_test_classify_attendance_info('王五', '中乾', 2),
+    )
+    result = classify_team_attendance_infos(people)
+    assert {'中乾': people[::2], '中坤': people[1:2]} == result
+    assert ['中乾', '中坤'] == list(result)
 
 
-def test_parse_meeting_info_02():
-    result = parse_meeting_info((Cell('会议总时长'), Cell('75')))
-    expected = ('meeting_time', time(0, 40))
-    assert expected == result
+def test_classify_zone_attendance_infos_01():
+    """同区域的小组不相邻时也归为一个区域。"""
+    team_attendance_infos = {'中乾': (), '中坤': (), '中离': ()}
+    result = classify_zone_attendance_infos(
+        team_attendance_infos, {'中乾': '区域1', '中坤': '区域2', '中离': '区域1'}
+    )
+    assert {'区域1': {'中乾': (), '中离': ()}, '区域2': {'中坤': ()}} == result
 
 
-def test_parse_meeting_info_sheet_01():
-    result = parse_meeting_info_sheet(TEST_SUMMARY_WB_01[MEETING_INFO_SHEET_NAME])
-    expected = MeetingInfo('冬至', time(0, 40))
-    assert expected == result
+# 人员总表中同组人员、同区域的小组均不相邻
+TEST_CLASSIFY_PEOPLE_ATTENDANCE_INFOS_01 = (
+    create_test_classify_attendance_info('张三', '中乾', 1),
+    create_test_classify_attendance_info('李四', '中坤', 1),
+    create_test_classify_attendance_info('王五', '中离', 1),
+    create_test_classify_attendance_info('赵六', '中乾', 2),
+    create_test_classify_attendance_info('钱七', '中坤', 2),
+)
 
+TEST_CLASSIFY_TEAM_MAPPING_01 = {'中乾': '区域1', '中坤': '区域2', '中离': '区域1'}
 
-def test_is_enough_attendance_time_01():
-    result = is_enough_attendance_time(
-        TEST_MEETING_INFO_01,
-        TEST_ATTENDANCE_INFO_01,
+
+def test_classify_meeting_attendance_infos_01():
+    """区域表列出该区域的每个小组，每组包含该组的全部人员。"""
+    result = classify_meeting_attendance_infos(
+        TEST_CLASSIFY_PEOPLE_ATTENDANCE_INFOS_01, TEST_CLASSIFY_TEAM_MAPPING_01
     )
-    assert result is False
+    assert ['中乾', '中离'] == list(result['区域1'])
+    assert ['中坤'] == list(result['区域2'])
+    teams = {
+        team: people
+        for zone_attendance_infos in result.values()
+        for team, people in zone_attendance_infos.items()
+    }
+    assert set(TEST_CLASSIFY_TEAM_MAPPING_01) == set(teams)
+    for people_attendance_info in TEST_CLASSIFY_PEOPLE_ATTENDANCE_INFOS_01:
+        assert people_attendance_info in teams[people_attendance_info.personeel_info.team]
 
 
-def test_is_enough_attendance_time_02():
-    result = is_enough_attendance_time(
-        TEST_MEETING_INFO_01,
-        create_origin_attendance_info(
-            '人员1', '人员1', time(0, 40, 0),
-        ),
-    )
-    assert result is True
+def test_create_personeel_info_01():
+    result = create_personeel_info('张三丰', '中乾', 1)
+    expected = ('张三丰', '中乾', 1, '中乾1', '中乾1张三丰', '中乾1三丰', 'ZQ1张三丰')
+    assert expected == tuple(result)
 
 
-def test_is_enough_attendance_time_03():
-    result = is_enough_attendance_time(
-        TEST_MEETING_INFO_01,
-        create_origin_attendance_info(
-            '人员1', '人员1', time(0, 39, 59),
-        ),
-    )
-    assert result is False
+def test_create_personeel_info_02():
+    result = create_personeel_info('王五', '中坤', 0)
+    assert '中坤0王五' == result.formal_nick_name
 
 
-def test_partition_present_01():
-    present, absent_people = partition_present(
-        get_test_personeel_infos_01(),
-        get_test_attendance_infos_01()
-    )
-    assert 3 == len(present)
-    assert 3 == len(absent_people)
+def test_personeel_info_01():
+    with pytest.raises(TypeError):
+        PersoneelInfo('张三丰', '中乾', 1, '中乾1', '中乾1张三丰', '中乾1三丰', 'ZQ1张三丰')
 
 
-def test_partition_infos_01():
-    a, b, c = partition_infos(
-        TEST_MEETING_INFO_01,
-        get_test_personeel_infos_01(),
-        get_test_attendance_infos_01()
-    )
-    assert 2 == len(a)
-    assert 1 == len(b)
-    assert 3 == len(c)
+def test_personeel_info_02():
+    result = create_personeel_info('张三丰', '中乾', 1)._replace(team='中坤')
+    assert create_personeel_info('张三丰', '中坤', 1) == result
+    assert result == pickle.loads(pickle.dumps(result))
 
 
-def test_get_group_teams_by_personeel_infos_01():
-    result = get_group_teams_by_personeel_infos(get_test_personeel_infos_01())
-    expected = (
-        ('大组0', '中乾'),
-        ('大组0', '中坤'),
-        ('大组1', '上乾'),
+def test_expand_meeting_dirs_01(tmp_path):
+    (tmp_path / '1.冬至立志').mkdir()
+    (tmp_path / '2.小寒').mkdir()
+    (tmp_path / '3.大寒.txt').write_text('')
+    result = expand_meeting_dirs(
+        (str(tmp_path / '*'), str(tmp_path / '1.冬至立志'))
     )
+    expected = (str(tmp_path / '1.冬至立志'), str(tmp_path / '2.小寒'))
     assert expected == result
 
 
-def test_get_groups_by_personeel_infos_01():
-    result = get_groups_by_personeel_infos(get_test_personeel_infos_01())
-    expected = ('大组0', '大组1')
-    assert expected == result
+def test_expand_meeting_dirs_02():
+    result = expand_meeting_dirs('not_exists')
+    assert ('not_exists',) == result
 
 
-def test_filter_infos_by_group_team_01():
-    result = filter_infos_by_group_team(
-        ('元', '中乾'),
-        *islice(
-            partition_infos(
-                TEST_MEETING_INFO_01,
-                get_test_personeel_infos_01(),
-                get_test_attendance_infos_01()
-            ),
-            3,
-        )
-    )
-    assert ('元', '中乾') == result[0]
-    assert 1 == len(result[1])
-    assert 1 == len(result[2])
-    assert 1 == len(result[3])
-    # pprint(result)
-
-
-def test_group_infos_by_group_01():
-    result = group_infos_by_group(
-        (('大组0', '中乾'), (), (), ()),
-        (('大组0', '中坤'), (), (), ()),
-        (('大组1', '上乾'), (), (), ()),
-    )
-    expected = {
-        '大组0': (
-            (('大组0', '中乾'), (), (), ()),
-            (('大组0', '中坤'), (), (), ()),
-        ),
-        '大组1': (
-            (('大组1', '上乾'), (), (), ()),
-        ),
-    }
+def test_expand_meeting_dirs_03(tmp_path):
+    """按序号的数值排序，而不是按字符串排序。"""
+    for name in ('10.立夏', '2.小寒', '1.冬至立志'):
+        (tmp_path / name).mkdir()
+    result = expand_meeting_dirs(str(tmp_path / '*'))
+    expected = tuple(str(tmp_path / name) for name in ('1.冬至立志', '2.小寒', '10.立夏'))
     assert expected == result
 
 
-def test_group_infos_by_team_01():
-    result = group_infos_by_team(
-        (('大组0', '中乾'), (), (), ()),
-        (('大组0', '中坤'), (), (), ()),
-        (('大组1', '上乾'), (), (), ()),
+def test_natural_sort_key_01():
+    assert ['1.冬至', '2.小寒', '10.立夏', 'a'] == sorted(
+        ('10.立夏', 'a', '2.小寒', '1.冬至'), key=natural_sort_key
     )
-    expected = {
-        '中乾': (('大组0', '中乾'), (), (), ()),
-        '中坤': (('大组0', '中坤'), (), (), ()),
-        '上乾': (('大组1', '上乾'), (), (), ()),
-    }
-    assert expected == result
 
 
-def test_calc_group_attendance_infos_01():
-    result_groups = calc_group_attendance_infos(
-        TEST_MEETING_INFO_01,
-        get_test_personeel_infos_01(),
-        get_test_attendance_infos_01()
-    )
-    assert 2 == len(result_groups)
-    assert ('大组0', '大组1') == tuple(result_groups)
-    assert ('中乾', '中坤') == tuple(result_groups['大组0'])
-    assert ('大组0', '中乾') == result_groups['大组0']['中乾'][0]
-    assert 1 == len(result_groups['大组0']['中乾'][1])
-    assert 1 == len(result_groups['大组0']['中乾'][2])
-    assert 1 == len(result_groups['大组0']['中乾'][3])
-    assert ('大组0', '中坤') == result_groups['大组0']['中坤'][0]
-    assert 1 == len(result_groups['大组0']['中坤'][1])
-    assert 0 == len(result_groups['大组0']['中坤'][2])
-    assert 1 == len(result_groups['大组0']['中坤'][3])
-    assert ('上乾',) == tuple(result_groups['大组1'])
-    assert ('大组1', '上乾') == result_groups['大组1']['上乾'][0]
-    assert 0 == len(result_groups['大组1']['上乾'][1])
-    assert 0 == len(result_groups['大组1']['上乾'][2])
-    assert 1 == len(result_groups['大组1']['上乾'][3])
-    # pprint(result)
-
-def test_group_attendance_sheet_to_team_locations_01():
-    result = group_attendance_sheet_to_team_locations(
-        TEST_GROUP_ATTENDANCE_SHEET_01
-    )
-    expected = (('中乾', 1), ('中坤', 5))
-    assert expected == result
+def test_stat_time_worker_01(tmp_path):
+    result = stat_time_worker(str(tmp_path))
+    assert str(tmp_path) == result.meeting
+    assert result.succeeded is False
+    assert result.message.startswith('FileNotFoundError')
 
 
-def test_generate_present_commands_01():
-    result = generate_present_commands(
-        TEST_TEAM_LOCATION_01, (
-            (TEST_PERSONEEL_INFO_01, TEST_ATTENDANCE_INFO_01),
-            (TEST_PERSONEEL_INFO_03, TEST_ATTENDANCE_INFO_03),
-        ),
-        (True, False),
+def test_store_meeting_results_01(tmp_path, capsys):
+    """数据库无法打开时只报告错误。"""
+    (tmp_path / '考勤结果.db').mkdir()
+    meeting_info = MeetingInfo(
+        '冬至', datetime(2024, 1, 1, 19, 0, 0), datetime(2024, 1, 1, 20, 0, 0), 60, 40
     )
-    expected = (
-        (2, 2, 1, False),
-        (2, 3, '中乾0人员1', False),
-        (2, 4, '00:30:00', True),
-        (3, 2, 2, False),
-        (3, 3, '中乾2人员3＆中坤0人员4', False),
-        (3, 4, '00:40:00', False),
+    store_meeting_results(
+        Namespace(meeting=str(tmp_path / '1.冬至'), archive=True),
+        meeting_info, {}, (), {}, NULL_PROFILER,
     )
-    assert expected == result
+    assert '失败：OperationalError' in capsys.readouterr().out
 
 
-def test_generate_title_command_01():
-    result = generate_title_command(
-        TEST_TEAM_LOCATION_01, TEST_TEAM_ATTENDANCE_INFO_01
-    )
-    expected = (1, 1, '中乾组（3人）', False)
-    assert expected == result
+def test_open_meeting_cache_01(tmp_path):
+    assert open_meeting_cache(str(tmp_path), no_cache=True) is None
+    result = open_meeting_cache(str(tmp_path))
+    assert str(tmp_path / '.考勤缓存') == result.filepath
+    assert {} == result.entries
 
 
-def test_generate_team_commands_01():
-    result = generate_team_commands(
-        TEST_TEAM_LOCATION_01, TEST_TEAM_ATTENDANCE_INFOS_01
-    )
-    expected = (
-        (1, 1, '中乾组（3人）', False),
-        (2, 2, 1, False),
-        (2, 3, '中乾0人员1', False),
-        (2, 4, '00:30:00', True),
-        (3, 2, 2, False),
-        (3, 3, '中乾2人员3＆中坤0人员4', False),
-        (3, 4, '00:40:00', False),
-        (2, 1, '中乾0人员1', False),
-        (3, 1, '中乾1人员2', False),
-    )
-    assert expected == result
+TEST_FILL_COMMANDS_01 = (
+    FillCommand(1, 1, '中乾组（2人）', False),
+    FillCommand(2, 4, '00:30:00', True),
+    FillCommand(2, 4, '缺席', True, True),
+    FillCommand(2, 4, '00:40:00', False),
+    FillCommand(3, 2, 1, False, True),
+)
 
 
-def test_item_extract_01():
-    result = item_extract(
-        '中乾', TEST_TEAM_ATTENDANCE_INFOS_01
-    )
-    expected = TEST_TEAM_ATTENDANCE_INFO_01
+def test_group_fill_commands_01():
+    result = group_fill_commands(TEST_FILL_COMMANDS_01)
+    expected = {
+        1: {1: FillCommand(1, 1, '中乾组（2人）', False)},
+        2: {4: FillCommand(2, 4, '00:40:00', False, True)},
+        3: {2: FillCommand(3, 2, 1, False, True)},
+    }
     assert expected == result
 
+
+def dump_test_fill_worksheet(worksheet):
+    return [
+        (
+            cell.coordinate, cell.value, cell.font.color.rgb,
+            cell.alignment.horizontal, cell.border.left.style, cell.fill.fgColor.rgb,
+        )
+        for row in worksheet.iter_rows()
+        for cell in row
+    ]
+
+
+def test_do_fill_worksheet_commands_01():
+    expected_worksheet = Workbook().active
+    for command in TEST_FILL_COMMANDS_01:
+        fill_worksheet_command(expected_worksheet, command)
+    worksheet = Workbook().active
+    result = do_fill_worksheet_commands(worksheet, iter(TEST_FILL_COMMANDS_01))
+    assert TEST_FILL_COMMANDS_01 == result
+    assert dump_test_fill_worksheet(expected_worksheet) == dump_test_fill_worksheet(worksheet)
+    assert FILL_STYLE_NAMES[False, True] == worksheet['D2'].style
+    assert set(FILL_STYLE_NAMES.values()) <= set(worksheet.parent.named_styles)
+
+
+def test_do_fill_worksheet_commands_02():
+    worksheet = Workbook().active
+    worksheet['A1'].fill = PatternFill('solid', fgColor='00FFFF00')
+    do_fill_worksheet_commands(worksheet, TEST_FILL_COMMANDS_01)
+    do_fill_worksheet_commands(worksheet, TEST_FILL_COMMANDS_01[:1])
+    assert '00FFFF00' == worksheet['A1'].fill.fgColor.rgb
+    assert '00000000' == worksheet['A1'].font.color.rgb
+    assert '中乾组（2人）' == worksheet['A1'].value
+
+
+def write_test_watch_summary_workbook_01(filepath):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = PEOPLE_SHEET_NAME
+    ws.append(['序号', '姓名', '大组', '小组', '编号'])
+    ws.append([1, '张三丰', '大组', '中乾', 1])
+    ws.append([2, '李四', '大组', '中乾', 11])
+    ws.append([3, '王五', '大组', '中坤', 0])
+    ws = wb.create_sheet(MEETING_INFO_SHEET_NAME)
+    ws.append(['节气名', '冬至'])
+    ws.append(['会议开始时间', datetime(2024, 1, 1, 19, 0, 0)])
+    ws.append(['会议结束时间', datetime(2024, 1, 1, 20, 0, 0)])
+    wb.create_sheet(MISMATCHED_SHEET_NAME)
+    ws = wb.create_sheet(TEAM_MAPPING_SHEET_NAME)
+    ws.append(['中乾', '区域1'])
+    ws.append(['中坤', '区域2'])
+    wb.create_sheet('区域1')
+    wb.create_sheet('区域2')
+    wb.save(filepath)
+
+
+def create_test_watch_row(fullname: str, enter_time: str, exit_time: str) -> tuple:
+    return (fullname, None, None, None, None, enter_time, exit_time, None)
+
+
+TEST_WATCH_ROWS_01 = (
+    create_test_watch_row('(中乾1张三丰)', '2024-01-01 19:00:00', '2024-01-01 20:00:00'),
+    create_test_watch_row('(中坤0王五)', '2024-01-01 19:00:00', '2024-01-01 19:30:00'),
+    create_test_watch_row('(路人)', '2024-01-01 19:00:00', '2024-01-01 19:10:00'),
+)
+
+
+def test_meeting_watcher_01(tmp_path):
+    write_test_watch_summary_workbook_01(tmp_path / '生活修行考勤表.xlsx')
+    watcher = MeetingWatcher(str(tmp_path))
+    assert (2, 2) == watcher.update(TEST_WATCH_ROWS_01)
+    assert watcher.people_attendance_infos[0].is_attendanced
+    assert not watcher.people_attendance_infos[2].is_attendanced
+    assert watcher.update(TEST_WATCH_ROWS_01) is None
+
+    rows = TEST_WATCH_ROWS_01[1:] + (
+        create_test_watch_row('(中坤0王五)', '2024-01-01 19:30:00', '2024-01-01 20:00:00'),
+    )
+    assert (2, 2) == watcher.update(rows)
+    assert not watcher.people_attendance_infos[0].is_attendanced
+    assert timedelta(hours=1) == watcher.people_attendance_infos[2].personeel_attendance_time
+    assert watcher.people_attendance_infos[2].is_attendanced
+
+    rows += (create_test_watch_row('(中乾11李四)', '2024-01-01 19:00:00', '2024-01-01 19:05:00'),)
+    assert (1, 1) == watcher.update(rows)
+    assert timedelta(minutes=5) == watcher.people_attendance_infos[1].personeel_attendance_time
+
+
+def test_meeting_watcher_02(tmp_path):
+    """重新填充时恢复模板的样式，与在模板上首次填充一致。"""
+    write_test_watch_summary_workbook_01(tmp_path / '生活修行考勤表.xlsx')
+    watcher = MeetingWatcher(str(tmp_path))
+    ws = watcher.summary_workbook[MISMATCHED_SHEET_NAME]
+    ws.cell(5, 1).number_format = '0.00'
+    watcher.refill_worksheet(
+        MISMATCHED_SHEET_NAME, (FillCommand(5, 1, '1', True), FillCommand(5, 2, '2', True, True))
+    )
+    assert RED_FONT.color.rgb == ws.cell(5, 1).font.color.rgb
+    watcher.refill_worksheet(MISMATCHED_SHEET_NAME, (FillCommand(5, 2, '3', False),))
+    assert ws.cell(5, 1).value is None
+    assert '0.00' == ws.cell(5, 1).number_format
+    assert 'theme' == ws.cell(5, 1).font.color.type
+    assert '3' == ws.cell(5, 2).value
+    assert FILL_STYLE_NAMES[False, False] == ws.cell(5, 2).style
+    assert ws.cell(5, 2).alignment.horizontal is None
+    watcher.refill_worksheet(MISMATCHED_SHEET_NAME, ())
+    assert not ws.cell(5, 2).has_style
+
+
+def test_stat_absent_01(tmp_path):
+    meeting = tmp_path / '1.冬至'
+    meeting.mkdir()
+    write_test_watch_summary_workbook_01(meeting / '生活修行考勤表.xlsx')
+    assert not stat_absent(Namespace(meeting=str(meeting)))
+    with MeetingStore(str(tmp_path / '考勤结果.db')) as store:
+        store.save_meeting(
+            MeetingRecord('1.冬至', '冬至', datetime(2024, 1, 1, 19, 0, 0), 60),
+            (
+                PersonResult('张三丰', '中乾', 1, '区域1', 3600, True),
+                PersonResult('王五', '中坤', 0, '区域2', 0, False),
+            ),
+        )
+        store.save_meeting(
+            MeetingRecord('2.小寒', '小寒', datetime(2024, 1, 16, 19, 0, 0), 60),
+            (PersonResult('王五', '中坤', 0, '区域2', 0, False),),
+        )
+    output_filepath = meeting / '生活修行考勤表（生成）.xlsx'
+    wb = load_workbook(meeting / '生活修行考勤表.xlsx')
+    ws = wb.create_sheet(TOTAL_ABSENT_SHEET_NAME)
+    ws.cell(1, 1, '缺勤总表')
+    ws.cell(TOTAL_ABSENT_SHEET_FIRST_LINE - 1, 1, '序号')
+    ws.cell(50, 1, '上次填充')
+    ws.cell(50, 1).number_format = '0.00'
+    wb.save(output_filepath)
+    assert stat_absent(Namespace(meeting=str(meeting)))
+    ws = load_workbook(output_filepath)[TOTAL_ABSENT_SHEET_NAME]
+    rows = tuple(
+        filter(any, ws.iter_rows(min_row=TOTAL_ABSENT_SHEET_FIRST_LINE, values_only=True))
+    )
+    assert '缺勤总表' == ws.cell(1, 1).value
+    assert '序号' == ws.cell(TOTAL_ABSENT_SHEET_FIRST_LINE - 1, 1).value
+    assert (1, '区域1', '中乾', '中乾1张三丰', 1, 0) == rows[0]
+    assert (2, '区域1', '中乾', '中乾11李四', 0, 0) == rows[1]
+    assert (3, '区域2', '中坤', '中坤0王五', 1, 1) == rows[2]
+    assert ('区域合计', None, None, None, '人次', '缺勤人次') == rows[-3]
+    assert (None, '区域2', None, None, 1, 1) == rows[-1]
+    assert ws.cell(50, 1).value is None
+    assert '0.00' == ws.cell(50, 1).number_format
+
+
+def test_stat_absent_02(tmp_path, capsys):
+    """本节气的统计结果未保存时不填充。"""
+    meeting = tmp_path / '2.小寒'
+    meeting.mkdir()
+    write_test_watch_summary_workbook_01(meeting / '生活修行考勤表.xlsx')
+    with MeetingStore(str(tmp_path / '考勤结果.db')) as store:
+        store.save_meeting(
+            MeetingRecord('1.冬至', '冬至', datetime(2023, 12, 22, 19, 0, 0), 60),
+            (PersonResult('王五', '中坤', 0, '区域2', 0, False),),
+        )
+    assert not stat_absent(Namespace(meeting=str(meeting)))
+    assert "没有'" in capsys.readouterr().out
+    assert not (meeting / '生活修行考勤表（生成）.xlsx').exists()
+
+
+def test_stat_absent_03(tmp_path, capsys):
+    """数据库无法打开时只报告错误。"""
+    meeting = tmp_path / '1.冬至'
+    meeting.mkdir()
+    write_test_watch_summary_workbook_01(meeting / '生活修行考勤表.xlsx')
+    (tmp_path / '考勤结果.db').mkdir()
+    assert not stat_absent(Namespace(meeting=str(meeting)))
+    assert '失败：OperationalError' in capsys.readouterr().out